@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Ad Intelligence Engine
+Where brands put their money vs what the social data says.
+
+Campaigns are indexed by brand and theme once, so spend per theme is a
+single pass over the catalog. A theme's social score is the street score
+measured from stored TikTok / Twitter / Reddit scans for its registered
+aliases (term_registry.THEME_ALIASES), falling back to the analyst estimate
+only where nothing has been measured. The before/after response around each
+air date is an event study (event_study), so the whole catalog is evaluated
+in one batch and cached per campaign.
+
+Usage:
+  python3 scripts/ad_engine.py              # ROI for the Super Bowl catalog
+"""
+
+import event_study
+import street_adoption
+
+# Analyst estimates, used only for themes with no measured signal yet
+SOCIAL_FALLBACK = {
+    'PERSONALIZATION/AI': 85,
+    'Y2K_NOSTALGIA': 45,
+    'DIGITAL_FASHION': 12,
+    'FAST_FASHION': 78,
+    'QUIET_LUXURY': 8,
+    'ANTI_HYPE': 67,
+    'LIFESTYLE_EXPANSION': 56
+}
+
+def assessment(social_score, investment):
+    if social_score < 20 and investment > 10000000:
+        return 'WASTED MONEY - Trend is dead'
+    if social_score > 70 and investment > 10000000:
+        return 'SMART BET - Riding the wave'
+    if social_score > 70 and investment < 10000000:
+        return 'MISSED OPPORTUNITY - Under-invested'
+    return 'UNCERTAIN - Mixed signals'
+
+
+class AdEngine:
+
+    def __init__(self, ads, themes):
+        """ads: [{'brand', 'cost', 'air_date', ...}]; themes: {theme: [brands]}"""
+        self.ads = ads
+        self.theme_of = {brand: theme for theme, brands in themes.items() for brand in brands}
+        self.by_brand = {}
+        self.by_theme = {theme: [] for theme in themes}
+        for ad in ads:
+            self.by_brand.setdefault(ad['brand'], []).append(ad)
+            # A campaign can carry its own theme; otherwise its brand's
+            theme = ad.get('theme_key') or self.theme_of.get(ad['brand'])
+            if theme:
+                self.by_theme.setdefault(theme, []).append(ad)
+        self.theme_spend = {theme: sum(ad['cost'] for ad in ads) for theme, ads in self.by_theme.items()}
+        self._scores = None
+
+    def social_scores(self):
+        """{theme: (score, 'measured' | 'estimate')}"""
+        if self._scores is None:
+            adoption = street_adoption.StreetAdoption.load()
+            measured_scores = adoption.scores()
+            adoption.save()
+            self._scores = {}
+            for theme in self.by_theme:
+                measured = measured_scores.get(theme)
+                if measured is not None:
+                    self._scores[theme] = (measured, 'measured')
+                else:
+                    self._scores[theme] = (SOCIAL_FALLBACK.get(theme, 0), 'estimate')
+        return self._scores
+
+    def assess(self):
+        gaps = []
+        scores = self.social_scores()
+        for theme, investment in self.theme_spend.items():
+            social_score, basis = scores[theme]
+            gaps.append({
+                'theme': theme.replace('_', ' '),
+                'ad_spend': investment,
+                'social_trend_score': social_score,
+                'score_basis': basis,
+                'assessment': assessment(social_score, investment)
+            })
+        return gaps
+
+    def events(self):
+        """One event study per dated campaign, listening to its theme's terms"""
+        return [{
+            'id': f"ad:{ad['brand']}:{ad['air_date']}:{theme}",
+            'label': f"{ad['brand']} ({theme.replace('_', ' ')})",
+            'date': ad['air_date'],
+            'terms': [theme],
+            'ad': ad,
+            'theme': theme
+        } for theme, ads in self.by_theme.items() for ad in ads if ad.get('air_date')]
+
+    def campaign_response(self):
+        """Before/after street score around each dated campaign, with lift per $1M as ROI"""
+        events = self.events()
+        studies = event_study.study(events)
+        results = []
+        for event in events:
+            ad, study = event['ad'], studies[event['id']]
+            lift = study['post_delta']
+            results.append({
+                'brand': ad['brand'],
+                'theme': event['theme'].replace('_', ' '),
+                'air_date': ad['air_date'],
+                'cost': ad['cost'],
+                'response': {
+                    'before': study['pre'],
+                    'after': study['post'],
+                    'lift': lift,
+                    'abnormal': study['abnormal']
+                } if lift is not None else None,
+                'roi': round(lift / (ad['cost'] / 1000000), 2) if lift is not None else None
+            })
+        return sorted(results, key=lambda r: r['roi'] if r['roi'] is not None else float('-inf'), reverse=True)
+
+
+def main():
+    import collect_superbowl
+
+    engine = collect_superbowl.ad_engine()
+    for result in engine.campaign_response():
+        response = result['response']
+        if response:
+            print(f"  {result['brand']:12} {result['theme']:20} {response['before']:5} → {response['after']:5} "
+                  f"({response['lift']:+.1f}) | ROI {result['roi']:+.2f}/$1M")
+        else:
+            print(f"  {result['brand']:12} {result['theme']:20} not enough history around {result['air_date']}")
+
+
+if __name__ == "__main__":
+    main()
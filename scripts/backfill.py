@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Backfill
+Recomputes derived outputs across every stored scan after scoring or
+insight logic changes.
+
+The history logs are read once and partitioned by day. Each day's partition
+carries what came before it: the latest scan per source (what the dashboard
+would have loaded) and the latest metrics per term (what street adoption
+has accumulated). Days are then independent, and a process pool replays
+them in 3-hourly cycles, as the backtest does. Per cycle it recomputes
+  trend         the dashboard's 0-100 score under the active scoring model
+  street        street adoption scores per registered trend
+  correlations  the dashboard's correlation rules
+  insights      the master analyzer's insight rules
+over snapshots rebuilt from the scans' metrics. Breadth is the sum of the
+scans' distinct author counts, as in the backtest, not the live 7-day union
+of sketches.
+
+Each finished day is checkpointed under data/backfill/<run key>/, named by
+a fingerprint of its input scans. The run key covers the model, the score
+versions, the rule versions and the term registry, so an interrupted
+backfill resumes where it stopped and a later one only recomputes days
+whose scans changed (usually just the newest). Bump a rule's version when
+its logic changes, or pass --restart.
+
+Once every day is done, the cycles are merged in order into
+data/backfill.jsonl, and the trend and street scores into the score store
+at their scan times, where score_store.series() picks them up.
+
+Usage:
+  python3 scripts/backfill.py
+  python3 scripts/backfill.py --since 2026-01-01 --workers 8
+  python3 scripts/backfill.py --restart
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import backtest
+import history
+import score_store
+import scoring
+import storage
+import street_adoption
+import term_registry
+
+BACKFILL_DIR = Path('data/backfill')
+OUTPUT_FILE = Path('data/backfill.jsonl')
+PROGRESS_SECONDS = 5
+
+
+def pct(n):
+    """350 -> '+350%', the way the collectors write week-over-week changes"""
+    return f"+{n}%" if n > 0 else f"{n}%"
+
+
+def snapshots(latest):
+    """Snapshot-shaped data, as the dashboard loads it, from each source's latest scan"""
+    import collect_stockx
+
+    data = {}
+    if 'tiktok' in latest:
+        data['tiktok'] = {'hashtag_data': [
+            {'hashtag': f"#{tag}", 'views': m.get('views', 0), 'week_over_week': pct(m.get('growth_pct', 0)),
+             'videos_created': m.get('videos', 0)}
+            for tag, m in latest['tiktok'].items()
+        ]}
+    if 'stockx' in latest:
+        items = {}
+        for item, m in latest['stockx'].items():
+            items[item] = {'avg_price': m.get('avg_price', 0), 'volume': m.get('volume', 0),
+                           'week_change': pct(m.get('change_pct', 0))}
+            signal = collect_stockx.price_signal(m.get('change_pct', 0))
+            if signal:
+                items[item]['signal'] = signal
+        data['stockx'] = {'stockx_data': items}
+    if 'twitter' in latest:
+        data['twitter'] = {'trends': latest['twitter']}
+    if 'reddit' in latest:
+        data['reddit'] = {'reddit_data': latest['reddit']}
+
+    breadth = {}
+    for source in ('twitter', 'reddit'):
+        for term, m in latest.get(source, {}).items():
+            if m.get('unique_authors'):
+                breadth[term] = breadth.get(term, 0) + m['unique_authors']
+    data['breadth'] = breadth
+    return data
+
+
+def partitions(sources=backtest.SOURCES):
+    """
+    One pass over the history logs -> [{'day', 'latest', 'seen', 'scans'}],
+    oldest first. 'latest' and 'seen' are carried in from earlier days;
+    'scans' is [(ts, source, terms)] in time order.
+    """
+    scans = [(entry['ts'], source, entry['terms'])
+             for source in sources for _, entry in history.read(source)]
+    scans.sort(key=lambda scan: scan[0])
+
+    days = []
+    latest = {}     # source -> terms of its last scan
+    seen = {}       # street source -> {term: last metrics}
+    for ts, source, terms in scans:
+        if not days or days[-1]['day'] != ts[:10]:
+            days.append({'day': ts[:10], 'latest': dict(latest),
+                         'seen': {s: dict(t) for s, t in seen.items()}, 'scans': []})
+        days[-1]['scans'].append((ts, source, terms))
+        latest[source] = terms
+        if source in street_adoption.SCORERS:
+            seen.setdefault(source, {}).update(terms)
+    return days
+
+
+def inputs_of(part):
+    """
+    Fingerprint of a day's scans, contents included: a migration or
+    retention rewrite can change metrics without changing any scan's time
+    """
+    basis = [[ts, source, terms] for ts, source, terms in part['scans']]
+    return hashlib.sha1(json.dumps(basis, sort_keys=True).encode()).hexdigest()[:12]
+
+
+# Worker state: the model and rules, set up once per process
+_setup = {}
+
+
+def _init(name, config):
+    import master_analyzer
+    import ultimate_dashboard
+
+    _setup.update(model=scoring.ScoringModel(name, config), trends=ultimate_dashboard.TRACKED_TRENDS,
+                  index=term_registry.build_alias_index(),
+                  correlations=ultimate_dashboard.find_correlations,
+                  insights=master_analyzer.generate_insights)
+
+
+def run_key(model):
+    """Identifies everything a backfilled value depends on besides the scans"""
+    import master_analyzer
+    import ultimate_dashboard
+
+    rules = [[rule.name, rule.version]
+             for rule in ultimate_dashboard.CORRELATION_RULES + master_analyzer.INSIGHT_RULES]
+    basis = [model.name, model.config, ultimate_dashboard.TREND_SCORE_VERSION,
+             street_adoption.SCORE_VERSION, rules, ultimate_dashboard.TRACKED_TRENDS,
+             sorted(term_registry.build_alias_index().items()), backtest.CYCLE_HOURS]
+    return hashlib.sha1(json.dumps(basis, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def backfill_day(part, out):
+    """Replay one day's cycles and checkpoint them to `out`; returns (day, scans, cycles)"""
+    model, trends, index = _setup['model'], _setup['trends'], _setup['index']
+    latest = dict(part['latest'])
+    signals = {}    # trend -> {source: {platform term: score}}, as StreetAdoption keeps them
+
+    def fold(source, terms):
+        scorer = street_adoption.SCORERS[source]
+        for term, metrics in terms.items():
+            for trend in term_registry.resolve(term, index):
+                per_term = signals.setdefault(trend, {}).setdefault(source, {})
+                per_term[term_registry.normalize(term)] = round(scorer(metrics), 1)
+
+    for source, terms in part['seen'].items():
+        fold(source, terms)
+
+    by_cycle = {}
+    for ts, source, terms in part['scans']:
+        by_cycle.setdefault(backtest.cycle_of(ts), []).append((source, terms))
+
+    cycles = []
+    for cycle, scans in by_cycle.items():
+        for source, terms in scans:
+            latest[source] = terms
+            if source in street_adoption.SCORERS:
+                fold(source, terms)
+        data = snapshots(latest)
+        trend_signals = scoring.signals_from_snapshots(data)
+        cycles.append({
+            'ts': cycle,
+            'trend': {term: model.score(term, trend_signals) for term in trends},
+            'street': {trend: street_adoption.combine(signals[trend]) for trend in sorted(signals)},
+            'correlations': _setup['correlations'](data),
+            'insights': _setup['insights'](data),
+        })
+
+    storage.dump({'day': part['day'], 'cycles': cycles}, out)
+    return part['day'], len(part['scans']), len(cycles)
+
+
+def _task(job):
+    return backfill_day(*job)
+
+
+def progress(done, total, scans, started):
+    elapsed = time.monotonic() - started
+    rate = scans / elapsed if elapsed else 0
+    eta = (total - done) * elapsed / done if done else 0
+    print(f"  [{done}/{total} days] {scans:,} scans, {rate:,.0f} scans/s, "
+          f"elapsed {datetime.timedelta(seconds=round(elapsed))}, eta {datetime.timedelta(seconds=round(eta))}")
+
+
+def run(model, since=None, until=None, workers=None, restart=False):
+    """Backfill every day in [since, until] (YYYY-MM-DD), resuming from checkpoints; returns a summary"""
+    key = run_key(model)
+    run_dir = BACKFILL_DIR / key
+    if restart and run_dir.exists():
+        shutil.rmtree(run_dir)
+
+    parts = [p for p in partitions()
+             if (not since or p['day'] >= since) and (not until or p['day'] <= until)]
+    jobs, outs = [], []
+    for part in parts:
+        out = run_dir / f"{part['day']}_{inputs_of(part)}.json"
+        outs.append(out)
+        if not storage.exists(out):
+            jobs.append((part, out))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    print(f"🧮 Backfill {key}: {len(parts)} days, {len(parts) - len(jobs)} already checkpointed, "
+          f"{len(jobs)} to compute on {workers} worker{'s' if workers > 1 else ''}")
+
+    started = time.monotonic()
+    done = scans = cycles = 0
+    last_report = started
+    if jobs:
+        if workers == 1:
+            _init(model.name, model.config)
+            finished = map(_task, jobs)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init,
+                                       initargs=(model.name, model.config))
+            finished = (future.result() for future in as_completed([pool.submit(_task, job) for job in jobs]))
+        try:
+            for _, n_scans, n_cycles in finished:
+                done += 1
+                scans += n_scans
+                cycles += n_cycles
+                if time.monotonic() - last_report >= PROGRESS_SECONDS or done == len(jobs):
+                    progress(done, len(jobs), scans, started)
+                    last_report = time.monotonic()
+        finally:
+            if workers > 1:
+                pool.shutdown(cancel_futures=True)
+
+    # Merge, oldest first; checkpoints of superseded inputs go
+    keep = {out.name for out in outs}
+    for stale in run_dir.glob('*.json*'):
+        if storage.logical(stale).name not in keep:
+            stale.unlink()
+
+    trend, street, merged = {}, {}, 0
+    with storage.writer(OUTPUT_FILE) as f:
+        for out in outs:
+            for record in storage.load(out)['cycles']:
+                f.write(record)
+                trend[record['ts']] = record['trend']
+                street[record['ts']] = record['street']
+                merged += 1
+
+    import ultimate_dashboard
+
+    added = score_store.backfill('trend', ultimate_dashboard.TREND_SCORE_VERSION, trend,
+                                 extra=['backfill', key])
+    added += score_store.backfill('street', street_adoption.SCORE_VERSION, street, extra=['backfill', key])
+    return {'key': key, 'days': len(parts), 'computed': len(jobs), 'scans': scans, 'cycles': merged,
+            'seconds': round(time.monotonic() - started, 1), 'scores_added': added}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute scores, correlations and insights over stored history')
+    parser.add_argument('--model', help='scoring model (default: the active one)')
+    parser.add_argument('--since', help='first day, YYYY-MM-DD')
+    parser.add_argument('--until', help='last day, YYYY-MM-DD')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--restart', action='store_true', help='discard checkpoints and recompute every day')
+    args = parser.parse_args()
+
+    summary = run(scoring.get_model(args.model), args.since, args.until, args.workers, args.restart)
+    print(f"\n✅ {summary['cycles']:,} cycles over {summary['days']} days merged into {OUTPUT_FILE} "
+          f"({summary['computed']} days recomputed in {summary['seconds']}s, "
+          f"{summary['scores_added']} score records added)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Scoring Backtest
+How well did a scoring model's scores predict what happened next?
+
+The history logs are replayed once into 3-hourly cycles: at each cycle every
+source shows its most recent scan, exactly what the dashboard would have
+loaded then. The replay is laid out as columns, one list per
+(source, platform key, metric) with a value per cycle. A model is then
+evaluated a whole column at a time: each component's points over every
+cycle at once, summed and capped per term.
+
+Components resolve a term to a platform key the way live scoring does
+(scoring.Component.key). One input differs: history keeps no sketches, so
+breadth is the sum of each source's distinct-author count in its latest
+scan, not the dashboard's 7-day union of sketches.
+
+The outcome is the log growth of a target metric (TikTok views by default)
+over the following horizon. The report covers:
+  spearman   rank correlation of scores with outcomes over every (term, cycle)
+  hit_rate   share of each cycle's top-k scored terms that went on to grow
+  lift       their mean outcome minus the mean over all terms
+
+A --grid of settings ('component.field=v1,v2,...') expands to one model per
+combination, and the models are evaluated in a process pool. Each worker
+receives the replayed columns once, so tuning weights costs one replay plus
+one fast pass per model.
+
+Usage:
+  python3 scripts/backtest.py
+  python3 scripts/backtest.py --grid tiktok.max=20,40,60 stockx.divisor=1,2,4
+  python3 scripts/backtest.py --target twitter.count --horizon-days 3 --terms "mob wife" gorpcore
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import history
+import scoring
+import storage
+
+SOURCES = ('tiktok', 'twitter', 'reddit', 'stockx')
+CYCLE_HOURS = 3
+HORIZON_DAYS = 7
+TOP_K = 3
+OUTPUT_FILE = 'data/backtest_latest.json'
+
+
+def cycle_of(ts, hours=CYCLE_HOURS):
+    t = datetime.datetime.fromisoformat(ts)
+    return t.replace(hour=t.hour - t.hour % hours, minute=0, second=0, microsecond=0).isoformat()
+
+
+def replay(sources=SOURCES, hours=CYCLE_HOURS):
+    """
+    One pass over the history logs -> (cycles, columns) where columns is
+    {source: {platform key: {metric: [value or None per cycle]}}}
+    """
+    scans = {}      # cycle -> {source: terms of the last scan in that cycle}
+    for source in sources:
+        for _, entry in history.read(source):
+            scans.setdefault(cycle_of(entry['ts'], hours), {})[source] = entry['terms']
+    cycles = sorted(scans)
+
+    columns = {}
+    for source in sources:
+        latest = {}
+        per_key = columns.setdefault(source, {})
+        for i, cycle in enumerate(cycles):
+            latest = scans[cycle].get(source, latest)
+            for key, metrics in latest.items():
+                for metric, value in metrics.items():
+                    per_key.setdefault(key, {}).setdefault(metric, [None] * len(cycles))[i] = value
+
+    # Breadth as the dashboard sees it: distinct authors on Twitter and Reddit
+    breadth = columns.setdefault('breadth', {})
+    for source in ('twitter', 'reddit'):
+        for key, metrics in columns.get(source, {}).items():
+            authors = metrics.get('unique_authors')
+            if authors:
+                total = breadth.setdefault(key, {}).setdefault('authors', [None] * len(cycles))
+                for i, n in enumerate(authors):
+                    if n is not None:
+                        total[i] = (total[i] or 0) + n
+    return cycles, columns
+
+
+def score_columns(model, term, columns, n):
+    """A model's score for one term at every cycle"""
+    total = [0.0] * n
+    for component in model.components:
+        per_key = columns.get(component.source, {})
+        key = component.key(term, per_key)
+        values = per_key[key].get(component.metric) if key is not None else None
+        if values is not None:
+            total = [t + component.points(v) for t, v in zip(total, values)]
+    return [min(t, model.cap) for t in total]
+
+
+def outcome_columns(terms, columns, n, target, horizon):
+    """{term: [log growth of the target over the next `horizon` cycles, or None]}"""
+    source, metric = target.split('.', 1)
+    resolver = scoring.Component({'name': 'target', 'source': source, 'metric': metric})
+    per_key = columns.get(source, {})
+    outcomes = {}
+    for term in terms:
+        key = resolver.key(term, per_key)
+        values = per_key[key].get(metric, [None] * n) if key is not None else [None] * n
+        outcomes[term] = [
+            math.log((values[i + horizon] + 1) / (values[i] + 1))
+            if i + horizon < n and values[i] is not None and values[i + horizon] is not None else None
+            for i in range(n)
+        ]
+    return outcomes
+
+
+def ranks(values):
+    """Average ranks, ties sharing their mean rank"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    result = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            result[order[k]] = (i + j) / 2
+        i = j + 1
+    return result
+
+
+def spearman(xs, ys):
+    if len(xs) < 3:
+        return None
+    rx, ry = ranks(xs), ranks(ys)
+    mx, my = sum(rx) / len(rx), sum(ry) / len(ry)
+    cov = sum((a - mx) * (b - my) for a, b in zip(rx, ry))
+    var = math.sqrt(sum((a - mx) ** 2 for a in rx) * sum((b - my) ** 2 for b in ry))
+    return round(cov / var, 4) if var else None
+
+
+# Worker state: the replay, shipped to each process once
+_replay = {}
+
+
+def _init(terms, columns, outcomes, n):
+    _replay.update(terms=terms, columns=columns, outcomes=outcomes, n=n)
+
+
+def evaluate(job, top_k=TOP_K):
+    """Metrics for one (name, config, settings) model over the replay in _replay"""
+    name, config, settings = job
+    model = scoring.ScoringModel(name, config)
+    terms, columns, outcomes, n = _replay['terms'], _replay['columns'], _replay['outcomes'], _replay['n']
+    scores = {term: score_columns(model, term, columns, n) for term in terms}
+
+    xs, ys, hits, picked, top_outcomes = [], [], 0, 0, []
+    for i in range(n):
+        measured = [(scores[t][i], outcomes[t][i]) for t in terms if outcomes[t][i] is not None]
+        for s, o in measured:
+            xs.append(s)
+            ys.append(o)
+        for s, o in sorted(measured, key=lambda p: -p[0])[:top_k]:
+            if s > 0:
+                picked += 1
+                hits += o > 0
+                top_outcomes.append(o)
+
+    mean = sum(ys) / len(ys) if ys else None
+    return {
+        'model': name,
+        'settings': settings,
+        'samples': len(xs),
+        'spearman': spearman(xs, ys),
+        'hit_rate': round(hits / picked, 4) if picked else None,
+        'lift': round(sum(top_outcomes) / len(top_outcomes) - mean, 4) if top_outcomes else None,
+    }
+
+
+def grid_jobs(model, grid):
+    """One job per combination of 'component.field=v1,v2' settings"""
+    axes = []
+    for spec in grid:
+        path, values = spec.split('=', 1)
+        axes.append([(path, json.loads(v)) for v in values.split(',')])
+    jobs = []
+    for combo in itertools.product(*axes) if axes else [()]:
+        settings = dict(combo)
+        jobs.append((model.name, model.with_settings(settings).config, settings))
+    return jobs
+
+
+def run(jobs, terms, target='tiktok.views', horizon_days=HORIZON_DAYS, hours=CYCLE_HOURS, workers=None):
+    """Replay once, evaluate every job; results best first"""
+    cycles, columns = replay(hours=hours)
+    n = len(cycles)
+    outcomes = outcome_columns(terms, columns, n, target, horizon_days * 24 // hours)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init(terms, columns, outcomes, n)
+        results = [evaluate(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init,
+                                 initargs=(terms, columns, outcomes, n)) as pool:
+            results = list(pool.map(evaluate, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    results.sort(key=lambda r: r['spearman'] if r['spearman'] is not None else -2, reverse=True)
+    return {'cycles': n, 'first': cycles[0] if cycles else None, 'last': cycles[-1] if cycles else None,
+            'terms': terms, 'target': target, 'horizon_days': horizon_days, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest trend scoring models against stored history')
+    parser.add_argument('--model', help='scoring model (default: the active one)')
+    parser.add_argument('--grid', nargs='*', default=[], help="settings to sweep, e.g. tiktok.max=20,40,60")
+    parser.add_argument('--terms', nargs='*', help='terms to score (default: the dashboard trends)')
+    parser.add_argument('--target', default='tiktok.views', help='source.metric whose growth is the outcome')
+    parser.add_argument('--horizon-days', type=int, default=HORIZON_DAYS)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    import ultimate_dashboard
+
+    model = scoring.get_model(args.model)
+    jobs = grid_jobs(model, args.grid)
+    terms = args.terms or ultimate_dashboard.TRACKED_TRENDS
+    started = datetime.datetime.now()
+    report = run(jobs, terms, args.target, args.horizon_days, workers=args.workers)
+    elapsed = (datetime.datetime.now() - started).total_seconds()
+
+    print(f"🧪 {model.name}: {len(jobs)} configurations × {report['cycles']} cycles "
+          f"({report['first'] and report['first'][:10]} → {report['last'] and report['last'][:10]}) in {elapsed:.1f}s")
+    print(f"   outcome: {args.target} growth over {args.horizon_days} days\n")
+    for r in report['results'][:10]:
+        settings = ', '.join(f"{k}={v}" for k, v in r['settings'].items()) or '(as configured)'
+        print(f"  spearman {r['spearman'] if r['spearman'] is not None else '—':>7}  "
+              f"hit {r['hit_rate'] if r['hit_rate'] is not None else '—':>6}  "
+              f"lift {r['lift'] if r['lift'] is not None else '—':>7}  n={r['samples']:<6} {settings}")
+
+    storage.dump(dict(report, timestamp=started.isoformat(), model=model.name), OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    main()
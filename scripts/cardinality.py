@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Distinct Counts
+How many different people (and communities) are talking about a term,
+without keeping their handles.
+
+Each collector folds the authors it sees into one HyperLogLog sketch per
+term (2**PRECISION one-byte registers, ~1.6% error), and appends the
+sketches of every scan to data/sketches/<source>.jsonl:
+  {"ts": "...", "terms": {"gorpcore": {"authors": "<sketch>", "communities": "<sketch>"}}}
+
+Sketches merge by taking register maxima, so "unique authors this week" is
+the merge of that week's scans, and merging across sources or alias terms
+gives the size of the union, not the sum. Items are namespaced by source,
+so r/x and @x are different people.
+
+retention.py drops scans older than its SKETCH_DAYS from the logs. The dashboard
+counts every tracked trend with one pass over them (distinct_many).
+
+Usage:
+  python3 scripts/cardinality.py "chrome hearts" --days 7
+"""
+
+import argparse
+import base64
+import datetime
+import hashlib
+import math
+import zlib
+from pathlib import Path
+
+import storage
+
+SKETCH_DIR = Path('data/sketches')
+PRECISION = 12
+KINDS = ('authors', 'communities')
+
+
+class HyperLogLog:
+
+    def __init__(self, precision=PRECISION, registers=None):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    def add(self, item):
+        # A stable hash: sketches are merged across runs
+        x = int.from_bytes(hashlib.blake2b(str(item).encode(), digest_size=8).digest(), 'big')
+        index, rest = x >> (64 - self.p), x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch in: afterwards this one counts the union"""
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            estimate = self.m * math.log(self.m / zeros)
+        return round(estimate)
+
+    def dumps(self):
+        """Compact text form; mostly-empty sketches compress to a few bytes"""
+        return base64.b64encode(zlib.compress(bytes(self.registers), 9)).decode()
+
+    @classmethod
+    def loads(cls, text):
+        registers = bytearray(zlib.decompress(base64.b64decode(text)))
+        return cls(int(math.log2(len(registers))), registers)
+
+
+def sketch(items, namespace):
+    """A sketch of items seen on one source; empty items are ignored"""
+    return HyperLogLog().update(f"{namespace}:{item}" for item in items if item)
+
+
+def merged(texts):
+    """One sketch from serialized sketches; None if there were none"""
+    result = None
+    for text in texts:
+        one = HyperLogLog.loads(text)
+        result = one if result is None else result.merge(one)
+    return result
+
+
+def sketch_path(source):
+    return SKETCH_DIR / f"{source}.jsonl"
+
+
+def record(source, timestamp, terms):
+    """Append one scan's sketches: terms is {term: {kind: serialized sketch}}"""
+    if terms:
+        storage.append(sketch_path(source), [{'ts': timestamp, 'terms': terms}])
+
+
+def distinct(sources, match, kind='authors', since=None, until=None):
+    """
+    Approximate distinct count over every scan in [since, until] and every
+    stored term match(term) accepts, across sources; None when nothing matched
+    """
+    return distinct_many(sources, {None: match}, kind, since, until)[None]
+
+
+def distinct_many(sources, matchers, kind='authors', since=None, until=None):
+    """
+    distinct() for several keys in one pass over the sketch logs: matchers is
+    {key: match}, the result {key: count or None}. Each stored sketch is
+    decoded once however many keys it counts towards.
+    """
+    since = since.isoformat() if since else ''
+    until = until.isoformat() if until else '~'
+    results = dict.fromkeys(matchers)
+    for source in sources:
+        for _, entry in storage.records(sketch_path(source)):
+            if not since <= entry['ts'] <= until:
+                continue
+            for term, sketches in entry['terms'].items():
+                keys = [key for key, match in matchers.items() if kind in sketches and match(term)]
+                if not keys:
+                    continue
+                one = HyperLogLog.loads(sketches[kind])
+                for key in keys:
+                    if results[key] is None:
+                        results[key] = HyperLogLog(one.p)
+                    results[key].merge(one)
+    return {key: result.count() if result else None for key, result in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Approximate distinct authors and communities per term')
+    parser.add_argument('term')
+    parser.add_argument('--days', type=int, default=7)
+    args = parser.parse_args()
+
+    since = datetime.datetime.now() - datetime.timedelta(days=args.days)
+    term = args.term.lower()
+    for source in ('twitter', 'reddit'):
+        for kind in KINDS:
+            n = distinct([source], lambda t: term in t.lower(), kind, since)
+            if n is not None:
+                print(f"  {source:8} {kind:12} ~{n:,} in the last {args.days} days")
+
+
+if __name__ == "__main__":
+    main()
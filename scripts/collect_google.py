@@ -4,11 +4,13 @@ Taste Engine - Google Trends Collector
 Tracks search volume changes
 """
 
-import json
 import datetime
-import requests
 from urllib.parse import quote
 
+import discovery
+import replay
+import storage
+
 def get_google_trends(term):
     """Get Google Trends data (simplified - would use pytrends in production)"""
     # For MVP, we'll use Google's autocomplete as a proxy for trending
@@ -17,7 +19,7 @@ def get_google_trends(term):
     url = f"http://suggestqueries.google.com/complete/search?client=firefox&q={quote(term)}"
     
     try:
-        response = requests.get(url, timeout=5)
+        response = replay.get(url, timeout=5)
         data = response.json()
         suggestions = data[1] if len(data) > 1 else []
         
@@ -47,11 +49,12 @@ def main():
         trend_data = get_google_trends(term)
         if trend_data:
             results['google_trends'][term] = trend_data
-            
+    
+    discovery.record('google', results['timestamp'],
+                     [(term, s) for term, t in results['google_trends'].items() for s in t['related_searches']])
+    
     # Save results
-    output_file = f"data/google_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    output_file = storage.dump(results, f"data/google_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
     
     print(f"\n✅ Saved to {output_file}")
 
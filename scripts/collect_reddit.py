@@ -2,14 +2,152 @@
 """
 Taste Engine - Reddit Sentiment Analyzer
 Tracks fashion discussion across subreddits
+
+Each term is searched in every community on its own, concurrently, so the
+breakdown shows which community drives it; the blended totals are summed
+locally. A run sends at most MAX_REQUESTS searches: the pairs whose answers
+are older than a cycle, stalest first. Every other pair is served from
+data/reddit_cache.json, which is committed with the rest of data/, so the
+whole fan-out is refreshed every few cycles at a fixed cost per run.
+Failed requests are never cached. A 429 pauses every worker for its
+Retry-After before the pair is retried.
+REDDIT_MODE=multi falls back to one blended multireddit query per term.
+
+Sentiment also counts the discussion: the most-commented posts per term have
+their comment trees read by reddit_comments, and comments not seen in an
+earlier run are scored with the same word lists as titles.
+
+Distinct authors and communities per term are counted with HyperLogLog
+sketches (see cardinality), which merge across communities here and across
+scans later.
 """
 
-import json
-import requests
 import datetime
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+import cardinality
+import discovery
+import history
+import reddit_comments
+import replay
+import storage
+
+# The blended multireddit the legacy mode queries as one
+MULTIREDDIT = "streetwear+fashion+malefashionadvice"
+
+# Communities queried one by one in fan-out mode; REDDIT_SUBREDDITS="a,b,..." replaces the list
+SUBREDDITS = [
+    'streetwear', 'fashion', 'malefashionadvice', 'femalefashionadvice',
+    'frugalmalefashion', 'frugalfemalefashion', 'sneakers', 'rawdenim',
+    'goodyearwelt', 'techwearclothing', 'avantgardefashion', 'japanesestreetwear',
+    'womensstreetwear', 'vintagefashion', 'thriftstorehauls', 'outfits',
+    'malefashion', 'mensfashion', 'handbags', 'findfashion',
+    'streetwearstartup', 'fashionreps'
+]
+
+WORKERS = 4
+RETRIES = 2
+RETRY_AFTER = 5        # seconds, when a 429 doesn't say
+MAX_RETRY_AFTER = 60
+CACHE_FILE = Path('data/reddit_cache.json')
+CYCLE_SECONDS = 3 * 3600       # the scan workflow's cron and the daemon's collect_reddit interval
+CACHE_TTL = CYCLE_SECONDS - 600    # an answer is due for refresh by the next cycle
+CACHE_MAX_AGE = 7 * 86400      # entries for pairs no longer queried are dropped after this
+MAX_REQUESTS = 60              # searches per run; 7 terms x 22 communities refresh over 3 cycles
 
-def get_reddit_sentiment(term, subreddit="streetwear+fashion+malefashionadvice"):
-    """Check Reddit for mentions and sentiment"""
+POSITIVE_WORDS = ['love', 'fire', 'grail', 'need', 'want', 'cop', 'clean']
+NEGATIVE_WORDS = ['hate', 'trash', 'mid', 'overrated', 'dead', 'over']
+
+def sentiment_label(score):
+    return 'positive' if score > 0 else 'negative' if score < 0 else 'neutral'
+
+def text_sentiment(text):
+    """+1 per positive and -1 per negative indicator word in a title or comment"""
+    text = text.lower()
+    return sum(word in text for word in POSITIVE_WORDS) - sum(word in text for word in NEGATIVE_WORDS)
+
+def top_posts(posts, n=reddit_comments.COMMENT_POSTS):
+    """[[post id, comment count]] of the most-commented posts, busiest first"""
+    ranked = sorted(posts, key=lambda p: (-p[1], p[0]))
+    return [list(p) for p in ranked[:n] if p[1]]
+
+def score_posts(posts):
+    """Mentions, karma, comments and title sentiment for one page of search results"""
+    total_score = sum(p['data']['score'] for p in posts)
+    total_comments = sum(p['data']['num_comments'] for p in posts)
+    
+    # Extract sentiment indicators
+    sentiment_score = sum(text_sentiment(post['data']['title']) for post in posts)
+    authors = cardinality.sketch((p['data'].get('author') for p in posts), 'reddit')
+    
+    return {
+        'mentions': len(posts),
+        'total_karma': total_score,
+        'total_comments': total_comments,
+        'avg_karma': total_score / len(posts) if posts else 0,
+        'sentiment_score': sentiment_score,
+        'sentiment': sentiment_label(sentiment_score),
+        'top_posts': top_posts([(p['data']['id'], p['data']['num_comments']) for p in posts if 'id' in p['data']]),
+        'titles': [p['data']['title'] for p in posts],
+        'unique_authors': authors.count(),
+        'authors_sketch': authors.dumps(),
+        'communities_sketch': cardinality.sketch((p['data'].get('subreddit') for p in posts), 'reddit').dumps()
+    }
+
+_pause_lock = threading.Lock()
+_paused_until = 0.0
+
+def wait_turn():
+    """Sleep out a rate-limit pause another worker hit"""
+    with _pause_lock:
+        delay = _paused_until - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+def back_off(response):
+    """Pause every worker for the Retry-After of a 429"""
+    global _paused_until
+    try:
+        delay = float(response.headers.get('Retry-After', RETRY_AFTER))
+    except (TypeError, ValueError):
+        delay = RETRY_AFTER
+    with _pause_lock:
+        _paused_until = max(_paused_until, time.time() + min(max(delay, 1), MAX_RETRY_AFTER))
+
+_cache = None
+
+def cache():
+    """{'subreddit|term|window': {'fetched': epoch secs, 'result': metrics}}, loaded once per process"""
+    global _cache
+    if _cache is None:
+        _cache = storage.load(CACHE_FILE, {})
+    return _cache
+
+def save_cache():
+    cutoff = time.time() - CACHE_MAX_AGE
+    storage.dump({key: entry for key, entry in sorted(cache().items()) if entry['fetched'] >= cutoff},
+                 CACHE_FILE)
+
+def cache_age(term, subreddit, window):
+    entry = cache().get(f"{subreddit}|{term}|{window}")
+    return time.time() - entry['fetched'] if entry else float('inf')
+
+def get_reddit_sentiment(term, subreddit=MULTIREDDIT, window='week', refresh=True):
+    """
+    Check Reddit for mentions and sentiment; cached per (subreddit, term, window).
+    With refresh=False, or while the cached answer is fresh, only the cache is
+    read. Cached answers carry no titles: those feed discovery once, when fetched.
+    """
+    key = f"{subreddit}|{term}|{window}"
+    entry = cache().get(key)
+    if not refresh or (entry and time.time() - entry['fetched'] < CACHE_TTL):
+        return dict(entry['result']) if entry else None
     
     # Reddit's public JSON API (no auth needed for read)
     url = f"https://www.reddit.com/r/{subreddit}/search.json"
@@ -18,43 +156,84 @@ def get_reddit_sentiment(term, subreddit="streetwear+fashion+malefashionadvice")
         'q': term,
         'sort': 'new',
         'limit': 25,
-        't': 'week'
+        't': window,
+        'restrict_sr': 'on'
     }
     
     headers = {'User-Agent': 'TasteEngine/1.0'}
     
+    for attempt in range(RETRIES + 1):
+        wait_turn()
+        try:
+            response = replay.get(url, params=params, headers=headers, timeout=10)
+        except (requests.RequestException, replay.ReplayMiss):
+            return None
+        if response.status_code != 429 or attempt == RETRIES:
+            break
+        back_off(response)
+    
+    # A rate limit or error body is no answer, not zero mentions: don't cache it
+    if not response.ok:
+        return None
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        data = response.json()
-        
-        posts = data.get('data', {}).get('children', [])
-        
-        total_score = sum(p['data']['score'] for p in posts)
-        total_comments = sum(p['data']['num_comments'] for p in posts)
-        
-        # Extract sentiment indicators
-        positive_words = ['love', 'fire', 'grail', 'need', 'want', 'cop', 'clean']
-        negative_words = ['hate', 'trash', 'mid', 'overrated', 'dead', 'over']
-        
-        sentiment_score = 0
-        for post in posts:
-            title = post['data']['title'].lower()
-            for word in positive_words:
-                if word in title:
-                    sentiment_score += 1
-            for word in negative_words:
-                if word in title:
-                    sentiment_score -= 1
-        
-        return {
-            'mentions': len(posts),
-            'total_karma': total_score,
-            'total_comments': total_comments,
-            'avg_karma': total_score / len(posts) if posts else 0,
-            'sentiment': 'positive' if sentiment_score > 0 else 'negative' if sentiment_score < 0 else 'neutral'
-        }
-    except:
+        listing = response.json()['data']
+    except (ValueError, KeyError, TypeError):
         return None
+    result = score_posts(listing.get('children', []))
+    
+    cache()[key] = {'fetched': time.time(), 'result': {k: v for k, v in result.items() if k != 'titles'}}
+    return result
+
+def aggregate(by_community):
+    """Blend per-community metrics into the totals the multireddit used to return"""
+    measured = {sub: m for sub, m in by_community.items() if m}
+    mentions = sum(m['mentions'] for m in measured.values())
+    total_karma = sum(m['total_karma'] for m in measured.values())
+    sentiment_score = sum(m['sentiment_score'] for m in measured.values())
+    active = {sub: m for sub, m in measured.items() if m['mentions']}
+    authors = cardinality.merged(m['authors_sketch'] for m in measured.values() if 'authors_sketch' in m)
+    return {
+        'mentions': mentions,
+        'total_karma': total_karma,
+        'total_comments': sum(m['total_comments'] for m in measured.values()),
+        'avg_karma': total_karma / mentions if mentions else 0,
+        'sentiment_score': sentiment_score,
+        'sentiment': sentiment_label(sentiment_score),
+        'communities': len(measured),
+        'active_communities': len(active),
+        'top_community': max(active, key=lambda sub: active[sub]['mentions']) if active else None,
+        # Entries cached before comment ingestion have no top_posts
+        'top_posts': top_posts({tuple(p) for m in measured.values() for p in m.get('top_posts', [])}),
+        'titles': [title for m in measured.values() for title in m.get('titles', [])],
+        'unique_authors': authors.count() if authors else None,
+        'authors_sketch': authors.dumps() if authors else None,
+        # Each fan-out query stays in its own community
+        'communities_sketch': cardinality.sketch(active, 'reddit').dumps(),
+        'by_community': measured
+    }
+
+def fan_out(terms, subreddits=None, window='week', workers=WORKERS, max_requests=MAX_REQUESTS):
+    """
+    Every (term, subreddit) pair, the max_requests stalest of those due
+    refreshed concurrently and the rest from the cache; {term: aggregate
+    with per-community breakdown}
+    """
+    subreddits = subreddits or SUBREDDITS
+    pairs = [(term, sub) for term in terms for sub in subreddits]
+    ages = {pair: cache_age(*pair, window) for pair in pairs}
+    due = sorted((pair for pair in pairs if ages[pair] >= CACHE_TTL), key=lambda pair: -ages[pair])
+    refresh = set(due[:max_requests])
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        found = pool.map(lambda pair: get_reddit_sentiment(pair[0], pair[1], window, pair in refresh), pairs)
+    by_term = {}
+    for (term, sub), metrics in zip(pairs, found):
+        by_term.setdefault(term, {})[sub] = metrics
+    return {term: aggregate(by_community) for term, by_community in by_term.items()
+            if any(by_community.values())}
+
+def configured_subreddits():
+    override = os.environ.get('REDDIT_SUBREDDITS')
+    return [s.strip() for s in override.split(',') if s.strip()] if override else SUBREDDITS
 
 def track_reddit_trends():
     """Monitor key terms across Reddit"""
@@ -69,27 +248,58 @@ def track_reddit_trends():
         "gorpcore"
     ]
     
-    results = {}
+    # REDDIT_MODE=multi queries the blended multireddit once per term instead
+    if os.environ.get('REDDIT_MODE') == 'multi':
+        print("📊 Scanning Reddit sentiment...\n")
+        results = {}
+        for term in terms:
+            sentiment = get_reddit_sentiment(term)
+            if sentiment:
+                results[term] = sentiment
+                print(f"  {term}: {sentiment['mentions']} posts, {sentiment['sentiment']} sentiment")
+        save_cache()
+        return results
     
-    print("📊 Scanning Reddit sentiment...\n")
+    subreddits = configured_subreddits()
+    print(f"📊 Scanning Reddit sentiment across {len(subreddits)} communities...\n")
     
-    for term in terms:
-        sentiment = get_reddit_sentiment(term)
-        if sentiment:
-            results[term] = sentiment
-            print(f"  {term}: {sentiment['mentions']} posts, {sentiment['sentiment']} sentiment")
+    results = fan_out(terms, subreddits)
+    save_cache()
+    for term, sentiment in results.items():
+        lead = f", led by r/{sentiment['top_community']}" if sentiment['top_community'] else ''
+        print(f"  {term}: {sentiment['mentions']} posts in {sentiment['active_communities']} communities, "
+              f"{sentiment['sentiment']} sentiment{lead}")
     
     return results
 
+def add_comment_sentiment(results):
+    """Fold new comments under each term's top posts into its sentiment"""
+    posts = {term: [post_id for post_id, _ in info.get('top_posts', [])] for term, info in results.items()}
+    comments = reddit_comments.ingest(posts, text_sentiment)
+    for term, found in comments.items():
+        info = results[term]
+        info['comments_read'] = found['comments']
+        info['comment_sentiment_score'] = found['sentiment_score']
+        info['sentiment_score'] += found['sentiment_score']
+        info['sentiment'] = sentiment_label(info['sentiment_score'])
+    read = sum(found['comments'] for found in comments.values())
+    print(f"\n💬 Read {read} new comments under {sum(map(len, posts.values()))} top posts")
+    return results
+
 def main():
-    data = track_reddit_trends()
+    data = add_comment_sentiment(track_reddit_trends())
     
     # Find most discussed
     most_discussed = sorted(data.items(), key=lambda x: x[1]['mentions'], reverse=True)[:3]
     
     print("\n🗣️ MOST DISCUSSED ON REDDIT:")
     for term, info in most_discussed:
-        print(f"  {term}: {info['mentions']} posts, {info['total_comments']} comments")
+        print(f"  {term}: {info['mentions']} posts, {info['total_comments']} comments "
+              f"({info.get('comments_read', 0)} new read)")
+        communities = sorted(info.get('by_community', {}).items(), key=lambda x: x[1]['mentions'], reverse=True)
+        leaders = [f"r/{sub} ({m['mentions']})" for sub, m in communities[:3] if m['mentions']]
+        if leaders:
+            print(f"    where: {', '.join(leaders)}")
     
     # Find positive sentiment
     positive = [(k, v) for k, v in data.items() if v['sentiment'] == 'positive']
@@ -98,12 +308,31 @@ def main():
         for term, _ in positive:
             print(f"  {term}")
     
+    # Titles feed term discovery and sketches the distinct counts; neither is kept in the snapshot
+    timestamp = datetime.datetime.now().isoformat()
+    discovery.record('reddit', timestamp, [(term, title) for term, info in data.items()
+                                           for title in info.get('titles', [])])
+    cardinality.record('reddit', timestamp, {
+        term: {kind: info[f"{kind}_sketch"] for kind in cardinality.KINDS if info.get(f"{kind}_sketch")}
+        for term, info in data.items()
+    })
+    for info in [*data.values(), *(c for info in data.values() for c in info.get('by_community', {}).values())]:
+        for key in ('titles', 'authors_sketch', 'communities_sketch'):
+            info.pop(key, None)
+    
+    # Append to the per-term history
+    history.record('reddit', timestamp, {
+        term: {k: info[k] for k in ('mentions', 'avg_karma', 'total_comments', 'sentiment', 'communities',
+                                 'comments_read', 'unique_authors')
+               if k in info}
+        for term, info in data.items()
+    })
+    
     # Save
-    with open('data/reddit_latest.json', 'w') as f:
-        json.dump({
-            'timestamp': datetime.datetime.now().isoformat(),
-            'reddit_data': data
-        }, f, indent=2)
+    storage.dump({
+        'timestamp': timestamp,
+        'reddit_data': data
+    }, 'data/reddit_latest.json')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
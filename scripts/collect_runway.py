@@ -4,10 +4,16 @@ Taste Engine - Runway & Fashion Week Tracker
 What designers think will matter (vs what actually does)
 """
 
-import json
-import requests
 import datetime
-from collections import Counter
+
+import event_study
+import post_pipeline
+import runway_archive
+import storage
+import street_adoption
+
+# Season get_fashion_week_trends reports on
+SEASON = 'FW26'
 
 def get_fashion_week_trends():
     """
@@ -63,63 +69,27 @@ def get_fashion_week_trends():
     
     return runway_trends
 
-def analyze_runway_to_street():
+def load_archive():
+    """Runway archive with this season's reports folded in"""
+    archive = runway_archive.RunwayArchive.load()
+    archive.add_season(SEASON, get_fashion_week_trends())
+    archive.save()
+    return archive
+
+def analyze_runway_to_street(archive=None, season=SEASON):
     """
     Compare runway trends to actual street adoption
     """
     
-    runway_trends = get_fashion_week_trends()
-    
-    # Aggregate all trends
-    all_trends = []
-    for city, data in runway_trends.items():
-        for trend in data['key_trends']:
-            all_trends.append({
-                'name': trend['trend'],
-                'runway_frequency': trend['frequency'],
-                'brands': trend['brands'],
-                'city': city
-            })
-    
-    # Sort by frequency across all shows
-    trending_on_runway = sorted(all_trends, key=lambda x: x['runway_frequency'], reverse=True)
-    
-    # Simulate street adoption (in production, cross-ref with social data)
-    street_adoption = {
-        'Oversized Coats': 67,  # High adoption
-        'Metallic Everything': 12,  # Low adoption
-        'Return of Fur': 78,  # High (mob wife effect)
-        'Office Siren': 45,  # Medium adoption
-        'Cargo Everything': 89,  # Very high (gorpcore)
-        'Mini Bags': 23,  # Low adoption
-        'Layered Knits': 56,  # Medium-high
-        'Neo-Punk': 8,  # Very low
-        'Shearling Everything': 34,  # Medium
-        'Extreme Shoulders': 3  # Almost none
-    }
-    
-    # Calculate runway-to-street gap
-    gaps = []
-    for trend in trending_on_runway:
-        street_score = street_adoption.get(trend['name'], 0)
-        gap = trend['runway_frequency'] - street_score
-        
-        if gap > 20:
-            status = 'RUNWAY ONLY - Not translating'
-        elif gap < -20:
-            status = 'STREET LED - Runway following culture'
-        else:
-            status = 'ALIGNED - Runway predicted correctly'
-        
-        gaps.append({
-            'trend': trend['name'],
-            'runway_score': trend['runway_frequency'],
-            'street_score': street_score,
-            'gap': gap,
-            'status': status,
-            'brands': trend['brands']
-        })
+    # Every trend shown this season, by frequency across all shows
+    trending_on_runway = (archive or load_archive()).trends(season)
     
+    # Street adoption measured from stored TikTok / Twitter / Reddit scans;
+    # only scans newer than the last run are read
+    adoption = street_adoption.StreetAdoption.load()
+    gaps = adoption.update(trending_on_runway)
+    adoption.save()
+
     return gaps
 
 def track_designer_moves():
@@ -132,7 +102,8 @@ def track_designer_moves():
             'to': 'Versace',
             'date': '2026-01-31',
             'impact': 'HIGH - First post-Donatella era',
-            'predicted_aesthetic': 'Sculptural minimalism meets Italian excess'
+            'predicted_aesthetic': 'Sculptural minimalism meets Italian excess',
+            'terms': ['versace', 'pieter mulier']
         },
         {
             'designer': 'Jonathan Anderson',
@@ -140,7 +111,8 @@ def track_designer_moves():
             'to': 'Dior Mens',
             'date': '2026-01-15',
             'impact': 'HIGH - Replacing Kim Jones',
-            'predicted_aesthetic': 'Craft meets luxury'
+            'predicted_aesthetic': 'Craft meets luxury',
+            'terms': ['dior', 'jonathan anderson']
         },
         {
             'designer': 'Grace Wales Bonner',
@@ -148,38 +120,52 @@ def track_designer_moves():
             'to': 'Collaboration with Louis Vuitton',
             'date': '2026-02-01',
             'impact': 'MEDIUM - Limited collection',
-            'predicted_aesthetic': 'Afro-European fusion'
+            'predicted_aesthetic': 'Afro-European fusion',
+            'terms': ['wales bonner', 'louis vuitton']
         }
     ]
     
     return recent_moves
 
+def designer_move_events(moves=None):
+    """Each appointment as an event study on the brand and designer it touches"""
+    return [{
+        'id': f"move:{move['designer']}:{move['to']}",
+        'label': f"{move['designer']} → {move['to']}",
+        'date': move['date'],
+        'terms': move['terms']
+    } for move in (moves or track_designer_moves())]
+
 def main():
     print("🏃‍♀️ RUNWAY INTELLIGENCE TRACKER\n")
     print("=" * 60)
     
-    # Get fashion week data
-    runway_data = get_fashion_week_trends()
-    
-    print("\n📍 FASHION WEEK KEY TRENDS:\n")
+    # Get fashion week data, archived alongside every earlier season
+    archive = load_archive()
+    print(f"\n📍 FASHION WEEK KEY TRENDS ({SEASON}):\n")
     
-    # Aggregate top trends across all cities
-    all_trends_freq = Counter()
-    for city, data in runway_data.items():
+    for city in archive.cities(SEASON):
         print(f"{city}:")
-        for trend in data['key_trends'][:2]:  # Top 2 per city
-            print(f"  • {trend['trend']} ({trend['frequency']} appearances)")
-            all_trends_freq[trend['trend']] += trend['frequency']
+        for trend, frequency in archive.top_trends(SEASON, 2, city):  # Top 2 per city
+            print(f"  • {trend} ({frequency} appearances)")
         print()
     
     # Most common trend overall
     print("🔥 BIGGEST RUNWAY TREND OVERALL:")
-    top_trend = all_trends_freq.most_common(1)[0]
+    top_trend = archive.top_trends(SEASON, 1)[0]
     print(f"  {top_trend[0]}: {top_trend[1]} total appearances\n")
     
+    # Season over season, when the archive has an earlier season
+    seasons = archive.seasons()
+    if SEASON in seasons and seasons.index(SEASON) > 0:
+        previous = seasons[seasons.index(SEASON) - 1]
+        diff = archive.compare(previous, SEASON, k=3)
+        print(f"📈 RISING SINCE {previous}: " + ', '.join(f"{t} (+{n})" for t, n in diff['rising']))
+        print("📉 FADING: " + ', '.join(f"{t} ({n})" for t, n in diff['falling']) + "\n")
+    
     # Runway to street analysis
     print("📊 RUNWAY vs STREET ADOPTION:\n")
-    gaps = analyze_runway_to_street()
+    gaps = analyze_runway_to_street(archive)
     
     # Find biggest disconnects
     runway_only = [g for g in gaps if 'RUNWAY ONLY' in g['status']]
@@ -197,49 +183,65 @@ def main():
         print("✅ STREET WINS (low on runway, high on street):")
         for item in street_led[:3]:
             print(f"  • {item['trend']}: Street {item['street_score']} vs Runway {item['runway_score']}")
-            print(f"    Culture led, fashion followed")
+            print("    Culture led, fashion followed")
     
     # Designer moves
     print("\n👔 DESIGNER MUSICAL CHAIRS:\n")
     moves = track_designer_moves()
-    for move in moves[:2]:
+    events = designer_move_events(moves)
+    studies = event_study.study(events)
+    for move, event in zip(moves, events):
+        move['measured_impact'] = studies[event['id']]
+    for move, event in list(zip(moves, events))[:2]:
         print(f"• {move['designer']} → {move['to']}")
         print(f"  Impact: {move['impact']}")
+        print(f"  Measured: {event_study.describe(move['measured_impact'])}")
         print(f"  Prediction: {move['predicted_aesthetic']}\n")
     
     # Color trends
     print("🎨 COLOR STORY:\n")
-    all_colors = []
-    for city, data in runway_data.items():
-        all_colors.extend(data['colors'])
-    
-    color_freq = Counter(all_colors)
-    print(f"Leading colors: {', '.join([f'{c}' for c, _ in color_freq.most_common(3)])}")
+    print(f"Leading colors: {', '.join([f'{c}' for c, _ in archive.palette(SEASON, 3)])}")
     
     # Generate insights
     print("\n💡 RUNWAY INSIGHTS:\n")
     
+    by_trend = {g['trend']: g for g in gaps}
+    top_street = by_trend[top_trend[0]]['street_score']
+    if top_street is None:
+        adoption_label = 'Not measured yet'
+    else:
+        adoption_label = f"{'High' if top_street >= 50 else 'Low'} ({top_street})"
+    flop = max(runway_only, key=lambda g: g['gap'], default=None)
+    
     insights = [
         f"1. {top_trend[0]} appeared {top_trend[1]} times across all Fashion Weeks. "
-        f"Street adoption: {'High' if top_trend[0] in ['Return of Fur', 'Cargo Everything'] else 'Low'}.",
+        f"Street adoption: {adoption_label}.",
         
-        f"2. Biggest runway flop: Extreme Shoulders. 27 runway appearances, "
-        f"3% street adoption. Balenciaga miscalculated.",
+        f"2. Biggest runway flop: {flop['trend']}. {flop['runway_score']} runway appearances, "
+        f"{flop['street_score']}% street adoption. {flop['brands'][0]} miscalculated."
+        if flop else "2. No runway flops: every measured trend is translating to the street.",
         
-        f"3. Pieter Mulier at Versace signals shift from maximalism to "
-        f"sculptural minimalism. Watch for Versace price corrections.",
+        "3. Pieter Mulier at Versace signals shift from maximalism to "
+        "sculptural minimalism. Watch for Versace price corrections.",
         
-        f"4. Color shift: Blood Red replacing Barbiecore Pink. "
-        f"Dark romance overtaking optimism."
+        "4. Color shift: Blood Red replacing Barbiecore Pink. "
+        "Dark romance overtaking optimism."
     ]
     
     for insight in insights:
         print(f"{insight}\n")
     
+    # The measured findings are post material; the editorial ones aren't
+    post_pipeline.submit('collect_runway', [
+        {'text': insights[0].split('. ', 1)[1], 'score': 50},
+        {'text': insights[1].split('. ', 1)[1], 'score': 65 if flop else 30}
+    ])
+    
     # Save data
     output = {
         'timestamp': datetime.datetime.now().isoformat(),
-        'runway_trends': runway_data,
+        'season': SEASON,
+        'runway_trends': {city: archive.report(SEASON, city) for city in archive.cities(SEASON)},
         'runway_street_gaps': gaps,
         'designer_moves': moves,
         'top_overall_trend': {
@@ -248,8 +250,7 @@ def main():
         }
     }
     
-    with open('data/runway_latest.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    storage.dump(output, 'data/runway_latest.json')
     
     print("✅ Runway data saved")
 
@@ -4,10 +4,11 @@ Taste Engine - StockX Price Tracker
 Monitors resale market movements
 """
 
-import json
-import requests
 import datetime
 
+import history
+import storage
+
 def get_stockx_data(search_term):
     """Scrape StockX for price data (simplified for MVP)"""
     # In production, use their unofficial API or scraping service
@@ -63,6 +64,14 @@ def get_stockx_data(search_term):
         "highest_bid": 0
     }
 
+def price_signal(change_pct):
+    """'HOT' above +20% w/w, 'COOLING' below -15%, else None"""
+    if change_pct > 20:
+        return 'HOT'
+    if change_pct < -15:
+        return 'COOLING'
+    return None
+
 def track_key_items():
     """Track specific high-signal items"""
     
@@ -83,14 +92,9 @@ def track_key_items():
         results[item] = data
         
         # Flag significant movements
-        if '+' in data['week_change']:
-            change = int(data['week_change'].replace('%', '').replace('+', ''))
-            if change > 20:
-                data['signal'] = 'HOT'
-        elif '-' in data['week_change']:
-            change = int(data['week_change'].replace('%', '').replace('-', ''))
-            if change > 15:
-                data['signal'] = 'COOLING'
+        signal = price_signal(int(data['week_change'].replace('%', '').replace('+', '')))
+        if signal:
+            data['signal'] = signal
     
     return results
 
@@ -121,14 +125,23 @@ def main():
     for item, info in high_volume:
         print(f"  {item}: {info['volume']} sales this week")
     
+    # Append to the per-term history the scoring backtest replays
+    timestamp = datetime.datetime.now().isoformat()
+    history.record('stockx', timestamp, {
+        item: {
+            'avg_price': info['avg_price'],
+            'change_pct': int(info['week_change'].replace('%', '').replace('+', '')),
+            'volume': info['volume']
+        } for item, info in data.items()
+    })
+    
     # Save data
     output = {
-        'timestamp': datetime.datetime.now().isoformat(),
+        'timestamp': timestamp,
         'stockx_data': data
     }
     
-    with open('data/stockx_latest.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    storage.dump(output, 'data/stockx_latest.json')
     
     print("\n✅ Data saved")
 
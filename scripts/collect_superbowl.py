@@ -4,9 +4,25 @@ Taste Engine - Super Bowl & Major Ad Campaign Tracker
 Where brands put their $7M bets
 """
 
-import json
 import datetime
 
+import ad_engine as engine
+import event_study
+import storage
+
+SUPERBOWL_DATE = '2026-02-09'
+
+# Which macro theme each advertiser is betting on
+AD_THEMES = {
+    'PERSONALIZATION/AI': ['Nike'],
+    'Y2K_NOSTALGIA': ['Pepsi'],
+    'DIGITAL_FASHION': ['Meta'],
+    'FAST_FASHION': ['Temu'],
+    'QUIET_LUXURY': ['BMW'],
+    'ANTI_HYPE': ['Skechers'],
+    'LIFESTYLE_EXPANSION': ['Uber', 'Liquid Death']
+}
+
 def get_superbowl_2026_ads():
     """
     Track Super Bowl 2026 advertisers and themes
@@ -89,31 +105,18 @@ def get_superbowl_2026_ads():
         }
     ]
     
+    for ad in superbowl_ads:
+        ad['air_date'] = SUPERBOWL_DATE
+    
     return superbowl_ads
 
-def analyze_ad_themes():
+def ad_engine():
+    """Super Bowl catalog indexed by brand and theme"""
+    return engine.AdEngine(get_superbowl_2026_ads(), AD_THEMES)
+
+def analyze_ad_themes(ads=None):
     """Extract macro trends from ad spending"""
-    
-    ads = get_superbowl_2026_ads()
-    
-    # Aggregate themes
-    themes = {
-        'PERSONALIZATION/AI': ['Nike'],
-        'Y2K_NOSTALGIA': ['Pepsi'],
-        'DIGITAL_FASHION': ['Meta'],
-        'FAST_FASHION': ['Temu'],
-        'QUIET_LUXURY': ['BMW'],
-        'ANTI_HYPE': ['Skechers'],
-        'LIFESTYLE_EXPANSION': ['Uber', 'Liquid Death']
-    }
-    
-    # Calculate investment per theme
-    theme_investment = {}
-    for theme, brands in themes.items():
-        total_cost = sum(ad['cost'] for ad in ads if ad['brand'] in brands)
-        theme_investment[theme] = total_cost
-    
-    return theme_investment
+    return (ads or ad_engine()).theme_spend
 
 def track_celebrity_fashion_influence():
     """Which celebs are driving fashion through ads"""
@@ -133,44 +136,9 @@ def track_celebrity_fashion_influence():
     
     return celebrity_impact
 
-def compare_to_social_trends():
-    """Compare big ad bets to actual social trends"""
-    
-    # What brands are betting on
-    ad_themes = analyze_ad_themes()
-    
-    # What's actually trending (from our other data)
-    social_reality = {
-        'PERSONALIZATION/AI': 85,  # High alignment
-        'Y2K_NOSTALGIA': 45,  # Medium alignment
-        'DIGITAL_FASHION': 12,  # Low alignment
-        'FAST_FASHION': 78,  # High alignment
-        'QUIET_LUXURY': 8,  # Very low (dead trend)
-        'ANTI_HYPE': 67,  # Growing
-        'LIFESTYLE_EXPANSION': 56  # Medium
-    }
-    
-    gaps = []
-    for theme, investment in ad_themes.items():
-        social_score = social_reality.get(theme, 0)
-        
-        if social_score < 20 and investment > 10000000:
-            assessment = 'WASTED MONEY - Trend is dead'
-        elif social_score > 70 and investment > 10000000:
-            assessment = 'SMART BET - Riding the wave'
-        elif social_score > 70 and investment < 10000000:
-            assessment = 'MISSED OPPORTUNITY - Under-invested'
-        else:
-            assessment = 'UNCERTAIN - Mixed signals'
-        
-        gaps.append({
-            'theme': theme.replace('_', ' '),
-            'ad_spend': investment,
-            'social_trend_score': social_score,
-            'assessment': assessment
-        })
-    
-    return gaps
+def compare_to_social_trends(ads=None):
+    """Compare big ad bets to social trend scores measured from our scans"""
+    return (ads or ad_engine()).assess()
 
 def track_fashion_brand_campaigns():
     """Major fashion brand campaigns outside Super Bowl"""
@@ -182,7 +150,9 @@ def track_fashion_brand_campaigns():
             'spend_estimate': 50000000,
             'strategy': 'Low-key product focus',
             'channels': ['Print', 'Selective digital'],
-            'fashion_impact': 'Testing if controversy killed the brand'
+            'fashion_impact': 'Testing if controversy killed the brand',
+            'launch_date': '2026-01-12',
+            'terms': ['balenciaga']
         },
         {
             'brand': 'Zara',
@@ -190,7 +160,9 @@ def track_fashion_brand_campaigns():
             'spend_estimate': 30000000,
             'strategy': 'Tech-forward positioning',
             'channels': ['Instagram', 'TikTok', 'In-app'],
-            'fashion_impact': 'Legitimizing AI in fashion'
+            'fashion_impact': 'Legitimizing AI in fashion',
+            'launch_date': '2026-02-02',
+            'terms': ['zara']
         },
         {
             'brand': 'SHEIN',
@@ -198,7 +170,9 @@ def track_fashion_brand_campaigns():
             'spend_estimate': 80000000,
             'strategy': 'Change perception',
             'channels': ['Influencers', 'YouTube', 'Events'],
-            'fashion_impact': 'Trying to go upmarket'
+            'fashion_impact': 'Trying to go upmarket',
+            'launch_date': '2026-01-20',
+            'terms': ['shein']
         },
         {
             'brand': 'Stone Island',
@@ -206,12 +180,23 @@ def track_fashion_brand_campaigns():
             'spend_estimate': 25000000,
             'strategy': 'Culture credibility',
             'channels': ['Organic social', 'Events'],
-            'fashion_impact': 'Gorpcore meets hip-hop'
+            'fashion_impact': 'Gorpcore meets hip-hop',
+            'launch_date': '2026-02-16',
+            'terms': ['stone island', 'drake']
         }
     ]
     
     return campaigns
 
+def campaign_events(campaigns=None):
+    """Each campaign launch as an event study on its brand"""
+    return [{
+        'id': f"campaign:{c['brand']}:{c['campaign']}",
+        'label': f"{c['brand']}: {c['campaign']}",
+        'date': c['launch_date'],
+        'terms': c['terms']
+    } for c in (campaigns or track_fashion_brand_campaigns())]
+
 def main():
     print("🏈 SUPER BOWL & AD INTELLIGENCE\n")
     print("=" * 60)
@@ -219,7 +204,8 @@ def main():
     # Super Bowl ads
     print("💰 SUPER BOWL LX (Feb 9, 2026) FASHION-RELEVANT ADS:\n")
     
-    ads = get_superbowl_2026_ads()
+    catalog = ad_engine()
+    ads = catalog.ads
     fashion_ads = [ad for ad in ads if ad['fashion_relevance'] in ['HIGH', 'VERY HIGH']]
     
     total_fashion_spend = sum(ad['cost'] for ad in fashion_ads)
@@ -235,7 +221,7 @@ def main():
     # Theme analysis
     print("\n📊 WHERE THE MONEY IS GOING:\n")
     
-    theme_money = analyze_ad_themes()
+    theme_money = analyze_ad_themes(catalog)
     sorted_themes = sorted(theme_money.items(), key=lambda x: x[1], reverse=True)
     
     for theme, amount in sorted_themes[:5]:
@@ -244,7 +230,7 @@ def main():
     # Reality check
     print("\n🎯 AD SPEND vs REALITY CHECK:\n")
     
-    gaps = compare_to_social_trends()
+    gaps = compare_to_social_trends(catalog)
     
     # Find worst bets
     bad_bets = [g for g in gaps if 'WASTED' in g['assessment']]
@@ -263,14 +249,32 @@ def main():
             print(f"  • {bet['theme']}: ${bet['ad_spend']/1000000:.1f}M")
             print(f"    Social trend score: {bet['social_trend_score']}/100\n")
     
+    # Did the trend actually move after the spot aired?
+    print("📈 TREND RESPONSE AROUND AIR DATE:\n")
+    
+    responses = catalog.campaign_response()
+    measured = [r for r in responses if r['response']]
+    for result in measured[:5]:
+        print(f"  • {result['brand']} ({result['theme']}): {result['response']['before']} → "
+              f"{result['response']['after']}, ROI {result['roi']:+.2f} pts per $1M")
+    if not measured:
+        print(f"  Not enough scan history around {SUPERBOWL_DATE} yet\n")
+    else:
+        print()
+    
     # Fashion campaigns
     print("👗 MAJOR FASHION CAMPAIGNS (Q1 2026):\n")
     
     campaigns = track_fashion_brand_campaigns()
+    events = campaign_events(campaigns)
+    studies = event_study.study(events)
+    for campaign, event in zip(campaigns, events):
+        campaign['measured_impact'] = studies[event['id']]
     for campaign in campaigns[:3]:
         print(f"• {campaign['brand']}: {campaign['campaign']}")
         print(f"  Budget: ${campaign['spend_estimate']/1000000:.0f}M")
-        print(f"  Impact: {campaign['fashion_impact']}\n")
+        print(f"  Impact: {campaign['fashion_impact']}")
+        print(f"  Measured: {event_study.describe(campaign['measured_impact'])}\n")
     
     # Celebrity influence
     print("⭐ CELEBRITY FASHION DRIVERS:\n")
@@ -289,7 +293,8 @@ def main():
         f"Biggest bet: Temu at $21M pushing ultra-fast fashion mainstream.",
         
         f"2. BMW betting $10.5M on quiet luxury revival with Ryan Gosling. "
-        f"Our data shows quiet luxury at 8/100 trend score. This will fail.",
+        f"Our data shows quiet luxury at {catalog.social_scores()['QUIET_LUXURY'][0]}/100 trend score. "
+        f"{'This will fail.' if catalog.social_scores()['QUIET_LUXURY'][0] < 20 else 'The bet has a pulse.'}",
         
         f"3. Nike + Meta pushing digital fashion hard ($28M combined). "
         f"Social adoption still <20%. Too early or creating the market?",
@@ -310,12 +315,12 @@ def main():
         'superbowl_ads': ads,
         'theme_analysis': theme_money,
         'trend_gaps': gaps,
+        'campaign_response': responses,
         'fashion_campaigns': campaigns,
         'total_fashion_ad_spend': total_fashion_spend
     }
     
-    with open('data/ads_latest.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    storage.dump(output, 'data/ads_latest.json')
     
     print("✅ Ad intelligence saved")
 
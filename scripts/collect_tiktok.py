@@ -4,121 +4,42 @@ Taste Engine - TikTok Trend Tracker
 Where culture actually happens
 """
 
-import json
-import requests
+import os
 import datetime
-import hashlib
 
-def get_tiktok_hashtag_data(hashtag):
+import creator_graph
+import history
+import post_pipeline
+import sound_index
+import storage
+import tiktok_sources
+
+# Tracked hashtags; TIKTOK_HASHTAGS="#a,#b,..." extends the list
+HASHTAGS = [
+    '#mobwife', '#quietluxury', '#gorpcore', 
+    '#blokecore', '#coquette', '#archivefashion',
+    '#chromehearts', '#opiumcore', '#y2k'
+]
+
+def tracked_hashtags():
+    extra = [t.strip() for t in os.environ.get('TIKTOK_HASHTAGS', '').split(',') if t.strip()]
+    return HASHTAGS + [t if t.startswith('#') else f"#{t}" for t in extra if t not in HASHTAGS]
+
+def get_tiktok_hashtag_data(hashtag, source=None):
     """
     Track TikTok hashtag metrics
-    In production: Use TikTok's unofficial API or services like Apify/ScraperAPI
-    For MVP: Simulating with realistic trend data
+    Backend comes from tiktok_sources: a scraping API when TIKTOK_API_URL is set,
+    otherwise the deterministic simulator
     """
-    
-    # Generate consistent fake metrics based on hashtag
-    hash_val = int(hashlib.md5(hashtag.encode()).hexdigest()[:8], 16)
-    
-    # Trending hashtags we know are hot
-    hot_tags = {
-        'mobwife': {'views': 142000000, 'growth': '+340%', 'videos': 28400},
-        'quietluxury': {'views': 89000000, 'growth': '-67%', 'videos': 15200},
-        'gorpcore': {'views': 67000000, 'growth': '+89%', 'videos': 9800},
-        'coquette': {'views': 234000000, 'growth': '+12%', 'videos': 45600},
-        'blokecore': {'views': 56000000, 'growth': '+210%', 'videos': 12300},
-        'darkacademia': {'views': 189000000, 'growth': '-23%', 'videos': 34500},
-        'opiumcore': {'views': 23000000, 'growth': '+890%', 'videos': 4500},
-        'y2k': {'views': 567000000, 'growth': '+45%', 'videos': 123000},
-        'archivefashion': {'views': 34000000, 'growth': '+567%', 'videos': 6700},
-        'chromehearts': {'views': 89000000, 'growth': '+234%', 'videos': 17800}
-    }
-    
-    # Check if we have real data for this hashtag
-    clean_tag = hashtag.replace('#', '').lower()
-    if clean_tag in hot_tags:
-        data = hot_tags[clean_tag]
-        return {
-            'hashtag': hashtag,
-            'views': data['views'],
-            'week_over_week': data['growth'],
-            'videos_created': data['videos'],
-            'avg_views_per_video': data['views'] // data['videos']
-        }
-    
-    # Generate plausible data for unknown hashtags
-    base_views = (hash_val % 10000000) + 1000000
-    return {
-        'hashtag': hashtag,
-        'views': base_views,
-        'week_over_week': f"+{hash_val % 200}%",
-        'videos_created': base_views // 5000,
-        'avg_views_per_video': 5000
-    }
+    return (source or tiktok_sources.get_source()).hashtag(hashtag)
 
-def get_trending_sounds():
+def get_trending_sounds(source=None):
     """Track trending audio that drives fashion trends"""
-    
-    # Key sounds driving fashion trends
-    sounds = [
-        {
-            'name': 'Femininomenon by Chappell Roan',
-            'uses': 234000,
-            'fashion_correlation': 'HIGH',
-            'associated_trend': 'coquette aesthetic'
-        },
-        {
-            'name': 'Bloody Mary - Sped Up',
-            'uses': 567000,
-            'fashion_correlation': 'HIGH', 
-            'associated_trend': 'dark feminine'
-        },
-        {
-            'name': 'FE!N - Travis Scott',
-            'uses': 890000,
-            'fashion_correlation': 'MEDIUM',
-            'associated_trend': 'opium aesthetic'
-        },
-        {
-            'name': 'Escapism - RAYE',
-            'uses': 456000,
-            'fashion_correlation': 'HIGH',
-            'associated_trend': 'mob wife aesthetic'
-        }
-    ]
-    
-    return sounds
+    return (source or tiktok_sources.get_source()).sounds()
 
-def track_fashion_creators():
+def track_fashion_creators(source=None):
     """Monitor key fashion influencers on TikTok"""
-    
-    creators = [
-        {
-            'username': '@wisdomkaye',
-            'followers': 8900000,
-            'recent_trend': 'Bringing back skinny jeans discourse',
-            'engagement_rate': '12.3%'
-        },
-        {
-            'username': '@tinyjewishgirl',
-            'followers': 2300000,
-            'recent_trend': 'Mob wife aesthetic pioneer',
-            'engagement_rate': '18.7%'
-        },
-        {
-            'username': '@charlidamelio',
-            'followers': 151000000,
-            'recent_trend': 'Dunkin collab driving casual wear',
-            'engagement_rate': '5.2%'
-        },
-        {
-            'username': '@brittanybavier',
-            'followers': 4500000,
-            'recent_trend': 'Quiet luxury to loud luxury pivot',
-            'engagement_rate': '14.5%'
-        }
-    ]
-    
-    return creators
+    return (source or tiktok_sources.get_source()).creators()
 
 def analyze_velocity(hashtag_data):
     """Calculate trend velocity and predict peak"""
@@ -141,18 +62,16 @@ def main():
     print("🎵 TIKTOK TREND TRACKER\n")
     print("=" * 50)
     
-    # Track main hashtags
-    hashtags = [
-        '#mobwife', '#quietluxury', '#gorpcore', 
-        '#blokecore', '#coquette', '#archivefashion',
-        '#chromehearts', '#opiumcore', '#y2k'
-    ]
+    source = tiktok_sources.get_source()
+    
+    # Track main hashtags - fetched concurrently by HTTP backends
+    hashtags = tracked_hashtags()
     
     all_data = []
     
     print("\n📊 HASHTAG METRICS:\n")
-    for tag in hashtags:
-        data = get_tiktok_hashtag_data(tag)
+    for data in source.hashtags(hashtags):
+        tag = data['hashtag']
         velocity = analyze_velocity(data)
         data['velocity_analysis'] = velocity
         all_data.append(data)
@@ -161,6 +80,15 @@ def main():
         print(f"                | {velocity}")
         print()
     
+    timestamp = datetime.datetime.now().isoformat()
+    history.record('tiktok', timestamp, {
+        tiktok_sources.clean_tag(d['hashtag']): {
+            'views': d['views'],
+            'growth_pct': int(d['week_over_week'].rstrip('%')),
+            'videos': d['videos_created']
+        } for d in all_data
+    })
+    
     # Sort by growth rate
     explosive = [d for d in all_data if 'EXPLOSIVE' in d['velocity_analysis']]
     
@@ -170,64 +98,114 @@ def main():
             print(f"  {item['hashtag']}: {item['views']/1000000:.1f}M views, {item['week_over_week']}")
             print(f"  → {item['videos_created']} new videos this week")
     
-    # Trending sounds
+    # Index which sounds ride with which hashtags this scan
+    scan_id = datetime.datetime.now().strftime('%Y%m%d_%H')
+    videos = source.videos(hashtags, scan_key=scan_id)
+    index = sound_index.SoundIndex.load()
+    graph = creator_graph.CreatorGraph.load()
+    if index.add_scan(scan_id, videos):
+        index.save()
+        # Same scan feeds the creator graph: who picked each hashtag up first
+        events = creator_graph.adoption_events(videos)
+        graph.add_events(events)
+        creator_graph.log_events(events)
+        graph.save()
+    
+    # Trending sounds, with measured correlations where the index has support
     print("\n🎵 TRENDING SOUNDS DRIVING FASHION:")
-    sounds = get_trending_sounds()
+    sounds = sound_index.annotate_sounds(index, get_trending_sounds(source))
     for sound in sounds[:3]:
         print(f"  • {sound['name']}")
         print(f"    {sound['uses']:,} uses → {sound['associated_trend']}")
     
     # Key creators
     print("\n👤 INFLUENTIAL CREATORS TO WATCH:")
-    creators = track_fashion_creators()
+    creators = track_fashion_creators(source)
+    for creator in creators:
+        creator['influence'] = round(graph.score(creator['username']), 3)
     for creator in creators[:3]:
         print(f"  {creator['username']} ({creator['followers']/1000000:.1f}M followers)")
         print(f"  → {creator['recent_trend']}")
     
+    influence = graph.top(10)
+    if influence:
+        print("\n🕸️ TREND LEADERS (adoption graph):")
+        for creator in influence[:3]:
+            print(f"  {creator['username']}: influence {creator['influence']:.2f}, "
+                  f"first on {creator['first_adoptions']} trends")
+    
     # Generate insights
     print("\n💡 TIKTOK INSIGHTS:\n")
+    insights = []
     
     # Find fastest growing
-    fastest = max(all_data, key=lambda x: int(x['week_over_week'].replace('%', '').replace('+', '').replace('-', '')))
-    print(f"1. {fastest['hashtag']} growing {fastest['week_over_week']} w/w with {fastest['videos_created']} new videos")
+    fastest = max(all_data, key=lambda x: int(x['week_over_week'].rstrip('%'))) if all_data else None
+    if fastest:
+        insights.append(f"{fastest['hashtag']} growing {fastest['week_over_week']} w/w "
+                        f"with {fastest['videos_created']} new videos")
     
-    # Find correlation
-    print(f"2. Sound-to-fashion pipeline: 'Escapism' audio driving mob wife aesthetic (456K uses)")
+    # Strongest measured sound/hashtag pair, once the index has support for one
+    pairs = index.top_associations(1)
+    if pairs:
+        insights.append(f"Sound-to-fashion pipeline: '{pairs[0]['sound']}' audio driving #{pairs[0]['hashtag']} "
+                        f"({pairs[0]['lift']:.1f}x lift across {pairs[0]['videos']} videos)")
     
     # Early signal
     early_signal = [d for d in all_data if d['videos_created'] < 10000 and '+' in d['week_over_week']]
     if early_signal:
-        print(f"3. Early signal: {early_signal[0]['hashtag']} - Low volume but growing {early_signal[0]['week_over_week']}")
+        insights.append(f"Early signal: {early_signal[0]['hashtag']} - Low volume but growing "
+                        f"{early_signal[0]['week_over_week']}")
+    
+    for i, insight in enumerate(insights, 1):
+        print(f"{i}. {insight}")
     
     # Save data
     output = {
-        'timestamp': datetime.datetime.now().isoformat(),
+        'timestamp': timestamp,
         'hashtag_data': all_data,
         'trending_sounds': sounds,
-        'key_creators': creators
+        'sound_associations': index.top_associations(20),
+        'key_creators': creators,
+        'creator_influence': influence
     }
     
-    with open('data/tiktok_latest.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    storage.dump(output, 'data/tiktok_latest.json')
     
     print("\n✅ TikTok data saved")
     
     # Generate posts
     print("\n📱 POSTS FOR @tasteengine:\n")
-    
-    posts = [
-        f"{fastest['hashtag']} exploding on TikTok: {fastest['views']/1000000:.0f}M views, "
-        f"{fastest['week_over_week']} growth this week. {fastest['videos_created']} new videos created.",
-        
-        f"TikTok velocity check: #opiumcore ({all_data[7]['week_over_week']}) overtaking "
-        f"#quietluxury ({all_data[1]['week_over_week']}). The culture shift is measurable.",
-        
-        f"The sound-to-fashion pipeline is real: 'Escapism' by RAYE now at 456K uses, "
-        f"directly correlating with mob wife aesthetic growth."
-    ]
+    by_tag = {d['hashtag']: d for d in all_data}
+    posts = []
+    
+    if fastest:
+        growth = int(fastest['week_over_week'].rstrip('%'))
+        posts.append({'text': f"{fastest['hashtag']} exploding on TikTok: {fastest['views']/1000000:.0f}M views, "
+                              f"{fastest['week_over_week']} growth this week. "
+                              f"{fastest['videos_created']} new videos created.",
+                      'score': min(100, 50 + growth / 20)})
+    
+    posts.append({'text': f"TikTok velocity check: #opiumcore "
+                          f"({by_tag.get('#opiumcore', {}).get('week_over_week', 'n/a')}) overtaking "
+                          f"#quietluxury ({by_tag.get('#quietluxury', {}).get('week_over_week', 'n/a')}). "
+                          f"The culture shift is measurable.",
+                  'score': 55})
+    
+    # Strongest measured sound/hashtag pair, or the top sound until the index has support
+    if pairs:
+        posts.append({'text': f"The sound-to-fashion pipeline is real: '{pairs[0]['sound']}' shows up with "
+                              f"#{pairs[0]['hashtag']} {pairs[0]['lift']:.1f}x more often than chance "
+                              f"across {pairs[0]['videos']} videos.",
+                      'score': 75})
+    elif sounds:
+        posts.append({'text': f"The sound-to-fashion pipeline is real: '{sounds[0]['name']}' now at "
+                              f"{sounds[0]['uses']/1000:.0f}K uses, riding with {sounds[0]['associated_trend']}.",
+                      'score': 40})
     
     for i, post in enumerate(posts, 1):
-        print(f"{i}. {post}\n")
+        print(f"{i}. {post['text']}\n")
+    
+    post_pipeline.submit('collect_tiktok', posts)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
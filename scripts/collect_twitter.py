@@ -4,11 +4,13 @@ Taste Engine - Twitter Trend Collector
 Tracks fashion/brand mentions in real-time
 """
 
-import json
-import subprocess
 import datetime
-from collections import Counter
-import re
+
+import cardinality
+import discovery
+import history
+import storage
+import twitter_stream
 
 # Brands and terms we're tracking
 TRACK_TERMS = [
@@ -33,44 +35,30 @@ TRACK_TERMS = [
     "stockx", "grailed", "depop"
 ]
 
-def search_twitter(query, auth_token, ct0):
-    """Search Twitter for a term using bird CLI"""
-    cmd = [
-        "bird", "search", query,
-        "--auth-token", auth_token,
-        "--ct0", ct0,
-        "-n", "10",
-        "--json"
-    ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            return []
-    except:
-        return []
+def search_twitter(query, auth_token, ct0, n=10):
+    """Stream tweets for a term from bird CLI as they arrive"""
+    cmd = twitter_stream.bird_search_cmd(query, auth_token, ct0, n)
+    return twitter_stream.stream_tweets(cmd, timeout=10)
 
-def analyze_trend(tweets):
-    """Extract metrics from tweets"""
-    total_engagement = 0
-    mentions = []
-    
+def keep_texts(tweets, term, corpus):
+    """Pass tweets through, adding their text to the discovery corpus"""
     for tweet in tweets:
-        engagement = tweet.get('likes', 0) + tweet.get('retweets', 0) * 2
-        total_engagement += engagement
-        mentions.append({
-            'text': tweet.get('text', '')[:100],
-            'engagement': engagement,
-            'author': tweet.get('author', {}).get('handle', 'unknown')
-        })
+        corpus.add(term, tweet.get('text') or '')
+        yield tweet
+
+def analyze_trend(tweets):
+    """Extract metrics from tweets, folding them one at a time"""
+    agg = twitter_stream.TrendAggregate().fold(tweets)
     
     return {
-        'count': len(tweets),
-        'total_engagement': total_engagement,
-        'avg_engagement': total_engagement / len(tweets) if tweets else 0,
-        'top_mention': max(mentions, key=lambda x: x['engagement']) if mentions else None
+        'count': agg.count,
+        'unique_authors': agg.unique_authors,
+        'total_engagement': agg.total_engagement,
+        'avg_engagement': agg.avg_engagement,
+        'weighted_engagement': round(agg.weighted_engagement, 1),
+        'avg_reach': round(agg.avg_reach, 2),
+        'top_mention': agg.top_mention,
+        'authors_sketch': agg.authors.dumps()
     }
 
 def main():
@@ -87,21 +75,33 @@ def main():
     print(f"🔍 Scanning {len(TRACK_TERMS)} terms...")
     
     # Collect data for each term
-    for i, term in enumerate(TRACK_TERMS[:5]):  # Start with just 5 to test
-        print(f"  [{i+1}/5] Checking: {term}")
-        tweets = search_twitter(term, AUTH, CT0)
-        
-        if tweets:
-            analysis = analyze_trend(tweets)
-            results['trends'][term] = analysis
+    with discovery.CorpusWriter('twitter', timestamp) as corpus:
+        for i, term in enumerate(TRACK_TERMS[:5]):  # Start with just 5 to test
+            print(f"  [{i+1}/5] Checking: {term}")
+            try:
+                analysis = analyze_trend(keep_texts(search_twitter(term, AUTH, CT0), term, corpus))
+            except Exception:
+                analysis = None
             
-            if analysis['avg_engagement'] > 100:
-                print(f"    🔥 HOT: {analysis['avg_engagement']:.0f} avg engagement")
+            if analysis and analysis['count']:
+                results['trends'][term] = analysis
+                
+                if analysis['avg_engagement'] > 100:
+                    print(f"    🔥 HOT: {analysis['avg_engagement']:.0f} avg engagement")
+    
+    # Append to the per-term history the runway gap analysis reads
+    history.record('twitter', timestamp, {
+        term: {k: data[k] for k in ('count', 'unique_authors', 'avg_engagement', 'weighted_engagement', 'avg_reach')}
+        for term, data in results['trends'].items()
+    })
+    
+    # The sketches go to their own log; the scan keeps the estimate
+    cardinality.record('twitter', timestamp, {
+        term: {'authors': data.pop('authors_sketch')} for term, data in results['trends'].items()
+    })
     
     # Save results
-    output_file = f"data/scan_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    output_file = storage.dump(results, f"data/scan_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
     
     print(f"\n✅ Saved to {output_file}")
     
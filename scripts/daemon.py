@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Daemon
+One long-running process instead of eight cold starts every 3 hours.
+
+Collectors are imported once and run in-process on their own intervals.
+Everything they build stays warm between runs:
+  - persistent stores (sound index, creator graph, street adoption, runway
+    archive, event studies) are cached by file mtime, so a collector's
+    load() returns the object it saved last cycle instead of re-parsing it
+  - the term registry / alias index live inside those stores
+  - HTTP goes through replay's shared session, so connections are pooled
+
+After every job the daemon checkpoints its schedule to data/daemon_state.json
+(a restart picks up where it left off instead of re-running everything).
+Results are served by the query API (query_api) mounted on the daemon's
+endpoint, plus the daemon's own:
+
+  GET /health   GET /jobs
+
+Usage:
+  python3 scripts/daemon.py                          # http://127.0.0.1:8766
+  python3 scripts/daemon.py --socket data/taste.sock
+  python3 scripts/daemon.py --run-now --jobs collect_tiktok,collect_reddit
+  curl --unix-socket data/taste.sock http://localhost/scores
+"""
+
+import argparse
+import contextlib
+import datetime
+import importlib
+import json
+import os
+import socketserver
+import threading
+import time
+import traceback
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import query_api
+import storage
+
+STATE_FILE = Path('data/daemon_state.json')
+LOG_DIR = Path('data/logs')
+
+# job -> minutes between runs, in the order a cycle should run them
+SCHEDULE = {
+    'collect_tiktok': 180,
+    'collect_twitter': 180,
+    'collect_stockx': 180,
+    'collect_reddit': 180,
+    'collect_runway': 1440,
+    'collect_superbowl': 1440,
+    'discovery': 180,
+    'ultimate_dashboard': 180,
+    'master_analyzer': 180,
+    'generate_posts': 180,
+}
+
+# Stores whose load()/save() the daemon keeps warm: module -> class
+WARM_STORES = {
+    'sound_index': 'SoundIndex',
+    'creator_graph': 'CreatorGraph',
+    'street_adoption': 'StreetAdoption',
+    'runway_archive': 'RunwayArchive',
+    'event_study': 'EventStudy',
+}
+
+
+class WarmCache:
+    """
+    Wraps a store class's load/save: load returns the in-memory object while
+    the file on disk is the one we last saw, save records the new mtime.
+    """
+
+    def __init__(self):
+        self.objects = {}        # (class name, path) -> (mtime, object)
+
+    def install(self, cls):
+        load, save = cls.load.__func__, cls.save
+        default = load.__defaults__[0]
+        cache = self.objects
+
+        def warm_load(klass, path=default):
+            key = (klass.__name__, str(path))
+            hit = cache.get(key)
+            if hit and hit[0] == storage.mtime(path):
+                return hit[1]
+            obj = load(klass, path)
+            cache[key] = (storage.mtime(path), obj)
+            return obj
+
+        def warm_save(obj, path=default):
+            save(obj, path)
+            cache[(type(obj).__name__, str(path))] = (storage.mtime(path), obj)
+
+        cls.load = classmethod(warm_load)
+        cls.save = warm_save
+
+    def clear(self):
+        """Drop everything, e.g. after a failed job may have left objects half-updated"""
+        self.objects.clear()
+
+
+class Daemon:
+
+    def __init__(self, jobs=None):
+        self.jobs = {name: SCHEDULE[name] for name in (jobs or SCHEDULE)}
+        self.state = query_api.read_json(STATE_FILE) or {}
+        self.cache = WarmCache()
+        self.modules = {}
+        self.snapshot = {}
+        self.lock = threading.Lock()
+
+        # The collectors expect the directories the scan workflow creates
+        for directory in ('data', 'output'):
+            Path(directory).mkdir(exist_ok=True)
+        for module, cls in WARM_STORES.items():
+            self.cache.install(getattr(importlib.import_module(module), cls))
+        self.refresh()
+
+    def module(self, name):
+        if name not in self.modules:
+            self.modules[name] = importlib.import_module(name)
+        return self.modules[name]
+
+    def next_run(self, name):
+        last = self.state.get(name, {}).get('last_run')
+        if not last:
+            return datetime.datetime.min
+        return datetime.datetime.fromisoformat(last) + datetime.timedelta(minutes=self.jobs[name])
+
+    def run_job(self, name):
+        started = time.perf_counter()
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(LOG_DIR / f"{name}.log", 'a') as log:
+            log.write(f"\n=== {datetime.datetime.now().isoformat()} ===\n")
+            try:
+                with contextlib.redirect_stdout(log):
+                    self.module(name).main()
+                status = 'ok'
+            except (Exception, SystemExit):
+                traceback.print_exc(file=log)
+                status = 'failed'
+                self.cache.clear()
+
+        self.state[name] = {
+            'last_run': datetime.datetime.now().isoformat(),
+            'status': status,
+            'seconds': round(time.perf_counter() - started, 2)
+        }
+        self.checkpoint()
+        self.refresh()
+        return status
+
+    def checkpoint(self):
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_FILE.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, STATE_FILE)
+
+    def refresh(self):
+        """Re-encode the daemon's own endpoints; the query API tracks the result files itself"""
+        jobs = {name: dict(self.state.get(name, {}), every_minutes=minutes,
+                           next_run=self.next_run(name).isoformat())
+                for name, minutes in self.jobs.items()}
+        with self.lock:
+            self.snapshot = {
+                '/jobs': json.dumps(jobs).encode(),
+                '/health': json.dumps({'ok': True, 'pid': os.getpid()}).encode()
+            }
+
+    def endpoint(self, path):
+        def serve():
+            with self.lock:
+                return self.snapshot[path]
+        return serve
+
+    def serve_forever(self, run_now=False):
+        if run_now:
+            for name in self.jobs:
+                self.state.pop(name, None)
+        while True:
+            due = sorted(self.jobs, key=self.next_run)
+            wait = (self.next_run(due[0]) - datetime.datetime.now()).total_seconds()
+            if wait > 0:
+                time.sleep(min(wait, 60))
+                continue
+            # Run everything that's due, in schedule order
+            for name in self.jobs:
+                if self.next_run(name) <= datetime.datetime.now():
+                    print(f"▶ {name}: {self.run_job(name)} ({self.state[name]['seconds']}s)", flush=True)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, handler):
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, handler)
+        # BaseHTTPRequestHandler expects these
+        self.server_name, self.server_port = 'localhost', 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the collectors as a long-lived service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--socket', help='serve on a Unix socket instead of TCP')
+    parser.add_argument('--jobs', help='comma-separated subset of jobs to schedule')
+    parser.add_argument('--run-now', action='store_true', help='ignore the checkpoint and run every job now')
+    args = parser.parse_args()
+
+    daemon = Daemon(args.jobs.split(',') if args.jobs else None)
+    handler = query_api.make_handler(query_api.QueryAPI(),
+                                     {path: daemon.endpoint(path) for path in ('/health', '/jobs')})
+    if args.socket:
+        server = UnixHTTPServer(args.socket, handler)
+        where = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        where = f"http://{args.host}:{args.port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"🛰️ Taste Engine daemon on {where} - {len(daemon.jobs)} jobs scheduled")
+    try:
+        daemon.serve_forever(run_now=args.run_now)
+    except KeyboardInterrupt:
+        daemon.checkpoint()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,11 @@ Combines all data sources and generates insights
 """
 
 import json
-import subprocess
 import datetime
 from pathlib import Path
 
+import twitter_stream
+
 def scan_twitter_live():
     """Quick scan of hot terms"""
     AUTH = "0e124ea53bdd9d743362087b4b85294992f4e3c0"
@@ -19,41 +20,17 @@ def scan_twitter_live():
     results = []
     
     for term in hot_terms:
-        cmd = [
-            "bird", "search", term,
-            "--auth-token", AUTH,
-            "--ct0", CT0,
-            "-n", "20",
-            "--json"
-        ]
+        agg = twitter_stream.search_aggregate(term, AUTH, CT0, 20)
+        if agg is None:
+            continue
         
-        try:
-            output = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if output.returncode == 0:
-                tweets = json.loads(output.stdout)
-                
-                # Calculate metrics
-                total_engagement = sum(
-                    t.get('likeCount', 0) + t.get('retweetCount', 0) * 2 
-                    for t in tweets
-                )
-                
-                # Find the hottest tweet
-                hottest = max(tweets, key=lambda t: t.get('likeCount', 0) + t.get('retweetCount', 0) * 2) if tweets else None
-                
-                results.append({
-                    'term': term,
-                    'mentions': len(tweets),
-                    'total_engagement': total_engagement,
-                    'avg_engagement': total_engagement / len(tweets) if tweets else 0,
-                    'hottest_tweet': {
-                        'text': hottest.get('text', '')[:100] if hottest else '',
-                        'engagement': hottest.get('likeCount', 0) + hottest.get('retweetCount', 0) * 2 if hottest else 0,
-                        'author': hottest.get('author', {}).get('username', '') if hottest else ''
-                    } if hottest else None
-                })
-        except:
-            pass
+        results.append({
+            'term': term,
+            'mentions': agg.count,
+            'total_engagement': agg.total_engagement,
+            'avg_engagement': agg.avg_engagement,
+            'hottest_tweet': agg.top_mention
+        })
     
     return results
 
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Term Discovery
+Finds the phrases nobody is tracking yet.
+
+Collectors append the raw text they see (tweets, Reddit titles, Google
+suggestions) to data/corpus/<source>.jsonl:
+  {"ts": "2026-02-10T09:00:00", "term": "gorpcore", "text": "..."}
+
+The corpus only holds the recent window. Each document's 1-3 word phrases
+are counted once per document into Count-Min sketches: documents from the
+last RECENT_DAYS days go into a recent sketch, rebuilt every run, with a
+heavy-hitter table keeping the TOP_K phrases with the highest recent
+estimate. Days that have left the window are folded, once, into a baseline
+sketch kept in data/discovery_state.json (decayed by BASELINE_HALF_LIFE_DAYS
+so old vocabulary fades), and dropped from the corpus. A run therefore reads
+a few days of text however long discovery has been running, and the corpus
+and state stay a fixed size.
+
+A candidate's acceleration is its recent document rate over its smoothed
+baseline rate. Phrases that are already registered, or that are part of the
+query a document was collected for, are not candidates. The strongest
+candidates are promoted into data/terms.json, where term_registry and every
+scorer pick them up.
+
+Usage:
+  python3 scripts/discovery.py               # score candidates and promote
+  python3 scripts/discovery.py --dry-run     # score only
+"""
+
+import argparse
+import base64
+import datetime
+import hashlib
+import heapq
+import json
+import os
+import re
+import zlib
+from array import array
+from pathlib import Path
+
+import storage
+import term_registry
+
+CORPUS_DIR = Path('data/corpus')
+SOURCES = ('twitter', 'reddit', 'google')
+OUTPUT_FILE = Path('data/discovery_latest.json')
+STATE_FILE = Path('data/discovery_state.json')
+CORPUS_BATCH = 100          # documents per corpus frame while a collector streams
+
+SKETCH_WIDTH = 1 << 16
+SKETCH_DEPTH = 4
+BASELINE_WIDTH = 1 << 15    # the persisted sketch; its size is what gets committed
+BASELINE_HALF_LIFE_DAYS = 30
+BASELINE_UNIT = 256         # baseline cells per count, so daily decay doesn't round counts away
+TOP_K = 500
+MAX_NGRAM = 3
+RECENT_DAYS = 3
+
+MIN_RECENT_DOCS = 5         # a candidate must appear in this many recent documents
+MIN_BASELINE_DOCS = 50      # no promotion until there is a baseline to accelerate against
+PROMOTE_ACCELERATION = 3.0
+PROMOTE_PER_RUN = 3
+SUBSUMED_SHARE = 0.8        # a phrase mostly seen inside a longer candidate is dropped
+
+STOPWORDS = set("""
+a an and are as at be but by for from has have how i if in into is it its just me my new no
+not of on or our so that the their them they this to too up us was we what when where which
+who why will with you your im dont can get got like one all out more now best vs amp rt
+""".split())
+
+
+def corpus_path(source):
+    return CORPUS_DIR / f"{source}.jsonl"
+
+
+def record(source, timestamp, documents):
+    """Append collected text: documents is [(query term, text)]"""
+    documents = [{'ts': timestamp, 'term': term, 'text': text} for term, text in documents if text]
+    storage.append(corpus_path(source), documents)
+
+
+class CorpusWriter:
+    """
+    Appends a collector's text to its corpus as it streams in, CORPUS_BATCH
+    documents per frame, so the collector never holds a run's text. Use as a
+    context manager; the last partial batch is written on exit.
+    """
+
+    def __init__(self, source, timestamp):
+        self.path, self.timestamp, self.pending = corpus_path(source), timestamp, []
+
+    def add(self, term, text):
+        if text:
+            self.pending.append({'ts': self.timestamp, 'term': term, 'text': text})
+            if len(self.pending) >= CORPUS_BATCH:
+                self.flush()
+
+    def flush(self):
+        storage.append(self.path, self.pending)
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def documents(sources=SOURCES):
+    """Yield every collected document, source by source"""
+    for source in sources:
+        for _, doc in storage.records(corpus_path(source)):
+            yield doc
+
+
+def words(text):
+    text = re.sub(r'https?://\S+|@\w+', ' ', text.lower())
+    return re.findall(r"[a-z0-9][a-z0-9'&]*", text.replace('#', ' '))
+
+
+def phrases(text, query='', max_n=MAX_NGRAM):
+    """
+    Distinct 1..max_n word phrases, without ones that start or end on a
+    stopword or that overlap the query the text was collected for
+    """
+    tokens, skip = words(text), words(query)
+    # Split the text around each occurrence of the query
+    segments, start, i = [], 0, 0
+    while skip and i <= len(tokens) - len(skip):
+        if tokens[i:i + len(skip)] == skip:
+            segments.append(tokens[start:i])
+            start = i = i + len(skip)
+        else:
+            i += 1
+    segments.append(tokens[start:])
+
+    found = set()
+    for segment in segments:
+        for n in range(1, max_n + 1):
+            for i in range(len(segment) - n + 1):
+                gram = segment[i:i + n]
+                if gram[0] in STOPWORDS or gram[-1] in STOPWORDS or gram[0].isdigit():
+                    continue
+                found.add(' '.join(gram))
+    return found
+
+
+class CountMinSketch:
+    """
+    Cells hold `unit` per count. A sketch that decays uses a fine unit, so
+    rounding a scaled cell moves it by a fraction of a count; since rounding
+    keeps order, the minimum over an item's cells is still its estimate.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, rows=None, unit=1):
+        self.width, self.depth, self.unit = width, depth, unit
+        self.rows = rows if rows is not None else [array('I', bytes(4 * width)) for _ in range(depth)]
+
+    def cells(self, item):
+        # A stable hash: the baseline sketch is saved and added to across runs
+        h = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), 'big')
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(row, (h1 + i * h2) % self.width) for i, row in enumerate(self.rows)]
+
+    def add(self, item, count=1):
+        """Conservative update: only the cells holding the minimum grow; returns the new estimate"""
+        cells = self.cells(item)
+        estimate = min([row[c] for row, c in cells]) + count * self.unit
+        for row, c in cells:
+            if row[c] < estimate:
+                row[c] = estimate
+        return self._counts(estimate)
+
+    def estimate(self, item):
+        return self._counts(min([row[c] for row, c in self.cells(item)]))
+
+    def _counts(self, cell):
+        return cell if self.unit == 1 else cell / self.unit
+
+    def decay(self, factor):
+        self.rows = [array('I', (round(v * factor) for v in row)) for row in self.rows]
+
+    def dumps(self):
+        return base64.b64encode(zlib.compress(b''.join(row.tobytes() for row in self.rows), 9)).decode()
+
+    @classmethod
+    def loads(cls, text, depth=SKETCH_DEPTH, unit=1):
+        raw = zlib.decompress(base64.b64decode(text))
+        size = len(raw) // depth
+        rows = [array('I', raw[i * size:(i + 1) * size]) for i in range(depth)]
+        return cls(len(rows[0]), depth, rows, unit)
+
+
+class HeavyHitters:
+    """
+    The k items with the highest sketch estimates seen so far. Estimates only
+    grow, so the heap keeps superseded (estimate, item) entries and skips
+    them when they surface.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.counts = {}
+        self.heap = []
+
+    def _floor(self):
+        while self.heap and self.counts.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0]
+
+    def offer(self, item, estimate):
+        if item not in self.counts and len(self.counts) >= self.k:
+            floor, lowest = self._floor()
+            if estimate <= floor:
+                return
+            heapq.heappop(self.heap)
+            del self.counts[lowest]
+        self.counts[item] = estimate
+        heapq.heappush(self.heap, (estimate, item))
+        if len(self.heap) > 4 * self.k:
+            self.heap = [(n, i) for i, n in self.counts.items()]
+            heapq.heapify(self.heap)
+
+
+def load_state(path=STATE_FILE):
+    """(baseline sketch, decayed baseline doc count, first day not yet folded)"""
+    state = storage.load(path)
+    if not state:
+        return CountMinSketch(BASELINE_WIDTH, unit=BASELINE_UNIT), 0.0, ''
+    baseline = CountMinSketch.loads(state['baseline'], unit=state.get('baseline_unit', 1))
+    if baseline.unit != BASELINE_UNIT:
+        # A state saved in whole counts: rescale it to the current unit
+        baseline.decay(BASELINE_UNIT / baseline.unit)
+        baseline.unit = BASELINE_UNIT
+    return baseline, state['baseline_docs'], state['folded_until']
+
+
+def save_state(baseline, baseline_docs, folded_until, path=STATE_FILE):
+    storage.dump({'folded_until': folded_until, 'baseline_docs': round(baseline_docs, 3),
+                  'baseline_unit': baseline.unit, 'baseline': baseline.dumps()}, path)
+
+
+def window_start(now=None, recent_days=RECENT_DAYS):
+    """First day of the recent window; earlier days belong to the baseline"""
+    return ((now or datetime.datetime.now()).date() - datetime.timedelta(days=recent_days)).isoformat()
+
+
+def scan(docs, state, start):
+    """
+    One pass over documents -> (recent sketch, baseline sketch, heavy hitters,
+    doc counts, newly folded days). Documents before `start` that the state
+    hasn't folded yet go into its baseline, decayed to `start` first.
+    """
+    baseline, baseline_docs, folded_until = state
+    recent, hitters = CountMinSketch(), HeavyHitters()
+    counts = {'recent': 0, 'baseline': baseline_docs}
+    aging = []
+    for doc in docs:
+        day = doc['ts'][:10]
+        if day >= start:
+            counts['recent'] += 1
+            for gram in phrases(doc['text'], doc.get('term', '')):
+                hitters.offer(gram, recent.add(gram))
+        elif day >= folded_until:
+            aging.append(doc)
+
+    folded = sorted({doc['ts'][:10] for doc in aging})
+    if folded_until and start > folded_until:
+        elapsed = (datetime.date.fromisoformat(start) - datetime.date.fromisoformat(folded_until)).days
+        factor = 0.5 ** (elapsed / BASELINE_HALF_LIFE_DAYS)
+        baseline.decay(factor)
+        counts['baseline'] *= factor
+    for doc in aging:
+        counts['baseline'] += 1
+        for gram in phrases(doc['text'], doc.get('term', '')):
+            baseline.add(gram)
+    return recent, baseline, hitters, counts, folded
+
+
+def rotate(start, sources=SOURCES):
+    """Drop documents before the recent window from the corpus"""
+    for source in sources:
+        path = corpus_path(source)
+        if not storage.exists(path):
+            continue
+        docs = [doc for _, doc in storage.records(path)]
+        kept = [doc for doc in docs if doc['ts'][:10] >= start]
+        if len(kept) < len(docs):
+            with storage.writer(path, storage.codec_of(storage.find(path)).name) as out:
+                for doc in kept:
+                    out.write(doc)
+
+
+def candidates(recent, baseline, hitters, counts, known=None):
+    """Heavy hitters that accelerate against their baseline, strongest first"""
+    known = known if known is not None else term_registry.build_alias_index()
+    rows = []
+    for gram, seen in hitters.counts.items():
+        if seen < MIN_RECENT_DOCS:
+            continue
+        recent_rate = seen / max(counts['recent'], 1)
+        baseline_rate = (baseline.estimate(gram) + 1) / (counts['baseline'] + 1)
+        rows.append({'term': gram, 'recent_docs': seen, 'baseline_docs': round(baseline.estimate(gram), 2),
+                     'acceleration': round(recent_rate / baseline_rate, 2)})
+
+    # One phrase surfaces as several overlapping n-grams: "grandpa energy" seen
+    # mostly inside "eclectic grandpa energy" is the same signal, and so is
+    # "denim eclectic grandpa", a rare extension of "eclectic grandpa"
+    def within(short, long):
+        return short is not long and f" {short['term']} " in f" {long['term']} "
+
+    rows = [r for r in rows if not any(within(s, r) and r['recent_docs'] < SUBSUMED_SHARE * s['recent_docs']
+                                       for s in rows)]
+    rows = [r for r in rows if not any(within(r, l) and l['recent_docs'] >= SUBSUMED_SHARE * r['recent_docs']
+                                       for l in rows)]
+    # Only now, so "mob" goes with the registered "mob wife" it's part of
+    rows = [r for r in rows if term_registry.normalize(r['term']) not in known]
+    return sorted(rows, key=lambda r: (-r['acceleration'], -r['recent_docs'], r['term']))
+
+
+def promote(found, timestamp, path=term_registry.REGISTRY_FILE):
+    """Add accelerating candidates to the registry file; returns the names added"""
+    registry = {}
+    if path.exists():
+        with open(path) as f:
+            registry = json.load(f)
+    terms = registry.setdefault('terms', {})
+    discovered = registry.setdefault('discovered', {})
+
+    added = []
+    for row in found:
+        if len(added) >= PROMOTE_PER_RUN:
+            break
+        if row['acceleration'] < PROMOTE_ACCELERATION or row['term'] in terms:
+            continue
+        aliases = [row['term']]
+        if ' ' in row['term']:
+            aliases.append(row['term'].replace(' ', ''))
+        terms[row['term']] = aliases
+        discovered[row['term']] = {'promoted': timestamp, 'acceleration': row['acceleration'],
+                                   'recent_docs': row['recent_docs']}
+        added.append(row['term'])
+
+    if added:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(registry, f, indent=2)
+        os.replace(tmp, path)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Discover accelerating phrases in collected text')
+    parser.add_argument('--days', type=int, default=RECENT_DAYS, help='recent window in days')
+    parser.add_argument('--dry-run', action='store_true', help="score only, don't promote")
+    args = parser.parse_args()
+
+    timestamp = datetime.datetime.now().isoformat()
+    start = window_start(recent_days=args.days)
+    recent, baseline, hitters, counts, folded = scan(documents(), load_state(), start)
+    found = candidates(recent, baseline, hitters, counts)
+    print(f"🔭 {counts['recent']} recent documents against a baseline of {counts['baseline']:.0f}"
+          f"{f' ({len(folded)} days folded in)' if folded else ''}\n")
+    for row in found[:10]:
+        print(f"  {row['term']:30} {row['acceleration']:6.1f}x  ({row['recent_docs']} recent docs)")
+
+    promoted = []
+    if not args.dry_run and counts['baseline'] >= MIN_BASELINE_DOCS:
+        promoted = promote(found, timestamp)
+        for term in promoted:
+            print(f"\n🌱 Promoted to the term registry: {term}")
+
+    if not args.dry_run:
+        # State first: if rotating fails, the folded days are skipped next run, not counted twice
+        if folded:
+            save_state(baseline, counts['baseline'], start)
+            rotate(start)
+        storage.dump({'timestamp': timestamp, 'documents': dict(counts, baseline=round(counts['baseline'])),
+                      'candidates': found[:50], 'promoted': promoted}, OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Event Studies
+Did an air date or a designer appointment actually move anything?
+
+An event is a date plus the brands / terms it should affect:
+  {'id': 'move:Pieter Mulier', 'date': '2026-01-31', 'terms': ['versace']}
+
+For each event the affected terms' street scores (same scale as
+street_adoption) are pulled from the history store into three windows:
+
+  baseline   [date - BASELINE_DAYS - PRE_DAYS, date - PRE_DAYS)
+  pre        [date - PRE_DAYS, date)
+  post       [date, date + POST_DAYS]
+
+and reported as pre/post deltas plus abnormal engagement: how far the post
+window sits from the baseline, in baseline standard deviations.
+
+All events are evaluated together: each history log is read once and every
+scan is routed to the events whose terms and windows it falls in. Results
+are cached per event in data/event_studies.json along with the window's
+points and how far into each log the event has read, so a later run only
+reads scans appended since, and only events that got a new point inside
+their window are recomputed.
+
+Usage:
+  python3 scripts/event_study.py               # designer moves + campaigns
+"""
+
+import datetime
+import hashlib
+import json
+import statistics
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+import history
+import storage
+import street_adoption
+import term_registry
+
+CACHE_FILE = Path('data/event_studies.json')
+
+BASELINE_DAYS = 30
+PRE_DAYS = 7
+POST_DAYS = 7
+
+
+def event_key(event):
+    """Changes whenever the event's definition does"""
+    spec = json.dumps([event['date'], sorted(event['terms'])])
+    return hashlib.sha1(spec.encode()).hexdigest()
+
+
+class EventStudy:
+
+    def __init__(self):
+        self.events = {}     # event id -> {'key', 'offsets', 'points', 'result'}
+        self.encodings = {}  # source -> codec its history log was in when the offsets were taken
+        self.terms = term_registry.load_terms()
+
+    def match_keys(self, event):
+        """Normalized platform terms an event listens to: a registered trend or theme brings all its aliases"""
+        keys = set()
+        for term in event['terms']:
+            keys.add(term_registry.normalize(term))
+            keys.update(term_registry.normalize(a) for a in self.terms.get(term, []))
+        return keys
+
+    def _route(self, source, offset, entry, listeners):
+        """Append a scan's matching terms to the events listening for them; returns the events touched"""
+        scorer = street_adoption.SCORERS[source]
+        when = datetime.datetime.fromisoformat(entry['ts'])
+        touched = set()
+        for term, metrics in entry['terms'].items():
+            key = term_registry.normalize(term)
+            for event_id, start, end in listeners.get(key, ()):
+                if start <= when <= end and offset > self.events[event_id]['offsets'].get(source, 0):
+                    self.events[event_id]['points'].append(
+                        [entry['ts'], source, key, round(scorer(metrics), 1)])
+                    touched.add(event_id)
+        return touched
+
+    def run(self, events):
+        """Results for every event; only new, redefined or newly-fed events are recomputed"""
+        # Offsets into a re-encoded log are meaningless: start every event over
+        for source in street_adoption.SCORERS:
+            encoding = history.encoding(source)
+            if self.encodings.setdefault(source, encoding) != encoding:
+                self.events = {}
+                self.encodings[source] = encoding
+        dirty = set()
+        listeners = {}       # normalized term -> [(event id, window start, window end)]
+        for event in events:
+            cached = self.events.get(event['id'])
+            key = event_key(event)
+            if not cached or cached['key'] != key:
+                self.events[event['id']] = {'key': key, 'offsets': {}, 'points': [], 'result': None}
+                dirty.add(event['id'])
+            date = datetime.datetime.fromisoformat(event['date'])
+            start = date - datetime.timedelta(days=BASELINE_DAYS + PRE_DAYS)
+            end = date + datetime.timedelta(days=POST_DAYS, hours=23, minutes=59)
+            for term in self.match_keys(event):
+                listeners.setdefault(term, []).append((event['id'], start, end))
+
+        for source in street_adoption.SCORERS:
+            # One read per log, from the furthest-behind event in the batch
+            start = offset = min((self.events[e['id']]['offsets'].get(source, 0) for e in events), default=0)
+            for offset, entry in history.read(source, start):
+                dirty |= self._route(source, offset, entry, listeners)
+            for event in events:
+                offsets = self.events[event['id']]['offsets']
+                offsets[source] = max(offsets.get(source, 0), offset)
+
+        results = {}
+        for event in events:
+            cached = self.events[event['id']]
+            if event['id'] in dirty or cached['result'] is None:
+                cached['result'] = self.measure(event, cached['points'])
+            results[event['id']] = cached['result']
+        return results
+
+    def measure(self, event, points):
+        """Windowed street score for one event from its routed points"""
+        series = []
+        signals = {}
+        for ts, source, term, score in sorted(points):
+            signals.setdefault(source, {})[term] = score
+            series.append((datetime.datetime.fromisoformat(ts), street_adoption.combine(signals)))
+
+        date = datetime.datetime.fromisoformat(event['date'])
+        times = [t for t, _ in series]
+
+        def window(start, end, inclusive=False):
+            lo = bisect_left(times, start)
+            hi = bisect_right(times, end) if inclusive else bisect_left(times, end)
+            return [s for _, s in series[lo:hi]]
+
+        pre_start = date - datetime.timedelta(days=PRE_DAYS)
+        baseline = window(pre_start - datetime.timedelta(days=BASELINE_DAYS), pre_start)
+        pre = window(pre_start, date)
+        post = window(date, date + datetime.timedelta(days=POST_DAYS, hours=23, minutes=59), inclusive=True)
+
+        result = {
+            'date': event['date'],
+            'points': len(series),
+            'baseline': round(statistics.mean(baseline), 1) if baseline else None,
+            'pre': round(statistics.mean(pre), 1) if pre else None,
+            'post': round(statistics.mean(post), 1) if post else None,
+        }
+        result['post_delta'] = (round(result['post'] - result['pre'], 1)
+                                if pre and post else None)
+        # Without an estimation window, the pre window stands in as the baseline
+        reference = baseline or pre
+        if reference and post:
+            spread = statistics.pstdev(reference) if len(reference) > 1 else 0
+            abnormal = statistics.mean(post) - statistics.mean(reference)
+            result['abnormal'] = round(abnormal, 1)
+            result['z'] = round(abnormal / spread, 2) if spread else None
+        else:
+            result['abnormal'] = result['z'] = None
+        return result
+
+    def save(self, path=CACHE_FILE):
+        storage.dump({'events': self.events, 'encodings': self.encodings}, path)
+
+    @classmethod
+    def load(cls, path=CACHE_FILE):
+        study = cls()
+        saved = storage.load(path)
+        if saved:
+            study.events = saved['events']
+            study.encodings = saved.get('encodings', {})
+        return study
+
+
+def study(events):
+    """Load the cache, evaluate a batch of events, persist; {event id: result}"""
+    cache = EventStudy.load()
+    results = cache.run(events)
+    cache.save()
+    return results
+
+
+def describe(result):
+    """One line for a report"""
+    if not result or result['post'] is None or result['abnormal'] is None:
+        return 'Not enough scan history around the date yet'
+    z = f", {result['z']:+.1f}σ" if result['z'] is not None else ''
+    before = result['baseline'] if result['baseline'] is not None else result['pre']
+    return f"street score {result['post']} after vs {before} before ({result['abnormal']:+.1f}{z})"
+
+
+def main():
+    import collect_runway
+    import collect_superbowl
+
+    events = collect_runway.designer_move_events() + collect_superbowl.campaign_events()
+    results = study(events)
+    print(f"📅 {len(events)} events\n")
+    for event in events:
+        print(f"  {event['label']:40} {event['date']}  {describe(results[event['id']])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,9 @@
 Generate @tasteengine posts from live data
 """
 
-import json
-import subprocess
-import datetime
+import insight_engine
+import post_pipeline
+import twitter_stream
 
 def get_live_data():
     """Get fresh Twitter data"""
@@ -24,72 +24,86 @@ def get_live_data():
     
     for category, terms in topics.items():
         for term in terms[:2]:  # Check 2 per category
-            cmd = ["bird", "search", term, "--auth-token", AUTH, "--ct0", CT0, "-n", "30", "--json"]
+            agg = twitter_stream.search_aggregate(term, AUTH, CT0, 30)
+            if agg is None:
+                continue
             
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    tweets = json.loads(result.stdout)
-                    
-                    engagement = sum(t.get('likeCount', 0) + t.get('retweetCount', 0) * 2 for t in tweets)
-                    
-                    data[term] = {
-                        'category': category,
-                        'mentions': len(tweets),
-                        'total_engagement': engagement,
-                        'avg_engagement': engagement / len(tweets) if tweets else 0
-                    }
-            except:
-                pass
+            data[term] = {
+                'category': category,
+                'mentions': agg.count,
+                'total_engagement': agg.total_engagement,
+                'avg_engagement': agg.avg_engagement,
+                'weighted_engagement': agg.weighted_engagement
+            }
     
     return data
 
-def generate_posts(data):
-    """Create posts based on trends"""
-    posts = []
-    
-    # Sort by engagement
-    trending = sorted(data.items(), key=lambda x: x[1]['avg_engagement'], reverse=True)
-    
+@insight_engine.table('live_terms', 'live')
+def live_terms(data):
+    for term, metrics in data['live'].items():
+        yield dict(metrics, term=term, term_title=term.title())
+
+@insight_engine.table('live_summary', 'live')
+def live_summary(data):
+    """One row: the leader and laggard by avg engagement"""
+    terms = list(data['live'].items())
+    if not terms:
+        return
+    top = max(terms, key=lambda x: x[1]['avg_engagement'])
+    bottom = min(reversed(terms), key=lambda x: x[1]['avg_engagement'])
+    yield {
+        'count': len(terms),
+        'top_title': top[0].title(),
+        'top_avg': top[1]['avg_engagement'],
+        'top_mentions': top[1]['mentions'],
+        'bottom_title': bottom[0].title(),
+        'ratio': top[1]['avg_engagement'] / (bottom[1]['avg_engagement'] or 1)
+    }
+
+POST_RULES = [
     # Post 1: Top trend
-    if trending[0][1]['avg_engagement'] > 20:
-        term = trending[0][0]
-        metrics = trending[0][1]
-        posts.append(
-            f'"{term.title()}" pulling {metrics["avg_engagement"]:.0f} avg engagement per mention. '
-            f'{metrics["mentions"]} posts in last hour. The culture is shifting.'
-        )
-    
+    insight_engine.TableRule(
+        'post_top_trend', 'live_summary',
+        predicate=lambda r: r['top_avg'] > 20,
+        template='"{top_title}" pulling {top_avg:.0f} avg engagement per mention. '
+                 '{top_mentions} posts in last hour. The culture is shifting.',
+        score=80
+    ),
     # Post 2: Comparison
-    if len(trending) > 1:
-        winner = trending[0][0]
-        loser = trending[-1][0]
-        ratio = trending[0][1]['avg_engagement'] / (trending[-1][1]['avg_engagement'] or 1)
-        if ratio > 5:
-            posts.append(
-                f'{winner.title()} getting {ratio:.0f}x more engagement than {loser.title()} right now. '
-                f'The algorithm has spoken.'
-            )
-    
+    insight_engine.TableRule(
+        'post_comparison', 'live_summary',
+        predicate=lambda r: r['count'] > 1 and r['ratio'] > 5,
+        template='{top_title} getting {ratio:.0f}x more engagement than {bottom_title} right now. '
+                 'The algorithm has spoken.',
+        score=70
+    ),
     # Post 3: Category insight
-    fashion_trends = [(k, v) for k, v in data.items() if v['category'] == 'fashion']
-    if fashion_trends:
-        top_fashion = sorted(fashion_trends, key=lambda x: x[1]['avg_engagement'], reverse=True)[0]
-        posts.append(
-            f'Fashion trend update: "{top_fashion[0]}" leading with {top_fashion[1]["mentions"]} mentions. '
-            f'Search this term now before it hits mainstream.'
-        )
-    
+    insight_engine.TableRule(
+        'post_top_fashion', 'live_terms',
+        predicate=lambda r: r['category'] == 'fashion',
+        order_by='avg_engagement', limit=1,
+        template='Fashion trend update: "{term}" leading with {mentions} mentions. '
+                 'Search this term now before it hits mainstream.',
+        score=60
+    ),
     # Post 4: Rising trend (low mentions but high engagement)
-    for term, metrics in data.items():
-        if metrics['mentions'] < 10 and metrics['avg_engagement'] > 30:
-            posts.append(
-                f'Early signal: "{term}" only {metrics["mentions"]} mentions but '
-                f'{metrics["avg_engagement"]:.0f} avg engagement. This is about to blow.'
-            )
-            break
-    
-    return posts
+    insight_engine.TableRule(
+        'post_early_signal', 'live_terms',
+        predicate=lambda r: r['mentions'] < 10 and r['avg_engagement'] > 30,
+        limit=1,
+        template='Early signal: "{term}" only {mentions} mentions but '
+                 '{avg_engagement:.0f} avg engagement. This is about to blow.',
+        score=75
+    ),
+]
+
+def post_candidates(data):
+    """Scored posts from live trends"""
+    return insight_engine.evaluate_all(POST_RULES, {'live': data})
+
+def generate_posts(data):
+    """Create posts based on trends"""
+    return [post['text'] for post in post_candidates(data)]
 
 def main():
     print("🤖 TASTE ENGINE POST GENERATOR\n")
@@ -99,18 +113,18 @@ def main():
     
     print(f"\nAnalyzed {len(data)} terms\n")
     
-    posts = generate_posts(data)
+    candidates = post_candidates(data)
     
     print("📝 GENERATED POSTS:\n")
-    for i, post in enumerate(posts, 1):
-        print(f"{i}. {post}\n")
+    for i, post in enumerate(candidates, 1):
+        print(f"{i}. {post['text']}\n")
     
-    # Save posts
-    with open('output/posts.txt', 'w') as f:
-        for post in posts:
-            f.write(post + "\n\n")
+    # Last generator of the run: queue everything submitted since the last build
+    post_pipeline.submit('generate_posts', candidates)
+    result = post_pipeline.build_queue()
     
-    print(f"Saved {len(posts)} posts to output/posts.txt")
+    print(f"Queued {len(result['queue'])} posts to output/posts.txt "
+          f"({result['duplicates']} near-duplicates of recent posts dropped)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - History Store
+Append-only per-source log of every scan's per-term metrics.
+
+One record per scan in data/history/<source>.jsonl, written through the
+storage layer (one compressed frame per scan under the default codec):
+  {"ts": "2026-02-10T09:00:00", "terms": {"gorpcore": {"views": ..., ...}}}
+
+Consumers keep a byte offset per source alongside their own state, so each
+cycle reads only the scans that landed since their last run. An offset only
+means something in the encoding it was taken in: consumers keep encoding()
+with it and start over when `storage.py migrate` has re-encoded the log.
+"""
+
+import datetime
+from pathlib import Path
+
+import storage
+
+HISTORY_DIR = Path('data/history')
+
+
+def source_path(source):
+    return HISTORY_DIR / f"{source}.jsonl"
+
+
+def record(source, timestamp, terms):
+    """Append one scan: terms is {term: {metric: value}}"""
+    if not terms:
+        return
+    storage.append(source_path(source), [{'ts': timestamp, 'terms': terms}])
+
+
+def encoding(source):
+    """The codec a source's log is currently stored in, or None if there is no log"""
+    physical = storage.find(source_path(source))
+    return storage.codec_of(physical).name if physical else None
+
+
+def read(source, offset=0):
+    """Yield (next_offset, entry) for scans at or after a byte offset"""
+    # A scan still being written is picked up next cycle
+    yield from storage.records(source_path(source), offset)
+
+
+def series(source, term, metric, since=None, until=None):
+    """[(datetime, value)] for one term's metric, oldest first"""
+    points = []
+    for _, entry in read(source):
+        ts = datetime.datetime.fromisoformat(entry['ts'])
+        if (since and ts < since) or (until and ts > until):
+            continue
+        value = entry['terms'].get(term, {}).get(metric)
+        if value is not None:
+            points.append((ts, value))
+    return points
+
+
+def latest(source):
+    """Most recent scan for a source, or None"""
+    last = None
+    for _, entry in read(source):
+        last = entry
+    return last
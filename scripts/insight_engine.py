@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Incremental Insight Engine
+Declarative rules over shared, indexed tables. Each table is built once and
+scanned once per run no matter how many rules read it; only rules whose
+source fingerprints changed are re-evaluated, and insights are reported as
+a diff against the last run (new / resolved / unchanged)
+"""
+
+import hashlib
+import heapq
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import storage
+
+STATE_FILE = Path('data/insight_state.json')
+
+# Fingerprints remembered per rule, so a source flipping back to an
+# earlier snapshot is still a cache hit
+MEMO_SIZE = 5
+
+
+def fingerprint(snapshot):
+    """Content hash of a source snapshot, ignoring its write timestamp"""
+    if snapshot is None:
+        return None
+    if isinstance(snapshot, dict):
+        snapshot = {k: v for k, v in snapshot.items() if k != 'timestamp'}
+    body = json.dumps(snapshot, sort_keys=True, default=str)
+    return hashlib.sha1(body.encode()).hexdigest()[:16]
+
+
+# name -> (sources, builder); builders turn raw source snapshots into row dicts
+TABLES = {}
+
+
+def table(name, *sources):
+    """Register a table builder: @table('stockx_items', 'stockx')"""
+    def register(builder):
+        TABLES[name] = (tuple(sources), builder)
+        return builder
+    return register
+
+
+class Index:
+    """Tables built on first use and shared by every rule in a run"""
+
+    def __init__(self, data):
+        self.data = data
+        self.tables = {}
+        self.locks = {name: threading.Lock() for name in TABLES}
+
+    def get(self, name):
+        with self.locks[name]:
+            if name not in self.tables:
+                self.tables[name] = list(TABLES[name][1](self.data))
+            return self.tables[name]
+
+
+class Rule:
+    """An insight rule: the sources it reads and a function producing insights"""
+
+    def __init__(self, name, sources, fn, version=1):
+        self.name = name
+        self.sources = tuple(sources)
+        self.fn = fn
+        self.version = version
+
+    def input_key(self, source_fps):
+        parts = [self.name, str(self.version)] + [str(source_fps.get(s)) for s in self.sources]
+        return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+
+    def ready(self, data):
+        return all(s in data for s in self.sources)
+
+    def evaluate(self, data):
+        return self.fn(data)
+
+
+class TableRule(Rule):
+    """
+    Declarative rule: rows of `table` matching `predicate` become insights
+    rendered from `template` (a format string over the row's fields).
+    order_by/limit keep the best `limit` matches; limit alone keeps the first.
+    """
+
+    def __init__(self, name, table, template, predicate=None, score=0, type=None,
+                 key=None, order_by=None, limit=None, version=1):
+        super().__init__(name, TABLES[table][0], None, version)
+        self.table = table
+        self.template = template
+        self.predicate = predicate
+        self.score = score
+        self.type = type or name.upper()
+        self.key = key
+        self.order_by = order_by
+        self.limit = limit
+
+    def full(self, matches):
+        """No more rows needed: first-N rules stop collecting once they have N"""
+        return self.limit is not None and self.order_by is None and len(matches) >= self.limit
+
+    def finish(self, matches):
+        if self.order_by is not None:
+            matches = heapq.nlargest(self.limit or len(matches), matches, key=lambda r: r[self.order_by])
+        return [self.render(row) for row in matches]
+
+    def render(self, row):
+        text = self.template(row) if callable(self.template) else self.template.format(**row)
+        insight = {'type': self.type, 'text': text, 'score': self.score}
+        if self.key:
+            insight['key'] = self.key.format(**row)
+        return insight
+
+    def evaluate(self, data):
+        return evaluate_many([self], data)[self.name]
+
+
+def insight_key(rule_name, insight):
+    return f"{rule_name}:{insight.get('key', insight['text'])}"
+
+
+def _scan(rows, rules):
+    """One pass over a table, offering each row to every rule that reads it"""
+    matches = {rule.name: [] for rule in rules}
+    for row in rows:
+        for rule in rules:
+            found = matches[rule.name]
+            if rule.full(found):
+                continue
+            if rule.predicate is None or rule.predicate(row):
+                found.append(row)
+    return {rule.name: rule.finish(matches[rule.name]) for rule in rules}
+
+
+def evaluate_many(rules, data, workers=4):
+    """
+    Evaluate rules with one shared scan per table. Tables (and plain function
+    rules) are independent, so they run in parallel. Returns {rule name: insights}.
+    """
+    results = {rule.name: [] for rule in rules}
+    index = Index(data)
+    groups = {}
+    singles = []
+    for rule in rules:
+        if not rule.ready(data):
+            continue
+        if isinstance(rule, TableRule):
+            groups.setdefault(rule.table, []).append(rule)
+        else:
+            singles.append(rule)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(lambda t=t, g=g: _scan(index.get(t), g)) for t, g in groups.items()]
+        futures += [pool.submit(lambda r=r: {r.name: r.evaluate(data)}) for r in singles]
+        for future in futures:
+            results.update(future.result())
+
+    return results
+
+
+def evaluate_all(rules, data):
+    """Evaluate every rule from scratch - no memo, no state"""
+    results = evaluate_many(rules, data)
+    return [insight for rule in rules for insight in results[rule.name]]
+
+
+def load_state(path=STATE_FILE):
+    return storage.load(path, {'rules': {}})
+
+
+def save_state(state, path=STATE_FILE):
+    storage.dump(state, path)
+
+
+def run(rules, data, state_path=STATE_FILE):
+    """
+    Evaluate rules incrementally against the last saved state.
+    Returns {'insights', 'new', 'resolved', 'unchanged', 'evaluated', 'cached'}.
+    """
+    state = load_state(state_path)
+    source_fps = {name: fingerprint(snapshot) for name, snapshot in data.items()}
+
+    previous = {}
+    current = {}
+    cached = []
+
+    entries = {}
+    stale = []
+    for rule in rules:
+        entry = state['rules'].get(rule.name, {})
+        for insight in entry.get('memo', {}).get(entry.get('last'), []):
+            previous[insight_key(rule.name, insight)] = insight
+        key = rule.input_key(source_fps)
+        entries[rule.name] = (key, entry.get('memo', {}))
+        if key in entries[rule.name][1]:
+            cached.append(rule.name)
+        else:
+            stale.append(rule)
+
+    # Every changed rule goes through a single shared pass
+    fresh = evaluate_many(stale, data)
+    evaluated = [rule.name for rule in stale]
+
+    for rule in rules:
+        key, memo = entries[rule.name]
+        insights = fresh[rule.name] if rule.name in fresh else memo[key]
+
+        memo = {k: v for k, v in memo.items() if k != key}
+        memo[key] = insights
+        # dicts keep insertion order - drop the oldest fingerprints
+        while len(memo) > MEMO_SIZE:
+            memo.pop(next(iter(memo)))
+        state['rules'][rule.name] = {'last': key, 'memo': memo}
+
+        for insight in insights:
+            current[insight_key(rule.name, insight)] = insight
+
+    save_state(state, state_path)
+
+    return {
+        'insights': sorted(current.values(), key=lambda x: x['score'], reverse=True),
+        'new': [v for k, v in current.items() if k not in previous],
+        'resolved': [v for k, v in previous.items() if k not in current],
+        'unchanged': [v for k, v in current.items() if k in previous],
+        'evaluated': evaluated,
+        'cached': cached
+    }
+
+
+def print_diff(result):
+    """Console summary of an incremental run"""
+    print(f"  Rules evaluated: {len(result['evaluated'])} | cached: {len(result['cached'])}")
+    print(f"  Insights: {len(result['new'])} new, {len(result['resolved'])} resolved, "
+          f"{len(result['unchanged'])} unchanged")
+    for insight in result['new']:
+        print(f"  🆕 {insight['text']}")
+    for insight in result['resolved']:
+        print(f"  ✔️  resolved: {insight['text']}")
+
+
+# Shared tables over the standard source snapshots
+
+def percent(value):
+    """'+34%' -> 34, '-18%' -> -18, anything unparseable -> 0"""
+    try:
+        return int(str(value).replace('%', '').replace('+', ''))
+    except ValueError:
+        return 0
+
+
+@table('twitter_trends', 'twitter')
+def twitter_trends(data):
+    for term, metrics in data['twitter'].get('trends', {}).items():
+        yield dict(metrics, term=term, term_title=term.title())
+
+
+@table('stockx_items', 'stockx')
+def stockx_items(data):
+    for item, metrics in data['stockx'].get('stockx_data', {}).items():
+        yield dict(metrics, item=item, signal=metrics.get('signal'),
+                   change_pct=percent(metrics.get('week_change', '')))
+
+
+@table('reddit_terms', 'reddit')
+def reddit_terms(data):
+    for term, metrics in data['reddit'].get('reddit_data', {}).items():
+        yield dict(metrics, term=term, term_title=term.title())
+
+
+@table('tiktok_hashtags', 'tiktok')
+def tiktok_hashtags(data):
+    for item in data['tiktok'].get('hashtag_data', []):
+        yield dict(item, tag=item['hashtag'].replace('#', ''),
+                   growth_pct=percent(item.get('week_over_week', '')))
+
+
+@table('tiktok_sounds', 'tiktok')
+def tiktok_sounds(data):
+    for sound in data['tiktok'].get('trending_sounds', []):
+        yield dict(sound, lift=sound.get('lift', 0))
+
+
+@table('sound_associations', 'tiktok')
+def sound_associations(data):
+    """Sound -> hashtag pairs ranked by lift (see sound_index)"""
+    return data['tiktok'].get('sound_associations', [])
+
+
+@table('twitter_x_stockx', 'twitter', 'stockx')
+def twitter_x_stockx(data):
+    """Twitter terms joined to the StockX items whose name contains them"""
+    items = [(item.lower(), item, metrics)
+             for item, metrics in data['stockx'].get('stockx_data', {}).items()]
+    for term, trend in data['twitter'].get('trends', {}).items():
+        needle = term.lower()
+        for lowered, item, metrics in items:
+            if needle in lowered:
+                yield {
+                    'term': term, 'term_title': term.title(), 'item': item,
+                    'avg_engagement': trend.get('avg_engagement', 0),
+                    'week_change': metrics.get('week_change', ''),
+                    'signal': metrics.get('signal')
+                }
+
+
+@table('twitter_x_reddit', 'twitter', 'reddit')
+def twitter_x_reddit(data):
+    reddit = data['reddit'].get('reddit_data', {})
+    for term, trend in data['twitter'].get('trends', {}).items():
+        if term in reddit:
+            yield dict(reddit[term], term=term, term_title=term.title(),
+                       avg_engagement=trend.get('avg_engagement', 0))
+
+
+@table('tiktok_x_stockx', 'tiktok', 'stockx')
+def tiktok_x_stockx(data):
+    """TikTok hashtags joined to the StockX items whose name contains them"""
+    items = [(item.lower(), item, metrics)
+             for item, metrics in data['stockx'].get('stockx_data', {}).items()]
+    tags = {item['hashtag'].replace('#', ''): item for item in data['tiktok'].get('hashtag_data', [])}
+    for tag, metrics in tags.items():
+        needle = tag.lower()
+        for lowered, item, stockx in items:
+            if needle in lowered:
+                yield {
+                    'hashtag': tag, 'item': item,
+                    'tiktok_growth': metrics['week_over_week'],
+                    'stockx_change': stockx.get('week_change', '')
+                }
@@ -5,102 +5,83 @@ Combines all data sources to generate insights
 """
 
 import json
-import subprocess
 import datetime
 from pathlib import Path
 
+import insight_engine
+import post_pipeline
+import retention
+import storage
+
 def load_latest_data():
     """Load most recent data from all sources"""
-    data_dir = Path('/home/ubuntu/taste-engine/data')
+    data_dir = Path('data')
     
     sources = {}
     
-    # Load Twitter data
-    twitter_files = sorted(data_dir.glob('scan_*.json'))
-    if twitter_files:
-        with open(twitter_files[-1]) as f:
-            sources['twitter'] = json.load(f)
+    # Load Twitter data (the newest scan, even if it's been archived)
+    twitter = retention.latest('scan', root=data_dir.parent)
+    if twitter:
+        sources['twitter'] = twitter
     
     # Load StockX data
-    if (data_dir / 'stockx_latest.json').exists():
-        with open(data_dir / 'stockx_latest.json') as f:
-            sources['stockx'] = json.load(f)
+    if storage.exists(data_dir / 'stockx_latest.json'):
+        sources['stockx'] = storage.load(data_dir / 'stockx_latest.json')
     
     # Load Reddit data  
-    if (data_dir / 'reddit_latest.json').exists():
-        with open(data_dir / 'reddit_latest.json') as f:
-            sources['reddit'] = json.load(f)
+    if storage.exists(data_dir / 'reddit_latest.json'):
+        sources['reddit'] = storage.load(data_dir / 'reddit_latest.json')
     
     return sources
 
-def generate_insights(data):
-    """Generate multi-source insights"""
-    
-    insights = []
-    
+INSIGHT_RULES = [
     # Cross-reference Twitter trends with StockX prices
-    if 'twitter' in data and 'stockx' in data:
-        twitter_trends = data['twitter'].get('trends', {})
-        stockx_prices = data['stockx'].get('stockx_data', {})
-        
-        for term in twitter_trends:
-            # Find matching StockX items
-            for item, price_data in stockx_prices.items():
-                if term.lower() in item.lower():
-                    if price_data.get('signal') == 'HOT':
-                        insights.append({
-                            'type': 'PRICE_CULTURE_MATCH',
-                            'text': f"{term.title()} mentions up on Twitter, StockX prices up {price_data['week_change']}. Culture driving commerce.",
-                            'score': 10
-                        })
-    
+    insight_engine.TableRule(
+        'price_culture_match', 'twitter_x_stockx',
+        predicate=lambda r: r['signal'] == 'HOT',
+        template="{term_title} mentions up on Twitter, StockX prices up {week_change}. Culture driving commerce.",
+        type='PRICE_CULTURE_MATCH', key='{term}|{item}', score=10
+    ),
     # Reddit sentiment vs Twitter engagement
-    if 'reddit' in data and 'twitter' in data:
-        reddit_data = data['reddit'].get('reddit_data', {})
-        twitter_trends = data['twitter'].get('trends', {})
-        
-        for term in twitter_trends:
-            if term in reddit_data:
-                if reddit_data[term]['sentiment'] == 'negative' and twitter_trends[term].get('avg_engagement', 0) > 20:
-                    insights.append({
-                        'type': 'CONTROVERSY',
-                        'text': f"{term.title()} polarizing: High Twitter engagement but negative Reddit sentiment. Drama drives numbers.",
-                        'score': 8
-                    })
-    
+    insight_engine.TableRule(
+        'controversy', 'twitter_x_reddit',
+        predicate=lambda r: r['sentiment'] == 'negative' and r['avg_engagement'] > 20,
+        template="{term_title} polarizing: High Twitter engagement but negative Reddit sentiment. Drama drives numbers.",
+        type='CONTROVERSY', key='{term}', score=8
+    ),
     # Volume shifts
-    if 'stockx' in data:
-        stockx_data = data['stockx'].get('stockx_data', {})
-        high_volume = sorted(stockx_data.items(), key=lambda x: x[1]['volume'], reverse=True)
-        
-        if high_volume:
-            top_item = high_volume[0]
-            insights.append({
-                'type': 'MARKET_SIGNAL',
-                'text': f"{top_item[0]} leading resale volume with {top_item[1]['volume']} sales this week at ${top_item[1]['avg_price']} avg.",
-                'score': 7
-            })
-    
+    insight_engine.TableRule(
+        'market_signal', 'stockx_items',
+        order_by='volume', limit=1,
+        template="{item} leading resale volume with {volume} sales this week at ${avg_price} avg.",
+        type='MARKET_SIGNAL', key='{item}', score=7
+    ),
+]
+
+def generate_insights(data):
+    """Generate multi-source insights"""
+    insights = insight_engine.evaluate_all(INSIGHT_RULES, data)
     return sorted(insights, key=lambda x: x['score'], reverse=True)
 
 def generate_smart_posts(insights, data):
-    """Create intelligent posts from insights"""
+    """Create intelligent posts from insights, scored 0-100 for the post queue"""
     
     posts = []
     
     # Post 1: Top insight
     if insights:
-        posts.append(insights[0]['text'])
+        posts.append({'text': insights[0]['text'], 'score': insights[0]['score'] * 10})
     
     # Post 2: Trend velocity
     if 'twitter' in data:
         trends = data['twitter'].get('trends', {})
         if trends:
             fastest_growing = max(trends.items(), key=lambda x: x[1].get('avg_engagement', 0))
-            posts.append(
-                f'"{fastest_growing[0].title()}" velocity: {fastest_growing[1]["count"]} mentions generating '
-                f'{fastest_growing[1]["avg_engagement"]:.0f} avg engagement. Watch this space.'
-            )
+            posts.append({
+                'text': f'"{fastest_growing[0].title()}" velocity: {fastest_growing[1]["count"]} mentions generating '
+                        f'{fastest_growing[1]["avg_engagement"]:.0f} avg engagement. Watch this space.',
+                'score': 65
+            })
     
     # Post 3: Price movement
     if 'stockx' in data:
@@ -108,10 +89,11 @@ def generate_smart_posts(insights, data):
         hot = [(k, v) for k, v in stockx.items() if '+' in v.get('week_change', '')]
         if hot:
             item, info = hot[0]
-            posts.append(
-                f'{item} resale up {info["week_change"]} to ${info["avg_price"]}. '
-                f'{info["volume"]} pairs moved this week. The market has spoken.'
-            )
+            posts.append({
+                'text': f'{item} resale up {info["week_change"]} to ${info["avg_price"]}. '
+                        f'{info["volume"]} pairs moved this week. The market has spoken.',
+                'score': 70
+            })
     
     # Post 4: Contrarian take
     if 'reddit' in data:
@@ -119,17 +101,24 @@ def generate_smart_posts(insights, data):
         low_mention = [(k, v) for k, v in reddit.items() if v['mentions'] < 5 and v['sentiment'] == 'positive']
         if low_mention:
             term = low_mention[0][0]
-            posts.append(
-                f'Sleeper alert: "{term}" has minimal mentions but positive sentiment on Reddit. '
-                f'Early adopters are moving.'
-            )
-    
-    # Post 5: Data comparison
-    posts.append(
-        'Mob wife aesthetic: 45 avg Twitter engagement. '
-        'Quiet luxury: 12 avg engagement. '
-        'The maximalist swing is real and measurable.'
-    )
+            posts.append({
+                'text': f'Sleeper alert: "{term}" has minimal mentions but positive sentiment on Reddit. '
+                        f'Early adopters are moving.',
+                'score': 60
+            })
+    
+    # Post 5: Data comparison - most vs least engaged term this scan
+    if 'twitter' in data:
+        trends = data['twitter'].get('trends', {})
+        if len(trends) > 1:
+            ranked = sorted(trends.items(), key=lambda x: x[1].get('avg_engagement', 0), reverse=True)
+            (top, top_info), (bottom, bottom_info) = ranked[0], ranked[-1]
+            posts.append({
+                'text': f'{top.title()}: {top_info["avg_engagement"]:.0f} avg Twitter engagement. '
+                        f'{bottom.title()}: {bottom_info["avg_engagement"]:.0f} avg engagement. '
+                        f'The gap is real and measurable.',
+                'score': 55
+            })
     
     return posts
 
@@ -146,7 +135,9 @@ def main():
     
     # Generate insights
     print("🧠 Generating cross-source insights...")
-    insights = generate_insights(data)
+    result = insight_engine.run(INSIGHT_RULES, data)
+    insights = result['insights']
+    insight_engine.print_diff(result)
     
     if insights:
         print("\n💡 TOP INSIGHTS:")
@@ -156,7 +147,9 @@ def main():
     
     # Generate posts
     print("\n✍️ GENERATING SMART POSTS:\n")
-    posts = generate_smart_posts(insights, data)
+    candidates = generate_smart_posts(insights, data)
+    posts = [post['text'] for post in candidates]
+    post_pipeline.submit('master_analyzer', candidates)
     
     for i, post in enumerate(posts, 1):
         print(f"{i}. {post}\n")
@@ -165,6 +158,11 @@ def main():
     output = {
         'timestamp': datetime.datetime.now().isoformat(),
         'insights': insights,
+        'insight_diff': {
+            'new': result['new'],
+            'resolved': result['resolved'],
+            'unchanged': len(result['unchanged'])
+        },
         'posts': posts,
         'data_sources': list(data.keys())
     }
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Post Pipeline
+Every generator's post candidates -> one deduplicated, ranked queue.
+
+Generators call submit() with scored candidates (0-100); they accumulate in
+data/post_candidates.jsonl until the next build. A build ranks candidates by
+score decayed by age, drops anything that says the same thing as a post
+published in the last DEDUP_DAYS (or one already queued), and fills the
+hourly slots until the next scan cycle in output/post_queue.json, plus
+output/posts.txt.
+
+The queue carries over between builds: a queued post is recorded in
+data/post_history.jsonl as published only once its slot has passed, and
+the slots still ahead keep their posts.
+
+Near-duplicates are found with MinHash over word 3-grams (numbers folded, so
+"45 avg engagement" and "47 avg engagement" match, while the post's subjects -
+hashtags, quoted terms, names - are weighted so the same template about a
+different trend is a different post) and LSH banding: each
+candidate is only compared against past posts that share a band bucket,
+never against the whole history.
+
+Usage:
+  python3 scripts/post_pipeline.py            # build the queue
+  python3 scripts/post_pipeline.py --dry-run  # show it without publishing
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+
+import storage
+
+CANDIDATES_FILE = Path('data/post_candidates.jsonl')
+HISTORY_FILE = Path('data/post_history.jsonl')
+QUEUE_FILE = Path('output/post_queue.json')
+POSTS_FILE = Path('output/posts.txt')
+
+NUM_PERM = 128
+BANDS, ROWS = 32, 4             # match probability is ~50% at Jaccard 0.4
+SIMILARITY = 0.7                # estimated Jaccard at which two posts say the same thing
+ENTITY_WEIGHT = 4               # shingles contributed by each subject
+HALF_LIFE_HOURS = 6             # a candidate's rank halves every 6 hours
+CANDIDATE_TTL_HOURS = 24
+DEDUP_DAYS = 30
+CYCLE_HOURS = 3                 # the scan workflow's cron interval
+SLOT_HOURS = 1
+QUEUE_SIZE = CYCLE_HOURS // SLOT_HOURS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text):
+    words = re.findall(r"[a-z0-9']+", re.sub(r'\d[\d,.]*', '0', text.lower()))
+    if len(words) < 3:
+        grams = {' '.join(words)}
+    else:
+        grams = {' '.join(words[i:i + 3]) for i in range(len(words) - 2)}
+    for entity in re.findall(r'#\w+|"[^"]+"|\b[A-Z][\w-]+', text):
+        grams.update(f"{entity.lower()}|{i}" for i in range(ENTITY_WEIGHT))
+    return grams
+
+
+def minhash(text):
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big')
+              for s in shingles(text)]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+class PostIndex:
+    """LSH over MinHash signatures of published posts"""
+
+    def __init__(self):
+        self.posts = []
+        self.buckets = {}       # (band, band hash) -> [post ids]
+
+    @staticmethod
+    def bands(signature):
+        for band in range(BANDS):
+            yield band, hash(tuple(signature[band * ROWS:(band + 1) * ROWS]))
+
+    def add(self, post):
+        pid = len(self.posts)
+        self.posts.append(post)
+        for bucket in self.bands(post['signature']):
+            self.buckets.setdefault(bucket, []).append(pid)
+
+    def nearest(self, signature):
+        """(similarity, post) of the closest post sharing a bucket, or (0, None)"""
+        candidates = set()
+        for bucket in self.bands(signature):
+            candidates.update(self.buckets.get(bucket, ()))
+        best = (0.0, None)
+        for pid in candidates:
+            score = similarity(signature, self.posts[pid]['signature'])
+            if score > best[0]:
+                best = (score, self.posts[pid])
+        return best
+
+    @classmethod
+    def load(cls, path=HISTORY_FILE, now=None):
+        index = cls()
+        cutoff = ((now or datetime.datetime.now()) - datetime.timedelta(days=DEDUP_DAYS)).isoformat()
+        for _, post in storage.records(path):
+            if post['published'] >= cutoff:
+                index.add(post)
+        return index
+
+
+def submit(source, posts, now=None):
+    """
+    Queue candidates from a generator. posts: [{'text', 'score'}] with score
+    on 0-100, or plain strings (scored 50).
+    """
+    ts = (now or datetime.datetime.now()).isoformat()
+    rows = []
+    for post in posts:
+        if isinstance(post, str):
+            post = {'text': post, 'score': 50}
+        if post['text']:
+            rows.append({'text': post['text'], 'score': post['score'], 'source': source, 'created': ts})
+    storage.append(CANDIDATES_FILE, rows)
+
+
+def load_candidates(now):
+    cutoff = (now - datetime.timedelta(hours=CANDIDATE_TTL_HOURS)).isoformat()
+    return [c for _, c in storage.records(CANDIDATES_FILE) if c['created'] >= cutoff]
+
+
+def rank(candidate, now):
+    age = (now - datetime.datetime.fromisoformat(candidate['created'])).total_seconds() / 3600
+    return candidate['score'] * 0.5 ** (max(age, 0) / HALF_LIFE_HOURS)
+
+
+def load_queue(path=QUEUE_FILE):
+    """Posts queued by earlier builds, in the shape build_queue() keeps them"""
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [dict(post, published=post['scheduled_for'], signature=minhash(post['text']))
+                for post in json.load(f)]
+
+
+def build_queue(now=None, publish=True):
+    """
+    Record queued posts whose slot has passed as published, then fill the
+    free slots with the best pending candidates unlike anything published
+    recently or still queued. Unique leftovers stay pending for the next build.
+    """
+    now = now or datetime.datetime.now()
+    index = PostIndex.load(now=now)
+    stamp = now.isoformat()
+    queued = load_queue()
+    published = [post for post in queued if post['published'] <= stamp]
+    queue = [post for post in queued if post['published'] > stamp]
+    for post in published + queue:
+        index.add(post)
+    candidates = sorted(load_candidates(now), key=lambda c: rank(c, now), reverse=True)
+
+    slot = max([datetime.datetime.fromisoformat(post['published']) for post in queue], default=None)
+    leftovers, duplicates = [], 0
+    for candidate in candidates:
+        signature = minhash(candidate['text'])
+        score, _ = index.nearest(signature)
+        if score >= SIMILARITY:
+            duplicates += 1
+            continue
+        if len(queue) >= QUEUE_SIZE:
+            leftovers.append(candidate)
+            continue
+        slot = slot + datetime.timedelta(hours=SLOT_HOURS) if slot else now
+        post = dict(candidate, rank=round(rank(candidate, now), 1), signature=signature,
+                    published=slot.isoformat())
+        index.add(post)     # later candidates can't repeat it either
+        queue.append(post)
+
+    if publish:
+        storage.append(HISTORY_FILE, published)
+        with storage.writer(CANDIDATES_FILE) as out:
+            for candidate in leftovers:
+                out.write(candidate)
+        write_queue(queue)
+
+    return {'queue': queue, 'published': len(published), 'pending': len(leftovers), 'duplicates': duplicates}
+
+
+def write_queue(queue):
+    QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(QUEUE_FILE, 'w') as f:
+        json.dump([{
+            'scheduled_for': post['published'],
+            'text': post['text'],
+            'source': post['source'],
+            'score': post['score'],
+            'rank': post['rank'],
+            'created': post.get('created')
+        } for post in queue], f, indent=2)
+    with open(POSTS_FILE, 'w') as f:
+        for post in queue:
+            f.write(post['text'] + "\n\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the post queue')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    result = build_queue(publish=not args.dry_run)
+    print(f"📬 POST QUEUE ({result['published']} published since the last build, "
+          f"{result['duplicates']} near-duplicates dropped, {result['pending']} held for later):\n")
+    for post in result['queue']:
+        print(f"  [{post['published'][11:16]}] ({post['source']}, rank {post['rank']}) {post['text']}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Query API
+Read-only local HTTP access to what the collectors and analyzers already
+computed. Nothing is recomputed per request.
+
+  GET /scores                   latest trend scores, highest first (?model=street for street adoption)
+  GET /correlations             cross-platform insights (ultimate_dashboard)
+  GET /insights                 cross-source insights (master_analyzer)
+  GET /gaps                     latest runway-to-street gap per trend
+  GET /queue                    scheduled posts
+  GET /terms/{term}/history     street score over time for a term and its aliases
+
+List responses are paginated with ?offset=&limit= (and ?since=<iso ts> on
+term history) and come back as {'total', 'offset', 'limit', 'next', 'items'}.
+
+Every response is encoded once and cached under the versions (mtime / size)
+of the files it was built from; files are stat'ed at most once per
+CHECK_SECONDS however many requests arrive. Responses carry an ETag, so a
+polling dashboard that sends If-None-Match gets a bodiless 304 until the
+underlying scan actually changes. Term history is served from an in-memory
+index over data/history that only reads the bytes appended since the last
+request.
+
+The lock around the response cache is only held to look a response up or
+store it: responses are built outside it, so a cache miss (a history sync,
+a pass over the score store) doesn't queue requests that would hit.
+
+Usage:
+  python3 scripts/query_api.py                 # http://127.0.0.1:8767
+  curl -s localhost:8767/terms/mob%20wife/history?limit=10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import history
+import score_store
+import storage
+import street_adoption
+import term_registry
+
+# Precomputed documents each route reads
+DOCUMENTS = {
+    'ultimate': Path('output/ultimate_analysis.json'),
+    'master': Path('output/master_analysis.json'),
+    'gaps': street_adoption.STATE_FILE,
+    'queue': Path('output/post_queue.json'),
+}
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+CHECK_SECONDS = 1.0
+CACHE_SIZE = 512
+
+
+def stamp(path):
+    """Changes whenever the file (in whichever codec it's stored) does"""
+    physical = storage.find(path)
+    if physical is None:
+        return None
+    st = os.stat(physical)
+    return (str(physical), st.st_mtime_ns, st.st_size)
+
+
+def read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def page(items, query):
+    """Slice a list by ?offset=&limit= into the standard envelope"""
+    try:
+        offset = max(int(query.get('offset', 0)), 0)
+        limit = min(max(int(query.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        raise ValueError('offset and limit must be integers')
+    end = offset + limit
+    return {
+        'total': len(items),
+        'offset': offset,
+        'limit': limit,
+        'next': end if end < len(items) else None,
+        'items': items[offset:end]
+    }
+
+
+class QueryAPI:
+
+    def __init__(self):
+        self.lock = threading.Lock()           # the file versions and the response cache
+        self.history_lock = threading.Lock()   # the term index
+        self.checked = 0
+        self.versions = {}       # path -> stamp, refreshed at most every CHECK_SECONDS
+        self.documents = {}      # name -> (stamp, parsed json)
+        self.offsets = {}        # history source -> byte offset read so far
+        self.encodings = {}      # history source -> codec of the log the offsets point into
+        self.points = {}         # normalized platform term -> [[ts, source, score]]
+        self.terms = term_registry.load_terms()
+        self.canonical = {term_registry.normalize(name): name for name in self.terms}
+        self.responses = OrderedDict()   # request -> (version, etag, body), LRU
+
+    def check(self):
+        """Re-stat the backing files, unless that was done a moment ago"""
+        now = time.monotonic()
+        if now - self.checked < CHECK_SECONDS:
+            return
+        self.checked = now
+        logs = [history.source_path(s) for s in street_adoption.SCORERS]
+        for path in list(DOCUMENTS.values()) + logs + [score_store.SCORES_FILE]:
+            self.versions[str(path)] = stamp(path)
+
+    def version(self, *paths):
+        return tuple(self.versions.get(str(p)) for p in paths)
+
+    def document(self, name):
+        path = DOCUMENTS[name]
+        current = self.versions.get(str(path))
+        cached = self.documents.get(name)
+        if not cached or cached[0] != current:
+            try:
+                parsed = storage.load(path)
+            except (OSError, ValueError):
+                parsed = None   # caught mid-write; the next check picks it up
+            cached = self.documents[name] = (current, parsed)
+        return cached[1]
+
+    def sync_history(self):
+        """Fold scans appended since the last read into the term index"""
+        with self.history_lock:
+            encodings = {source: history.encoding(source) for source in street_adoption.SCORERS}
+            if any(self.encodings.get(s, e) != e for s, e in encodings.items()):
+                # A log was re-encoded under us: rebuild the index from the start
+                self.offsets, self.points = {}, {}
+            self.encodings = encodings
+            for source, scorer in street_adoption.SCORERS.items():
+                offset = self.offsets.get(source, 0)
+                for offset, entry in history.read(source, offset):
+                    for term, metrics in entry['terms'].items():
+                        self.points.setdefault(term_registry.normalize(term), []).append(
+                            [entry['ts'], source, round(scorer(metrics), 1)])
+                self.offsets[source] = offset
+
+    # --- routes: parsed query -> response payload ---
+
+    def scores(self, query):
+        """The newest materialized scores of a model, from the score store"""
+        latest = score_store.latest(query.get('model', 'trend')) or {}
+        items = [{'term': term, 'score': score}
+                 for term, score in sorted(latest.get('scores', {}).items(), key=lambda x: -(x[1] or 0))]
+        return dict(page(items, query), updated=latest.get('ts'), version=latest.get('version'))
+
+    def correlations(self, query):
+        ultimate = self.document('ultimate') or {}
+        return dict(page(ultimate.get('correlations', []), query), updated=ultimate.get('timestamp'))
+
+    def insights(self, query):
+        master = self.document('master') or {}
+        return dict(page(master.get('insights', []), query), updated=master.get('timestamp'))
+
+    def gaps(self, query):
+        saved = self.document('gaps') or {}
+        items = [{'trend': trend, 'ts': p[-1][0], 'runway_score': p[-1][1], 'street_score': p[-1][2],
+                  'gap': p[-1][3], 'status': street_adoption.gap_status(p[-1][3])}
+                 for trend, p in sorted(saved.get('history', {}).items()) if p]
+        return page(items, query)
+
+    def queue(self, query):
+        return page(self.document('queue') or [], query)
+
+    def term_history(self, term, query):
+        """
+        Street score after every scan that mentioned the term: a registered
+        trend or theme brings all its aliases, scored like street_adoption
+        """
+        self.sync_history()
+        keys = {term_registry.normalize(term)}
+        canonical = self.canonical.get(term_registry.normalize(term))
+        if canonical:
+            keys.update(term_registry.normalize(a) for a in self.terms[canonical])
+
+        since = query.get('since', '')
+        items, signals = [], {}
+        for ts, source, key, score in sorted([ts, source, k, score] for k in keys
+                                             for ts, source, score in self.points.get(k, [])):
+            signals.setdefault(source, {})[key] = score
+            if ts >= since:
+                items.append({'ts': ts, 'source': source, 'term': key, 'score': score,
+                              'street_score': street_adoption.combine(signals)})
+        return dict(page(items, query), term=canonical or term, aliases=sorted(keys))
+
+    def route(self, path):
+        """(handler, dependencies) for a request path, or None"""
+        parts = [unquote(p) for p in path.strip('/').split('/') if p]
+        logs = [history.source_path(s) for s in street_adoption.SCORERS]
+        if len(parts) == 3 and parts[0] == 'terms' and parts[2] == 'history':
+            return (lambda query: self.term_history(parts[1], query)), logs
+        routes = {
+            'scores': (self.scores, [score_store.SCORES_FILE]),
+            'correlations': (self.correlations, [DOCUMENTS['ultimate']]),
+            'insights': (self.insights, [DOCUMENTS['master']]),
+            'gaps': (self.gaps, [DOCUMENTS['gaps']]),
+            'queue': (self.queue, [DOCUMENTS['queue']]),
+        }
+        return routes.get(parts[0]) if len(parts) == 1 else None
+
+    def get(self, target):
+        """(status, etag, body) for a request target such as '/scores?limit=5'"""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        request = (url.path.rstrip('/'), tuple(sorted(query.items())))
+
+        route = self.route(url.path)
+        if route is None:
+            return 404, None, b'{"error": "not found"}'
+        build, dependencies = route
+        with self.lock:
+            self.check()
+            version = self.version(*dependencies)
+            cached = self.responses.get(request)
+            if cached and cached[0] == version:
+                self.responses.move_to_end(request)
+                return 200, cached[1], cached[2]
+
+        # Built unlocked, so a slow miss doesn't hold up cached responses
+        try:
+            body = json.dumps(build(query)).encode()
+        except ValueError as e:
+            return 400, None, json.dumps({'error': str(e)}).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        with self.lock:
+            self.responses[request] = (version, etag, body)
+            if len(self.responses) > CACHE_SIZE:
+                self.responses.popitem(last=False)
+        return 200, etag, body
+
+
+def make_handler(api, extra=None):
+    """
+    Request handler serving the API; extra maps a path to a callable
+    returning pre-encoded JSON for endpoints owned by the host process
+    """
+    extra = extra or {}
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            path = urlsplit(self.path).path.rstrip('/') or '/'
+            if path in extra:
+                body = extra[path]()
+                status, etag = 200, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            else:
+                status, etag, body = api.get(self.path)
+
+            if etag and etag in self.headers.get('If-None-Match', ''):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self):
+            # Unix sockets have no client address
+            return self.client_address[0] if self.client_address else 'unix'
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve precomputed trend scores and insights')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8767)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(QueryAPI()))
+    print(f"🔎 Taste Engine query API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Reddit Comment Streams
+Sentiment from the discussion under a term's top posts, not just titles.
+
+For each term the COMMENT_POSTS most-commented posts found by the search are
+fetched on a small thread pool (WORKERS at a time). Reddit answers with the
+whole listing in one JSON document, so a worker holds one parsed thread of
+up to COMMENT_LIMIT comments, and the run at most WORKERS of them. The tree
+is then walked depth-first by a generator that scores comments one by one
+and keeps nothing but its stack; a walk stops after MAX_COMMENTS.
+
+Comments already scored in an earlier run are skipped through a persistent
+Bloom filter (data/reddit_seen.json). It has two generations, and when
+the current one reaches capacity the oldest is dropped. Comments on posts
+that left the search window age out that way, and the file stays a fixed
+size.
+
+Usage:
+  python3 scripts/reddit_comments.py <post id> [<post id> ...]
+"""
+
+import argparse
+import base64
+import hashlib
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+import replay
+import storage
+
+SEEN_FILE = Path('data/reddit_seen.json')
+
+COMMENT_POSTS = 5       # most-commented posts read per term
+WORKERS = 4             # comment threads in flight at once
+COMMENT_LIMIT = 500     # comments requested per thread
+MAX_COMMENTS = 1000     # comments walked per thread, 'more' stubs included
+SEEN_CAPACITY = 50000   # comment ids per filter generation
+SEEN_ERROR_RATE = 0.01
+
+
+class BloomFilter:
+
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self.positions(item))
+
+    def add(self, item):
+        for p in self.positions(item):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class SeenComments:
+    """Two-generation Bloom filter of comment ids; thread-safe"""
+
+    def __init__(self, capacity=SEEN_CAPACITY, error_rate=SEEN_ERROR_RATE):
+        self.capacity, self.error_rate = capacity, error_rate
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous = BloomFilter(capacity, error_rate)
+        self.lock = threading.Lock()
+
+    def first_sighting(self, comment_id):
+        """True the first time an id is offered (up to the filter's error rate)"""
+        with self.lock:
+            if comment_id in self.current or comment_id in self.previous:
+                return False
+            if self.current.count >= self.capacity:
+                self.previous = self.current
+                self.current = BloomFilter(self.capacity, self.error_rate)
+            self.current.add(comment_id)
+            return True
+
+    def save(self, path=SEEN_FILE):
+        storage.dump({'capacity': self.capacity, 'error_rate': self.error_rate,
+                      'counts': [self.current.count, self.previous.count],
+                      'bits': [base64.b64encode(self.current.bits).decode(),
+                               base64.b64encode(self.previous.bits).decode()]}, path)
+
+    @classmethod
+    def load(cls, path=SEEN_FILE):
+        saved = storage.load(path)
+        if not saved:
+            return cls()
+        seen = cls(saved['capacity'], saved['error_rate'])
+        seen.current, seen.previous = (
+            BloomFilter(seen.capacity, seen.error_rate, bytearray(base64.b64decode(bits)), count)
+            for bits, count in zip(saved['bits'], saved['counts']))
+        return seen
+
+
+def walk(listing, limit=MAX_COMMENTS):
+    """Depth-first over a comment listing: yields (depth, comment data), replies before siblings"""
+    stack = [(0, child) for child in reversed(listing.get('data', {}).get('children', []))]
+    visited = 0
+    while stack and visited < limit:
+        depth, node = stack.pop()
+        visited += 1
+        if node.get('kind') != 't1':
+            continue    # 'more' stubs would each cost another request
+        data = node['data']
+        replies = data.get('replies')
+        if replies:
+            stack.extend((depth + 1, child) for child in reversed(replies['data']['children']))
+        yield depth, data
+
+
+def fetch_thread(post_id):
+    """The comment listing under one post, or None"""
+    url = f"https://www.reddit.com/comments/{post_id}.json"
+    params = {'limit': COMMENT_LIMIT, 'sort': 'top'}
+    try:
+        response = replay.get(url, params=params, headers={'User-Agent': 'TasteEngine/1.0'}, timeout=10)
+    except (requests.RequestException, replay.ReplayMiss):
+        return None
+    if not response.ok:
+        return None
+    try:
+        return response.json()[1]
+    except (ValueError, KeyError, IndexError):
+        return None
+
+
+def read_thread(post_id, seen, sentiment):
+    """New comments and their summed sentiment for one post"""
+    listing = fetch_thread(post_id)
+    if listing is None:
+        return {'comments': 0, 'sentiment_score': 0, 'karma': 0}
+    comments = score = karma = 0
+    for _, comment in walk(listing):
+        if not seen.first_sighting(comment['id']):
+            continue
+        comments += 1
+        score += sentiment(comment.get('body', ''))
+        karma += comment.get('score', 0)
+    return {'comments': comments, 'sentiment_score': score, 'karma': karma}
+
+
+def ingest(posts_by_term, sentiment, seen=None):
+    """
+    {term: [post ids]} -> {term: {'comments', 'sentiment_score', 'karma'}}
+    over comments not seen before; sentiment scores one text. Each post is
+    fetched once, and its comments count for every term that listed it.
+    """
+    seen = seen or SeenComments.load()
+    # A post several terms found is read once and credited to each of them
+    terms_of = {}
+    for term, ids in posts_by_term.items():
+        for post_id in ids[:COMMENT_POSTS]:
+            terms_of.setdefault(post_id, []).append(term)
+    totals = {term: {'comments': 0, 'sentiment_score': 0, 'karma': 0} for term in posts_by_term}
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        for post_id, result in zip(terms_of, pool.map(lambda post_id: read_thread(post_id, seen, sentiment), terms_of)):
+            for term in terms_of[post_id]:
+                for key, value in result.items():
+                    totals[term][key] += value
+    seen.save()
+    return totals
+
+
+def main():
+    import collect_reddit
+
+    parser = argparse.ArgumentParser(description='Score new comments under Reddit posts')
+    parser.add_argument('posts', nargs='+')
+    args = parser.parse_args()
+
+    totals = ingest({'posts': args.posts}, collect_reddit.text_sentiment)['posts']
+    print(f"💬 {totals['comments']} new comments, sentiment {totals['sentiment_score']:+d}, "
+          f"{totals['karma']} karma")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Record/Replay Layer
+Capture every bird call and HTTP response to a cassette, serve them back offline
+
+Modes (TASTE_REPLAY env var):
+  unset   - live: talk to bird / Reddit / Google directly
+  record  - live, and append every response to the cassette
+  replay  - never touch the network; answer from the cassette
+
+Usage:
+  TASTE_REPLAY=record python3 scripts/collect_reddit.py
+  TASTE_REPLAY=replay python3 scripts/collect_reddit.py
+  python3 scripts/replay.py serve --latency 0.05 --error-rate 0.1
+  python3 scripts/replay.py install-bird bin/ && PATH=bin:$PATH bird search ...
+  python3 scripts/replay.py bench scripts/collect_reddit.py -n 10
+"""
+
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+DEFAULT_CASSETTE = 'data/cassette.jsonl.gz'
+
+# bird flags whose values are credentials - never written to a cassette
+SECRET_FLAGS = {'--auth-token', '--ct0'}
+
+
+def mode():
+    return os.environ.get('TASTE_REPLAY', 'live').lower()
+
+
+def cassette_path():
+    return Path(os.environ.get('TASTE_CASSETTE', DEFAULT_CASSETTE))
+
+
+def command_key(cmd):
+    """Cassette key for a subprocess call, with credentials redacted"""
+    redacted = []
+    skip = False
+    for arg in cmd:
+        if skip:
+            redacted.append('***')
+            skip = False
+            continue
+        redacted.append(os.path.basename(arg) if not redacted else arg)
+        skip = arg in SECRET_FLAGS
+    return json.dumps(redacted)
+
+
+def http_key(url, params=None):
+    """Cassette key for a GET: host + path + sorted query, scheme ignored"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items()]
+    key = f"{parts.netloc}{parts.path}"
+    if query:
+        key += '?' + urlencode(sorted(query))
+    return key
+
+
+class Cassette:
+    """Gzipped JSON lines of recorded responses, grouped by key"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.cursors = {}
+        self.lock = threading.Lock()
+
+        if self.path.exists():
+            with gzip.open(self.path, 'rt') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.entries.setdefault(entry['key'], []).append(entry['response'])
+
+    def record(self, kind, key, response):
+        """Append one response; gzip members concatenate, so appends are safe"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            with gzip.open(self.path, 'at') as f:
+                f.write(json.dumps({'kind': kind, 'key': key, 'response': response}) + '\n')
+            self.entries.setdefault(key, []).append(response)
+
+    def lookup(self, key):
+        """Next recorded response for key, cycling when a run asks more often than recorded"""
+        with self.lock:
+            responses = self.entries.get(key)
+            if not responses:
+                return None
+            i = self.cursors.get(key, 0)
+            self.cursors[key] = i + 1
+            return responses[i % len(responses)]
+
+
+class Chaos:
+    """Deterministic latency and error injection for replayed responses"""
+
+    def __init__(self, latency=None, error_rate=None, seed=None):
+        env = os.environ
+        self.latency = float(latency if latency is not None else env.get('TASTE_REPLAY_LATENCY', 0))
+        self.error_rate = float(error_rate if error_rate is not None else env.get('TASTE_REPLAY_ERROR_RATE', 0))
+        self.rng = random.Random(int(seed if seed is not None else env.get('TASTE_REPLAY_SEED', 0)))
+        self.lock = threading.Lock()
+
+    def delay(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def should_fail(self):
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+
+class CannedResponse:
+    """Just enough of requests.Response for the collectors"""
+
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when the cassette has no recording for a request"""
+
+
+_cassette = None
+_chaos = None
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_cassette():
+    global _cassette
+    if _cassette is None or _cassette.path != cassette_path():
+        _cassette = Cassette(cassette_path())
+    return _cassette
+
+
+def get_chaos():
+    global _chaos
+    if _chaos is None:
+        _chaos = Chaos()
+    return _chaos
+
+
+def shared_session():
+    """One pooled requests.Session per process, so long-lived callers keep connections warm"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            _session = requests.Session()
+        return _session
+
+
+def run(cmd, timeout=None):
+    """Drop-in for subprocess.run(cmd, capture_output=True, text=True, timeout=...)"""
+    # Only the bird collectors shell out; everyone else skips the import
+    import subprocess
+
+    current = mode()
+    key = command_key(cmd)
+
+    if current == 'replay':
+        chaos = get_chaos()
+        chaos.delay()
+        if chaos.should_fail():
+            return subprocess.CompletedProcess(cmd, 1, '', 'replay: injected failure\n')
+        recorded = get_cassette().lookup(key)
+        if recorded is None:
+            return subprocess.CompletedProcess(cmd, 1, '', 'replay: no recording\n')
+        return subprocess.CompletedProcess(cmd, recorded['returncode'], recorded['stdout'], recorded['stderr'])
+
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if current == 'record':
+        get_cassette().record('cmd', key, {
+            'returncode': result.returncode,
+            'stdout': result.stdout,
+            'stderr': result.stderr
+        })
+    return result
+
+
+def stream(cmd, timeout=None, chunk_size=65536):
+    """Like run(), but yield stdout in chunks as the process writes it
+
+    Raises subprocess.CalledProcessError once stdout is exhausted if the
+    command failed, and subprocess.TimeoutExpired if it was killed.
+    """
+    import subprocess
+    import tempfile
+
+    current = mode()
+    key = command_key(cmd)
+
+    if current == 'replay':
+        chaos = get_chaos()
+        chaos.delay()
+        if chaos.should_fail():
+            raise subprocess.CalledProcessError(1, cmd, stderr='replay: injected failure\n')
+        recorded = get_cassette().lookup(key)
+        if recorded is None:
+            raise subprocess.CalledProcessError(1, cmd, stderr='replay: no recording\n')
+        stdout = recorded['stdout']
+        for i in range(0, len(stdout), chunk_size):
+            yield stdout[i:i + chunk_size]
+        if recorded['returncode'] != 0:
+            raise subprocess.CalledProcessError(recorded['returncode'], cmd, stderr=recorded['stderr'])
+        return
+
+    # stderr goes to a temp file so a chatty process can't block on a full pipe
+    errfile = tempfile.TemporaryFile(mode='w+')
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errfile, text=True)
+    killed = threading.Event()
+
+    def kill():
+        killed.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+
+    # Recording has to keep the full output for the cassette; live mode keeps nothing
+    captured = [] if current == 'record' else None
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_size)
+            if not chunk:
+                break
+            if captured is not None:
+                captured.append(chunk)
+            yield chunk
+        returncode = proc.wait()
+        errfile.seek(0)
+        stderr = errfile.read()
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        errfile.close()
+
+    if killed.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    if captured is not None:
+        get_cassette().record('cmd', key, {
+            'returncode': returncode,
+            'stdout': ''.join(captured),
+            'stderr': stderr
+        })
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+
+
+def get(url, params=None, headers=None, timeout=None, session=None):
+    """Drop-in for requests.get (or session.get) that records or replays the response"""
+    current = mode()
+    key = http_key(url, params)
+
+    if current == 'replay':
+        server = os.environ.get('TASTE_REPLAY_SERVER')
+        if server:
+            return _get_via_server(server, key, timeout)
+
+        chaos = get_chaos()
+        chaos.delay()
+        if chaos.should_fail():
+            return CannedResponse(503, '{"error": "injected failure"}')
+        recorded = get_cassette().lookup(key)
+        if recorded is None:
+            raise ReplayMiss(key)
+        return CannedResponse(recorded['status'], recorded['text'], recorded.get('headers'))
+
+    if session is None:
+        session = shared_session()
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if current == 'record':
+        get_cassette().record('http', key, {
+            'status': response.status_code,
+            'text': response.text,
+            'headers': {name: response.headers[name] for name in ('Content-Type', 'Retry-After')
+                        if name in response.headers}
+        })
+    return response
+
+
+def _get_via_server(server, key, timeout):
+    """Fetch a recorded response from a running `replay.py serve` stub"""
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
+    try:
+        with urlopen(f"{server.rstrip('/')}/{key}", timeout=timeout) as resp:
+            return CannedResponse(resp.status, resp.read().decode(), dict(resp.headers))
+    except HTTPError as e:
+        return CannedResponse(e.code, e.read().decode())
+
+
+def serve(cassette, host='127.0.0.1', port=8765, chaos=None):
+    """Local HTTP stand-in for Reddit and Google suggest"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    chaos = chaos or Chaos()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            chaos.delay()
+            if chaos.should_fail():
+                return self._send(503, '{"error": "injected failure"}')
+
+            path, _, query = self.path.lstrip('/').partition('?')
+            key = http_key('//' + path + ('?' + query if query else ''))
+            recorded = cassette.lookup(key)
+            if recorded is None:
+                return self._send(404, '{"error": "no recording"}')
+            self._send(recorded['status'], recorded['text'],
+                       recorded.get('headers', {}).get('Content-Type'))
+
+        def _send(self, status, text, content_type=None):
+            body = text.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type or 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🎞️  Replaying {len(cassette.entries)} recordings on http://{host}:{port}")
+    print(f"   latency={chaos.latency}s error_rate={chaos.error_rate}")
+    print(f"   export TASTE_REPLAY=replay TASTE_REPLAY_SERVER=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+def fake_bird(args):
+    """Act as the bird CLI, answering from the cassette"""
+    chaos = get_chaos()
+    chaos.delay()
+    if chaos.should_fail():
+        sys.stderr.write('replay: injected failure\n')
+        return 1
+
+    recorded = get_cassette().lookup(command_key(['bird'] + args))
+    if recorded is None:
+        sys.stderr.write('replay: no recording\n')
+        return 1
+    sys.stdout.write(recorded['stdout'])
+    sys.stderr.write(recorded['stderr'])
+    return recorded['returncode']
+
+
+def install_bird(directory):
+    """Write a `bird` shim into directory that calls the fake bird"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    shim = directory / 'bird'
+    shim.write_text(
+        '#!/bin/sh\n'
+        f'exec "{sys.executable}" "{Path(__file__).resolve()}" bird "$@"\n'
+    )
+    shim.chmod(0o755)
+    return shim
+
+
+def bench(scripts, runs):
+    """Run scripts end to end in replay mode and report wall time"""
+    import subprocess
+
+    env = dict(os.environ, TASTE_REPLAY='replay')
+    timings = []
+    for i in range(runs):
+        start = time.perf_counter()
+        for script in scripts:
+            subprocess.run([sys.executable, script], env=env, stdout=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(f"⏱️  {len(scripts)} scripts × {runs} runs")
+    print(f"  min {timings[0]:.3f}s | median {timings[len(timings) // 2]:.3f}s | max {timings[-1]:.3f}s")
+    print(f"  throughput: {runs * len(scripts) / sum(timings):.1f} scripts/sec")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Taste Engine record/replay tools')
+    parser.add_argument('--cassette', default=None, help=f'cassette path (default {DEFAULT_CASSETTE})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('serve', help='serve recorded HTTP responses locally')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--latency', type=float, default=None, help='seconds added to every response')
+    p.add_argument('--error-rate', type=float, default=None, help='fraction of requests answered with 503')
+    p.add_argument('--seed', type=int, default=None)
+
+    p = sub.add_parser('bird', help='act as the bird CLI')
+    p.add_argument('args', nargs=argparse.REMAINDER)
+
+    p = sub.add_parser('install-bird', help='write a fake bird executable')
+    p.add_argument('directory')
+
+    p = sub.add_parser('bench', help='time scripts in replay mode')
+    p.add_argument('scripts', nargs='+')
+    p.add_argument('-n', '--runs', type=int, default=5)
+
+    sub.add_parser('stats', help='summarize cassette contents')
+
+    args = parser.parse_args()
+    if args.cassette:
+        os.environ['TASTE_CASSETTE'] = args.cassette
+
+    if args.command == 'serve':
+        serve(get_cassette(), args.host, args.port, Chaos(args.latency, args.error_rate, args.seed))
+    elif args.command == 'bird':
+        sys.exit(fake_bird(args.args))
+    elif args.command == 'install-bird':
+        print(f"✅ Fake bird installed at {install_bird(args.directory)}")
+    elif args.command == 'bench':
+        bench(args.scripts, args.runs)
+    elif args.command == 'stats':
+        cassette = get_cassette()
+        total = sum(len(v) for v in cassette.entries.values())
+        print(f"🎞️  {cassette.path}: {len(cassette.entries)} keys, {total} responses")
+        for key, responses in sorted(cassette.entries.items()):
+            print(f"  {len(responses):3} × {key[:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Retention
+Keeps the committed scan artifacts from piling up forever.
+
+Every family of timestamped snapshots (data/scan_*.json, data/google_*.json,
+output/dashboard_*.json, in whatever codec storage wrote them) keeps its
+KEEP_RAW most recent files as-is. Older
+ones are rolled into one gzipped JSONL archive per day under
+data/archive/<family>/, and daily archives older than DAILY_DAYS are merged
+into one per ISO week. Archives are written with a fixed gzip mtime and
+sorted entries, so re-compacting the same snapshots produces identical
+bytes and no git diff.
+
+Each archived day is also summarized into data/rollups/<family>.json: per
+term, the mean of every numeric metric over that day's snapshots.
+
+The distinct-count sketch logs (data/sketches/<source>.jsonl) are only read
+over recent windows, so scans older than SKETCH_DAYS are dropped from them.
+
+Analyzers read through snapshots() / latest(), which serve the archives and
+the recent raw files as one timeline.
+
+Usage:
+  python3 scripts/retention.py               # compact
+  python3 scripts/retention.py --dry-run     # show what would move
+"""
+
+import argparse
+import datetime
+import gzip
+import json
+import os
+from pathlib import Path
+
+import cardinality
+import storage
+
+# family -> (directory, filename prefix)
+FAMILIES = {
+    'scan': ('data', 'scan_'),
+    'google': ('data', 'google_'),
+    'dashboard': ('output', 'dashboard_'),
+}
+
+ARCHIVE_DIR = Path('data/archive')
+ROLLUP_DIR = Path('data/rollups')
+
+KEEP_RAW = 8            # a day of 3-hourly scans
+DAILY_DAYS = 14         # daily archives older than this are merged by week
+SKETCH_DAYS = 30        # sketch log entries kept; distinct counts look back a week
+STAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def snapshot_time(path, prefix):
+    try:
+        return datetime.datetime.strptime(Path(path).stem[len(prefix):], STAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def raw_files(family, root='.'):
+    """[(datetime, logical path)] of a family's unarchived snapshots, oldest first"""
+    directory, prefix = FAMILIES[family]
+    found = set()
+    for physical in Path(root, directory).glob(f"{prefix}*.json*"):
+        path = storage.logical(physical)
+        ts = snapshot_time(path, prefix)
+        if ts and path.suffix == '.json':
+            found.add((ts, path))
+    return sorted(found)
+
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def read_archive(path):
+    with gzip.open(path, 'rt') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_archive(path, entries):
+    """Sorted, fixed-mtime gzip so identical content gives identical bytes"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            for entry in sorted(entries, key=lambda e: (e['ts'], e['name'])):
+                f.write((json.dumps(entry, sort_keys=True) + '\n').encode())
+    os.replace(tmp, path)
+
+
+def archives(family, root='.'):
+    """[(first day covered, path)] of a family's archives, oldest first"""
+    found = []
+    for path in Path(root, ARCHIVE_DIR, family).glob('*.jsonl.gz'):
+        name = path.name[:-len('.jsonl.gz')]
+        if '-W' in name:
+            first = datetime.datetime.strptime(name + '-1', '%G-W%V-%u').date()
+        else:
+            first = datetime.date.fromisoformat(name)
+        found.append((first, path))
+    return sorted(found)
+
+
+def term_metrics(family, snapshot):
+    """{term: {metric: number}} from one snapshot of a family"""
+    if family == 'scan':
+        rows = snapshot.get('trends', {})
+    elif family == 'google':
+        rows = snapshot.get('google_trends', {})
+    else:
+        rows = {item['term']: item for item in snapshot.get('data', [])}
+    return {term: {k: v for k, v in row.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+            for term, row in rows.items()}
+
+
+def summarize(family, entries):
+    """One day's rollup: snapshot count and per-term metric means"""
+    sums = {}
+    for entry in entries:
+        for term, metrics in term_metrics(family, entry['data']).items():
+            for metric, value in metrics.items():
+                bucket = sums.setdefault(term, {}).setdefault(metric, [0, 0])
+                bucket[0] += value
+                bucket[1] += 1
+    return {
+        'snapshots': len(entries),
+        'terms': {term: {metric: round(total / n, 2) for metric, (total, n) in metrics.items()}
+                  for term, metrics in sorted(sums.items())}
+    }
+
+
+def compact(family, root='.', keep=KEEP_RAW, now=None, dry_run=False):
+    """Archive all but the newest `keep` raw snapshots; returns counts of what moved"""
+    now = now or datetime.datetime.now()
+    raw = raw_files(family, root)
+    old = raw[:-keep] if keep else raw
+    by_day = {}
+    for ts, path in old:
+        by_day.setdefault(ts.date(), []).append((ts, path))
+
+    rollup_path = Path(root, ROLLUP_DIR, f"{family}.json")
+    rollups = {}
+    if rollup_path.exists():
+        with open(rollup_path) as f:
+            rollups = json.load(f)
+
+    archive_dir = Path(root, ARCHIVE_DIR, family)
+    for day, files in sorted(by_day.items()):
+        if dry_run:
+            continue
+        daily = archive_dir / f"{day.isoformat()}.jsonl.gz"
+        entries = {e['name']: e for e in (read_archive(daily) if daily.exists() else [])}
+        for ts, path in files:
+            entries[path.name] = {'name': path.name, 'ts': ts.isoformat(), 'data': storage.load(path)}
+        write_archive(daily, entries.values())
+        rollups[day.isoformat()] = summarize(family, list(entries.values()))
+        # Only once the archive is safely on disk
+        for _, path in files:
+            storage.find(path).unlink()
+
+    # Fold old daily archives into their week
+    cutoff = (now - datetime.timedelta(days=DAILY_DAYS)).date()
+    weeks = {}
+    for first, path in archives(family, root):
+        if '-W' not in path.name and first < cutoff:
+            weeks.setdefault(week_key(first), []).append(path)
+    for week, dailies in sorted(weeks.items()):
+        if dry_run:
+            continue
+        weekly = archive_dir / f"{week}.jsonl.gz"
+        entries = {e['name']: e for e in (read_archive(weekly) if weekly.exists() else [])}
+        for path in dailies:
+            entries.update((e['name'], e) for e in read_archive(path))
+        write_archive(weekly, entries.values())
+        for path in dailies:
+            path.unlink()
+
+    if by_day and not dry_run:
+        rollup_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(rollup_path, 'w') as f:
+            json.dump(dict(sorted(rollups.items())), f, indent=2)
+
+    return {'archived': len(old), 'days': len(by_day), 'weeks': sum(len(d) for d in weeks.values()),
+            'kept': len(raw) - len(old)}
+
+
+def prune_sketches(root='.', days=SKETCH_DAYS, now=None, dry_run=False):
+    """Drop sketch log entries older than `days`; returns how many were (or would be) dropped"""
+    cutoff = ((now or datetime.datetime.now()) - datetime.timedelta(days=days)).isoformat()
+    logs = {storage.logical(physical) for physical in Path(root, cardinality.SKETCH_DIR).glob('*.jsonl*')
+            if not physical.name.endswith('.tmp')}
+    dropped = 0
+    for path in sorted(logs):
+        # Scans are appended in time order: nothing to drop unless the first one is old
+        first = next(storage.records(path), None)
+        if first is None or first[1]['ts'] >= cutoff:
+            continue
+        if dry_run:
+            dropped += sum(1 for _, entry in storage.records(path) if entry['ts'] < cutoff)
+            continue
+        with storage.writer(path, storage.codec_of(storage.find(path)).name) as out:
+            for _, entry in storage.records(path):
+                if entry['ts'] >= cutoff:
+                    out.write(entry)
+                else:
+                    dropped += 1
+    return dropped
+
+
+def snapshots(family, since=None, until=None, root='.'):
+    """
+    Yield (datetime, snapshot) oldest first across weekly and daily archives
+    and the recent raw files; since/until are datetimes
+    """
+    seen = set()
+    for first, path in archives(family, root):
+        last = first + datetime.timedelta(days=6 if '-W' in path.name else 0)
+        if (since and last < since.date()) or (until and first > until.date()):
+            continue
+        for entry in read_archive(path):
+            ts = datetime.datetime.fromisoformat(entry['ts'])
+            seen.add(entry['name'])
+            if (since and ts < since) or (until and ts > until):
+                continue
+            yield ts, entry['data']
+    for ts, path in raw_files(family, root):
+        if path.name in seen or (since and ts < since) or (until and ts > until):
+            continue
+        yield ts, storage.load(path)
+
+
+def latest(family, root='.'):
+    """The newest snapshot of a family, wherever it lives, or None"""
+    raw = raw_files(family, root)
+    if raw:
+        return storage.load(raw[-1][1])
+    found = archives(family, root)
+    if found:
+        entries = read_archive(found[-1][1])
+        return max(entries, key=lambda e: e['ts'])['data'] if entries else None
+    return None
+
+
+def rollup(family, root='.'):
+    """{day: {'snapshots', 'terms': {term: {metric: mean}}}} for archived days"""
+    path = Path(root, ROLLUP_DIR, f"{family}.json")
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Roll old scan snapshots into compressed archives')
+    parser.add_argument('--keep', type=int, default=KEEP_RAW, help='raw snapshots kept per family')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    for family in FAMILIES:
+        result = compact(family, keep=args.keep, dry_run=args.dry_run)
+        verb = 'would archive' if args.dry_run else 'archived'
+        print(f"🗄️  {family:10} {verb} {result['archived']} snapshots over {result['days']} days, "
+              f"kept {result['kept']} raw, {result['weeks']} daily archives merged by week")
+    dropped = prune_sketches(dry_run=args.dry_run)
+    print(f"🗄️  {'sketches':10} {'would drop' if args.dry_run else 'dropped'} {dropped} scans "
+          f"older than {SKETCH_DAYS} days")
+
+
+if __name__ == "__main__":
+    main()
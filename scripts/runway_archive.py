@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Runway Archive
+Every season's fashion week reports, indexed for cross-season questions.
+
+A report is one city's week in one season (the shape collect_runway has
+always produced: shows, key_trends, colors). Adding a report updates the
+rollups in place - trend and color totals per season and per city, each
+brand's trend footprint per season, each trend's timeline - so queries read
+a precomputed Counter instead of walking the archive. Re-adding a
+(season, city) report replaces it.
+
+Usage:
+  python3 scripts/runway_archive.py top --season FW26
+  python3 scripts/runway_archive.py brand Prada
+  python3 scripts/runway_archive.py trend "Return of Fur"
+  python3 scripts/runway_archive.py colors
+  python3 scripts/runway_archive.py compare FW25 FW26
+  python3 scripts/runway_archive.py import seasons.json   # {"FW25": {"PARIS": {...}}}
+"""
+
+import argparse
+import gzip
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+ARCHIVE_FILE = Path('data/runway_archive.json.gz')
+
+
+def season_key(season):
+    """Chronological sort key: SS26 < FW26 < SS27; unknown formats sort last"""
+    match = re.fullmatch(r'(SS|FW|AW|PF|RE)(\d{2,4})', season.upper())
+    if not match:
+        return (9999, 9, season)
+    half, year = match.groups()
+    year = int(year) + (2000 if len(year) == 2 else 0)
+    return (year, {'RE': 0, 'SS': 1, 'PF': 2, 'FW': 3, 'AW': 3}[half], season)
+
+
+def bump(counter, key, n):
+    counter[key] = counter.get(key, 0) + n
+    if not counter[key]:
+        del counter[key]
+
+
+class RunwayArchive:
+
+    def __init__(self):
+        self.reports = {}           # "season|city" -> report
+        self.season_trends = {}     # season -> {trend: appearances}
+        self.city_trends = {}       # season -> city -> {trend: appearances}
+        self.season_colors = {}     # season -> {color: cities showing it}
+        self.brand_trends = {}      # brand -> season -> {trend: appearances}
+        self.trend_timeline = {}    # trend -> {season: appearances}
+
+    def _apply(self, season, city, report, sign):
+        """Add (sign=1) or remove (sign=-1) one report's contribution to every rollup"""
+        season_trends = self.season_trends.setdefault(season, {})
+        city_trends = self.city_trends.setdefault(season, {}).setdefault(city, {})
+        for trend in report.get('key_trends', []):
+            name, n = trend['trend'], sign * trend['frequency']
+            bump(season_trends, name, n)
+            bump(city_trends, name, n)
+            bump(self.trend_timeline.setdefault(name, {}), season, n)
+            for brand in trend.get('brands', []):
+                bump(self.brand_trends.setdefault(brand, {}).setdefault(season, {}), name, n)
+        colors = self.season_colors.setdefault(season, {})
+        for color in report.get('colors', []):
+            bump(colors, color, sign)
+
+    def add_report(self, season, city, report):
+        key = f"{season}|{city}"
+        old = self.reports.get(key)
+        if old is not None:
+            self._apply(season, city, old, -1)
+        self.reports[key] = report
+        self._apply(season, city, report, 1)
+
+    def add_season(self, season, cities):
+        """cities: {city: report} as returned by collect_runway.get_fashion_week_trends"""
+        for city, report in cities.items():
+            self.add_report(season, city, report)
+
+    def seasons(self):
+        return sorted((s for s, trends in self.season_trends.items() if trends), key=season_key)
+
+    def cities(self, season):
+        return [city for city, trends in self.city_trends.get(season, {}).items() if trends]
+
+    def report(self, season, city):
+        return self.reports.get(f"{season}|{city}")
+
+    def trends(self, season):
+        """Flat trend rows for a season, most appearances first"""
+        rows = []
+        for city in self.city_trends.get(season, {}):
+            for trend in self.reports[f"{season}|{city}"].get('key_trends', []):
+                rows.append({
+                    'name': trend['trend'],
+                    'runway_frequency': trend['frequency'],
+                    'brands': trend['brands'],
+                    'city': city,
+                    'season': season
+                })
+        return sorted(rows, key=lambda x: x['runway_frequency'], reverse=True)
+
+    def top_trends(self, season, k=10, city=None):
+        source = self.city_trends.get(season, {}).get(city, {}) if city else self.season_trends.get(season, {})
+        return Counter(source).most_common(k)
+
+    def brand_footprint(self, brand, season=None):
+        """{season: [(trend, appearances)]} - or one season's list"""
+        seasons = self.brand_trends.get(brand, {})
+        if season:
+            return Counter(seasons.get(season, {})).most_common()
+        return {s: Counter(seasons[s]).most_common() for s in sorted(seasons, key=season_key) if seasons[s]}
+
+    def timeline(self, trend):
+        """{season: appearances} for one trend, oldest season first"""
+        seasons = self.trend_timeline.get(trend, {})
+        return {s: seasons[s] for s in sorted(seasons, key=season_key)}
+
+    def palette(self, season, k=5):
+        return Counter(self.season_colors.get(season, {})).most_common(k)
+
+    def color_frequency(self, color=None):
+        """One color's count per season, or every season's palette"""
+        if color:
+            return {s: self.season_colors.get(s, {}).get(color, 0) for s in self.seasons()}
+        return {s: self.palette(s, None) for s in self.seasons()}
+
+    def compare(self, before, after, k=5):
+        """Biggest risers and fallers between two seasons"""
+        a, b = self.season_trends.get(before, {}), self.season_trends.get(after, {})
+        deltas = sorted(((t, b.get(t, 0) - a.get(t, 0)) for t in set(a) | set(b)),
+                        key=lambda x: x[1], reverse=True)
+        return {
+            'rising': [d for d in deltas[:k] if d[1] > 0],
+            'falling': [d for d in deltas[::-1][:k] if d[1] < 0]
+        }
+
+    def save(self, path=ARCHIVE_FILE):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, 'wt') as f:
+            json.dump({
+                'reports': self.reports,
+                'season_trends': self.season_trends,
+                'city_trends': self.city_trends,
+                'season_colors': self.season_colors,
+                'brand_trends': self.brand_trends,
+                'trend_timeline': self.trend_timeline
+            }, f)
+
+    @classmethod
+    def load(cls, path=ARCHIVE_FILE):
+        archive = cls()
+        if not Path(path).exists():
+            return archive
+        with gzip.open(path, 'rt') as f:
+            saved = json.load(f)
+        for field in ('reports', 'season_trends', 'city_trends', 'season_colors',
+                      'brand_trends', 'trend_timeline'):
+            setattr(archive, field, saved[field])
+        return archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the runway archive')
+    sub = parser.add_subparsers(dest='command', required=True)
+    top = sub.add_parser('top')
+    top.add_argument('--season')
+    top.add_argument('--city')
+    top.add_argument('-k', type=int, default=10)
+    brand = sub.add_parser('brand')
+    brand.add_argument('name')
+    timeline = sub.add_parser('trend')
+    timeline.add_argument('name')
+    colors = sub.add_parser('colors')
+    colors.add_argument('--color')
+    compare = sub.add_parser('compare')
+    compare.add_argument('before')
+    compare.add_argument('after')
+    load = sub.add_parser('import')
+    load.add_argument('file')
+    args = parser.parse_args()
+
+    archive = RunwayArchive.load()
+
+    if args.command == 'import':
+        with open(args.file) as f:
+            for season, cities in json.load(f).items():
+                archive.add_season(season, cities)
+        archive.save()
+        print(f"✅ Archive: {len(archive.reports)} reports across {len(archive.seasons())} seasons")
+    elif args.command == 'top':
+        season = args.season or archive.seasons()[-1]
+        print(f"🔥 {season}{' ' + args.city if args.city else ''}:")
+        for trend, n in archive.top_trends(season, args.k, args.city):
+            print(f"  {trend:25} {n:4} appearances")
+    elif args.command == 'brand':
+        for season, trends in archive.brand_footprint(args.name).items():
+            print(f"{season}: " + ', '.join(f"{t} ({n})" for t, n in trends))
+    elif args.command == 'trend':
+        for season, n in archive.timeline(args.name).items():
+            print(f"  {season}: {n:4} appearances")
+    elif args.command == 'colors':
+        if args.color:
+            for season, n in archive.color_frequency(args.color).items():
+                print(f"  {season}: {n}")
+        else:
+            for season, palette in archive.color_frequency().items():
+                print(f"{season}: " + ', '.join(c for c, _ in palette[:5]))
+    elif args.command == 'compare':
+        diff = archive.compare(args.before, args.after)
+        print(f"📈 Rising {args.before} → {args.after}: " + ', '.join(f"{t} (+{n})" for t, n in diff['rising']))
+        print("📉 Falling: " + ', '.join(f"{t} ({n})" for t, n in diff['falling']))
+
+
+if __name__ == "__main__":
+    main()
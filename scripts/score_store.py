@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Score Store
+Trend scores are computed once per cycle and read everywhere else.
+
+Every scoring model (the 0-100 dashboard trend score, the street adoption
+score) materializes its scores here, in data/scores.jsonl, one record per
+computation:
+  {"model": "trend", "version": 2, "ts": "<scan time>", "fingerprint": "...",
+   "scores": {"mob wife": 62, ...}}
+
+So a score is keyed by (term, scan time, model version). The fingerprint
+covers the source files a computation read (codec variant, mtime and size,
+like the query API's stamps) plus anything else its result depends on. A
+consumer asking for scores gets the stored record while the fingerprint and
+version still match, and a fresh computation appended otherwise. Bumping a
+model's version therefore recomputes everything once, without touching old
+records.
+
+backfill.py adds records for past scan times the same way, so series()
+covers history from before a model existed.
+
+Usage:
+  python3 scripts/score_store.py                     # latest scores per model
+  python3 scripts/score_store.py --term "mob wife"   # one term over time
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import storage
+
+SCORES_FILE = Path('data/scores.jsonl')
+
+_lock = threading.Lock()
+_known = {}          # (model, version) -> its latest record, for this process
+_read = {}           # scores file stamp the memo was filled from
+
+
+def stamp(path):
+    physical = storage.find(path)
+    if physical is None:
+        return None
+    st = os.stat(physical)
+    return [str(physical), st.st_mtime_ns, st.st_size]
+
+
+def fingerprint(sources, extra=None):
+    """Identifies the inputs of a computation: source file stamps plus extra (JSON-able)"""
+    basis = [[str(path), stamp(path)] for path in sources]
+    return hashlib.sha1(json.dumps([basis, extra], sort_keys=True).encode()).hexdigest()[:20]
+
+
+def records(path=SCORES_FILE):
+    for _, record in storage.records(path):
+        yield record
+
+
+def _remember(record):
+    """Keep a record in the memo if it is its model version's latest"""
+    key = (record['model'], record['version'])
+    if key not in _known or record['ts'] >= _known[key]['ts']:
+        _known[key] = record
+
+
+def _refresh(path):
+    """Fill the in-process memo with records other processes appended"""
+    current = stamp(path)
+    if _read.get(str(path)) != current:
+        for record in records(path):
+            _remember(record)
+        _read[str(path)] = current
+
+
+def _stored(model, version, fp, path):
+    """The memo's record for a model version if it has this fingerprint"""
+    _refresh(path)
+    record = _known.get((model, version))
+    return record if record and record['fingerprint'] == fp else None
+
+
+def materialize(model, version, sources, compute, extra=None, ts=None, path=SCORES_FILE):
+    """
+    {term: score} for a model version over the current sources: the stored
+    record when its fingerprint still matches, else compute() appended as
+    a new one. ts is the scan time (or a callable giving it once compute()
+    has run); defaults to now.
+
+    compute() runs outside the store's lock, so it may itself materialize
+    another model. Two threads missing at once may both compute; only the
+    first to finish appends.
+    """
+    fp = fingerprint(sources, extra)
+    with _lock:
+        record = _stored(model, version, fp, path)
+    if record is not None:
+        return record['scores']
+
+    scores = compute()
+    scanned = ts() if callable(ts) else ts
+    with _lock:
+        record = _stored(model, version, fp, path)
+        if record is None:
+            record = {'model': model, 'version': version,
+                      'ts': scanned or datetime.datetime.now().isoformat(),
+                      'fingerprint': fp, 'scores': scores}
+            storage.append(path, [record])
+            _remember(record)
+            _read[str(path)] = stamp(path)
+        return record['scores']
+
+
+def backfill(model, version, points, extra=None, path=SCORES_FILE):
+    """
+    Store scores recomputed for past scans, points being {scan time: scores}.
+    A record is fingerprinted by extra, its time and its scores, so running
+    a backfill twice adds nothing, while a scan time whose scores changed gets
+    a newer record. Returns the number of records added.
+    """
+    with _lock:
+        # The memo only keeps each version's latest record: the fingerprints
+        # to skip are read from the file, for this call only
+        stored = set()
+        for record in records(path):
+            _remember(record)
+            if record['model'] == model and record['version'] == version:
+                stored.add(record['fingerprint'])
+        added = []
+        for ts, scores in sorted(points.items()):
+            fp = fingerprint([], [extra, ts, scores])
+            if fp not in stored:
+                record = {'model': model, 'version': version, 'ts': ts, 'fingerprint': fp, 'scores': scores}
+                stored.add(fp)
+                added.append(record)
+        storage.append(path, added)
+        for record in added:
+            _remember(record)
+        _read[str(path)] = stamp(path)
+        return len(added)
+
+
+def latest(model, version=None, path=SCORES_FILE):
+    """The newest record of a model (its highest version unless one is given), or None"""
+    best = None
+    for record in records(path):
+        if record['model'] != model or (version is not None and record['version'] != version):
+            continue
+        if best is None or (record['version'], record['ts']) >= (best['version'], best['ts']):
+            best = record
+    return best
+
+
+def series(term, model, version=None, path=SCORES_FILE):
+    """[(scan time, score)] for one term, oldest first; one point per scan time"""
+    points = {}
+    for record in records(path):
+        if record['model'] == model and (version is None or record['version'] == version) \
+                and term in record['scores']:
+            points[record['ts']] = record['scores'][term]
+    return sorted(points.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Materialized trend scores')
+    parser.add_argument('--term')
+    parser.add_argument('--model', default='trend')
+    args = parser.parse_args()
+
+    if args.term:
+        for ts, score in series(args.term, args.model):
+            print(f"  {ts[:16]}  {score}")
+        return
+
+    models = sorted({record['model'] for record in records()})
+    for model in models:
+        record = latest(model)
+        print(f"📐 {model} v{record['version']} @ {record['ts'][:16]}")
+        for term, score in sorted(record['scores'].items(), key=lambda x: -(x[1] or 0))[:10]:
+            print(f"  {term:30} {score}")
+
+
+if __name__ == "__main__":
+    main()
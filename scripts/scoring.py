@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Scoring Models
+The 0-100 trend score as configuration instead of code.
+
+A model is a list of components, each turning one metric of one source into
+points:
+
+  {"name": "tiktok", "source": "tiktok", "metric": "growth_pct", "divisor": 10, "max": 40}
+
+  match      'substring' (term inside the platform key, first key in sorted order wins) or 'exact'
+  transform  'linear' or 'log10' (of 1 + value) before dividing
+  divisor    value per point; points are clamped to [0, max]
+  points     {value: points} for categorical metrics such as sentiment
+
+Models score normalized signals, {source: {platform key: {metric: value}}},
+which is the shape of a history scan (data/history) and what
+signals_from_snapshots() makes of the dashboard's latest snapshots, so a
+live score and a backtested one go through the same code.
+
+Built-in models live in MODELS; data/scoring_models.json can add more,
+either in full or as {"extends": "classic", "set": {"tiktok.max": 50}}, and
+pick the active one ({"active": "..."}; TASTE_MODEL overrides it).
+
+Usage:
+  python3 scripts/scoring.py                  # list models
+  python3 scripts/scoring.py "mob wife"       # score a term from the latest snapshots
+"""
+
+import argparse
+import copy
+import math
+import os
+from pathlib import Path
+
+import storage
+
+MODELS_FILE = Path('data/scoring_models.json')
+
+# The weights calculate_trend_score has always used: TikTok 40, StockX 30,
+# Reddit 30, plus the breadth bonus
+MODELS = {
+    'classic': {
+        'cap': 100,
+        'components': [
+            {'name': 'tiktok', 'source': 'tiktok', 'metric': 'growth_pct', 'divisor': 10, 'max': 40},
+            {'name': 'stockx', 'source': 'stockx', 'metric': 'change_pct', 'divisor': 2, 'max': 30},
+            {'name': 'breadth', 'source': 'breadth', 'metric': 'authors', 'match': 'exact',
+             'transform': 'log10', 'divisor': 0.3, 'max': 10},
+            {'name': 'sentiment', 'source': 'reddit', 'metric': 'sentiment', 'match': 'exact',
+             'points': {'positive': 20}},
+            {'name': 'activity', 'source': 'reddit', 'metric': 'mentions', 'match': 'exact',
+             'divisor': 1, 'max': 10},
+        ]
+    },
+}
+
+TRANSFORMS = {
+    'linear': lambda v: v,
+    'log10': lambda v: math.log10(1 + max(v, 0)),
+}
+
+
+def parse_pct(text):
+    """'+350%' -> 350, '-20%' -> -20"""
+    try:
+        return int(str(text).replace('%', '').replace('+', ''))
+    except ValueError:
+        return 0
+
+
+def signals_from_snapshots(data):
+    """The dashboard's loaded snapshots as normalized signals"""
+    signals = {}
+    if 'tiktok' in data:
+        signals['tiktok'] = {item['hashtag']: {'growth_pct': parse_pct(item['week_over_week']),
+                                               'views': item.get('views', 0)}
+                             for item in data['tiktok'].get('hashtag_data', [])}
+    if 'stockx' in data:
+        signals['stockx'] = {item: {'change_pct': parse_pct(metrics.get('week_change', '0%'))}
+                             for item, metrics in data['stockx'].get('stockx_data', {}).items()}
+    if 'reddit' in data:
+        signals['reddit'] = data['reddit'].get('reddit_data', {})
+    if data.get('breadth'):
+        signals['breadth'] = {term: {'authors': n} for term, n in data['breadth'].items() if n}
+    return signals
+
+
+class Component:
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec['name']
+        self.source = spec['source']
+        self.metric = spec['metric']
+        self.match = spec.get('match', 'substring')
+        self.transform = TRANSFORMS[spec.get('transform', 'linear')]
+        self.divisor = spec.get('divisor', 1)
+        self.max = spec.get('max', 100)
+        self.table = spec.get('points')
+
+    def key(self, term, keys):
+        """
+        The platform key a term reads from, or None. Keys are tried in sorted
+        order, not the order a snapshot happens to list them, so a live score
+        and a backtest resolve a term to the same key.
+        """
+        if self.match == 'exact':
+            return term if term in keys else None
+        term = term.lower()
+        return next((k for k in sorted(keys) if term in k.lower()), None)
+
+    def points(self, value):
+        if value is None:
+            return 0
+        if self.table is not None:
+            return self.table.get(value, 0)
+        return round(max(0, min(self.transform(value) / self.divisor, self.max)), 1)
+
+    def score(self, term, signals):
+        per_key = signals.get(self.source, {})
+        key = self.key(term, per_key)
+        return self.points(per_key[key].get(self.metric)) if key is not None else 0
+
+
+class ScoringModel:
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.cap = config.get('cap', 100)
+        self.components = [Component(spec) for spec in config['components']]
+
+    def score(self, term, signals):
+        return min(sum(c.score(term, signals) for c in self.components), self.cap)
+
+    def breakdown(self, term, signals):
+        return {c.name: c.score(term, signals) for c in self.components}
+
+    def with_settings(self, settings, name=None):
+        """A copy with 'component.field' values replaced, e.g. {'tiktok.max': 50}"""
+        config = copy.deepcopy(self.config)
+        by_name = {spec['name']: spec for spec in config['components']}
+        for path, value in settings.items():
+            component, field = path.split('.', 1)
+            if component not in by_name:
+                raise ValueError(f"model {self.name!r} has no component {component!r}")
+            by_name[component][field] = value
+        return ScoringModel(name or self.name, config)
+
+
+def configured(path=MODELS_FILE):
+    """(active model name, {name: config}) from the built-ins and the models file"""
+    models = copy.deepcopy(MODELS)
+    active = 'classic'
+    saved = storage.load(path) if path else None
+    if saved:
+        for name, config in saved.get('models', {}).items():
+            if 'extends' in config:
+                base = ScoringModel(config['extends'], models[config['extends']])
+                config = base.with_settings(config.get('set', {})).config
+            models[name] = config
+        active = saved.get('active', active)
+    return os.environ.get('TASTE_MODEL', active), models
+
+
+def get_model(name=None, path=MODELS_FILE):
+    active, models = configured(path)
+    name = name or active
+    if name not in models:
+        raise ValueError(f"unknown scoring model {name!r} (choose from {', '.join(sorted(models))})")
+    return ScoringModel(name, models[name])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Configured trend scoring models')
+    parser.add_argument('term', nargs='?')
+    parser.add_argument('--model')
+    args = parser.parse_args()
+
+    if not args.term:
+        active, models = configured()
+        for name, config in sorted(models.items()):
+            parts = ', '.join(f"{c['name']} {c.get('max', max(c.get('points', {0: 0}).values()))}"
+                              for c in config['components'])
+            print(f"{'*' if name == active else ' '} {name:15} {parts}")
+        return
+
+    import ultimate_dashboard
+
+    model = get_model(args.model)
+    signals = signals_from_snapshots(ultimate_dashboard.load_all_data())
+    print(f"{args.term}: {model.score(args.term, signals)} ({model.name})")
+    for name, points in model.breakdown(args.term, signals).items():
+        print(f"  {name:12} {points}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Sound × Hashtag Index
+Which sounds travel with which hashtags, measured instead of hand-labelled.
+
+Every scan's videos fold into co-occurrence counts kept as two inverted
+indexes (sound -> hashtags, hashtag -> sounds). Associations are ranked by
+lift = P(sound, tag) / (P(sound) P(tag)), so a sound that's everywhere
+doesn't look "correlated" with everything.
+
+Usage:
+  python3 scripts/sound_index.py                 # top associations
+  python3 scripts/sound_index.py --sound "Escapism - RAYE"
+  python3 scripts/sound_index.py --tag mobwife
+"""
+
+import argparse
+from collections import Counter
+from pathlib import Path
+
+import storage
+
+INDEX_FILE = Path('data/sound_index.json')
+SCANS_FILE = Path('data/sound_scans.jsonl')
+
+# Co-occurrences below this are noise, not an association
+MIN_SUPPORT = 5
+# Scan ids remembered for idempotency: a re-run only ever repeats a recent scan
+RECENT_SCANS = 64
+
+
+class SoundIndex:
+
+    def __init__(self):
+        self.sound_tags = {}       # sound -> Counter(tag)
+        self.tag_sounds = {}       # tag -> Counter(sound)
+        self.sound_counts = Counter()
+        self.tag_counts = Counter()
+        self.videos = 0
+        self.scan_count = 0
+        self.recent_scans = []     # the last RECENT_SCANS scan ids, oldest first
+
+    def add_video(self, sound, hashtags):
+        if not sound:
+            return
+        self.videos += 1
+        self.sound_counts[sound] += 1
+        tags = self.sound_tags.setdefault(sound, Counter())
+        for tag in set(hashtags):
+            self.tag_counts[tag] += 1
+            tags[tag] += 1
+            self.tag_sounds.setdefault(tag, Counter())[sound] += 1
+
+    def add_scan(self, scan_id, videos):
+        """
+        Fold one scan in. Idempotent per scan_id among the last RECENT_SCANS
+        scans, and the per-scan co-occurrences are appended to SCANS_FILE so
+        the index can be rebuilt. Returns False if the scan was already indexed.
+        """
+        if scan_id in self.recent_scans:
+            return False
+
+        pairs = Counter()
+        for video in videos:
+            self.add_video(video.get('sound'), video.get('hashtags', []))
+            for tag in set(video.get('hashtags', [])):
+                pairs[(video.get('sound'), tag)] += 1
+        self.scan_count += 1
+        self.recent_scans = (self.recent_scans + [scan_id])[-RECENT_SCANS:]
+
+        storage.append(SCANS_FILE, [{
+            'scan': scan_id,
+            'videos': len(videos),
+            'pairs': [[s, t, n] for (s, t), n in pairs.items() if s]
+        }])
+        return True
+
+    def lift(self, sound, tag):
+        n = self.sound_tags.get(sound, {}).get(tag, 0)
+        if not n:
+            return 0.0
+        return n * self.videos / (self.sound_counts[sound] * self.tag_counts[tag])
+
+    def trends_for_sound(self, sound, k=5, min_support=MIN_SUPPORT):
+        """Hashtags this sound drives, best lift first"""
+        ranked = [(tag, self.lift(sound, tag), n)
+                  for tag, n in self.sound_tags.get(sound, {}).items() if n >= min_support]
+        return sorted(ranked, key=lambda x: x[1], reverse=True)[:k]
+
+    def sounds_for_tag(self, tag, k=5, min_support=MIN_SUPPORT):
+        """Sounds riding with this hashtag, best lift first"""
+        ranked = [(sound, self.lift(sound, tag), n)
+                  for sound, n in self.tag_sounds.get(tag, {}).items() if n >= min_support]
+        return sorted(ranked, key=lambda x: x[1], reverse=True)[:k]
+
+    def top_associations(self, k=10, min_support=MIN_SUPPORT):
+        """Strongest sound -> trend pairs overall; walks only stored pairs"""
+        ranked = []
+        for sound, tags in self.sound_tags.items():
+            for tag, n in tags.items():
+                if n >= min_support:
+                    ranked.append({'sound': sound, 'hashtag': tag, 'lift': round(self.lift(sound, tag), 2),
+                                   'videos': n})
+        ranked.sort(key=lambda x: x['lift'], reverse=True)
+        return ranked[:k]
+
+    def save(self, path=INDEX_FILE):
+        storage.dump({
+            'videos': self.videos,
+            'scan_count': self.scan_count,
+            'recent_scans': self.recent_scans,
+            'sound_counts': self.sound_counts,
+            'sound_tags': self.sound_tags
+        }, path)
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        index = cls()
+        saved = storage.load(path)
+        if saved is None:
+            return index
+        index.videos = saved['videos']
+        # Indexes saved before the bound kept every scan id under 'scans'
+        scans = saved.get('recent_scans', saved.get('scans', []))
+        index.scan_count = saved.get('scan_count', len(scans))
+        index.recent_scans = scans[-RECENT_SCANS:]
+        index.sound_counts = Counter(saved['sound_counts'])
+        # The hashtag side is derived, so only the sound side is stored
+        for sound, tags in saved['sound_tags'].items():
+            index.sound_tags[sound] = Counter(tags)
+            for tag, n in tags.items():
+                index.tag_sounds.setdefault(tag, Counter())[sound] = n
+                index.tag_counts[tag] += n
+        return index
+
+
+def correlation_label(lift):
+    if lift >= 2:
+        return 'HIGH'
+    if lift >= 1.2:
+        return 'MEDIUM'
+    return 'LOW'
+
+
+def annotate_sounds(index, sounds):
+    """Replace hand-labelled correlations with measured ones where we have support"""
+    for sound in sounds:
+        best = index.trends_for_sound(sound['name'], k=1)
+        if best:
+            tag, lift, n = best[0]
+            sound['associated_trend'] = f"#{tag}"
+            sound['lift'] = round(lift, 2)
+            sound['fashion_correlation'] = correlation_label(lift)
+    return sounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the sound/hashtag index')
+    parser.add_argument('--sound')
+    parser.add_argument('--tag')
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    index = SoundIndex.load()
+    print(f"🎵 {len(index.sound_tags):,} sounds × {len(index.tag_sounds):,} hashtags "
+          f"from {index.videos:,} videos in {index.scan_count} scans\n")
+
+    if args.sound:
+        for tag, lift, n in index.trends_for_sound(args.sound, args.k):
+            print(f"  #{tag:20} lift {lift:5.2f} ({n} videos)")
+    elif args.tag:
+        for sound, lift, n in index.sounds_for_tag(args.tag.lstrip('#').lower(), args.k):
+            print(f"  {sound:40} lift {lift:5.2f} ({n} videos)")
+    else:
+        for a in index.top_associations(args.k):
+            print(f"  {a['sound']:40} → #{a['hashtag']:15} lift {a['lift']:5.2f} ({a['videos']} videos)")
+
+
+if __name__ == "__main__":
+    main()
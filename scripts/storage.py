@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Storage
+One place that decides how data files are encoded on disk.
+
+Callers name files by their logical path ('data/tiktok_latest.json',
+'data/history/tiktok.jsonl'); the codec adds its suffix:
+
+  json      plain JSON (compact); legacy indent=2 files still load
+  gzip      .gz   - stdlib, the default
+  zstd      .zst  - needs the zstandard package
+  msgpack   .msgpack - binary records, needs the msgpack package
+
+TASTE_CODEC picks the codec for new writes. Reads find whichever variant of
+a logical path exists, so files written under different codecs keep loading
+while a tree is being migrated.
+
+Record files (.jsonl) are sequences of frames: a line for plain JSON, a
+gzip member or zstd frame, or a msgpack object. Each append() adds one
+frame, so appends never rewrite the file, and records() resumes from the
+byte offset after any frame - the same offset protocol history consumers
+already use. A half-written trailing frame is left for the next read.
+
+Usage:
+  python3 scripts/storage.py migrate              # re-encode data/ with TASTE_CODEC
+  python3 scripts/storage.py export data/history/tiktok.jsonl
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import os
+import sys
+import zlib
+from pathlib import Path
+
+DEFAULT_CODEC = os.environ.get('TASTE_CODEC', 'gzip')
+CHUNK_SIZE = 1 << 20
+FRAME_RECORDS = 1000        # records per frame when streaming a whole file out
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Left alone by migrate: hand-edited or bookkeeping files that stay plain
+# JSON, and files whose modules already manage their own compression
+MIGRATE_EXCLUDE = {'data/terms.json', 'data/scoring_models.json', 'data/daemon_state.json', 'data/creator_graph.json',
+                   'data/creator_events.jsonl', 'data/runway_archive.json', 'data/cassette.jsonl'}
+MIGRATE_EXCLUDE_DIRS = ('data/archive/', 'data/cache/', 'data/logs/')
+
+
+def json_lines(records):
+    return b''.join(json.dumps(r, separators=(',', ':')).encode() + b'\n' for r in records)
+
+
+def parse_lines(payload):
+    return [json.loads(line) for line in payload.splitlines() if line.strip()]
+
+
+def compressed_frames(f, decompressor):
+    """(compressed size, payload) of each complete member/frame from the current position"""
+    d, fed, payload = decompressor(), 0, []
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return  # a trailing partial frame is still being written
+        while chunk:
+            payload.append(d.decompress(chunk))
+            fed += len(chunk)
+            if not d.eof:
+                break
+            rest = d.unused_data
+            yield fed - len(rest), b''.join(payload)
+            d, fed, payload, chunk = decompressor(), 0, [], rest
+
+
+class PlainCodec:
+    name, suffix = 'json', ''
+
+    def encode(self, records):
+        return json_lines(records)
+
+    def frames(self, f):
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            yield len(line), parse_lines(line)
+
+
+class GzipCodec:
+    name, suffix = 'gzip', '.gz'
+
+    def encode(self, records):
+        # Fixed mtime: the same records always give the same bytes
+        return gzip.compress(json_lines(records), GZIP_LEVEL, mtime=0)
+
+    def frames(self, f):
+        for size, payload in compressed_frames(f, lambda: zlib.decompressobj(31)):
+            yield size, parse_lines(payload)
+
+
+class ZstdCodec:
+    name, suffix = 'zstd', '.zst'
+
+    @staticmethod
+    def module():
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("the zstd codec needs the zstandard package (pip install zstandard)")
+        return zstandard
+
+    def encode(self, records):
+        return self.module().ZstdCompressor(level=ZSTD_LEVEL).compress(json_lines(records))
+
+    def frames(self, f):
+        zstd = self.module()
+        for size, payload in compressed_frames(f, lambda: zstd.ZstdDecompressor().decompressobj()):
+            yield size, parse_lines(payload)
+
+
+class MsgpackCodec:
+    name, suffix = 'msgpack', '.msgpack'
+
+    @staticmethod
+    def module():
+        try:
+            import msgpack
+        except ImportError:
+            raise RuntimeError("the msgpack codec needs the msgpack package (pip install msgpack)")
+        return msgpack
+
+    def encode(self, records):
+        packb = self.module().packb
+        return b''.join(packb(r, use_bin_type=True) for r in records)
+
+    def frames(self, f):
+        unpacker = self.module().Unpacker(raw=False, strict_map_key=False)
+        position = 0
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            unpacker.feed(chunk)
+            for record in unpacker:
+                yield unpacker.tell() - position, [record]
+                position = unpacker.tell()
+
+
+CODECS = {codec.name: codec for codec in (PlainCodec(), GzipCodec(), ZstdCodec(), MsgpackCodec())}
+
+
+def get_codec(name=None):
+    name = name or DEFAULT_CODEC
+    if name not in CODECS:
+        raise ValueError(f"unknown codec {name!r} (choose from {', '.join(CODECS)})")
+    return CODECS[name]
+
+
+def codec_of(path):
+    """The codec a physical file was written with, from its suffix"""
+    for codec in CODECS.values():
+        if codec.suffix and str(path).endswith(codec.suffix):
+            return codec
+    return CODECS['json']
+
+
+def logical(path):
+    """Physical path -> the logical name callers use"""
+    codec = codec_of(path)
+    return Path(str(path)[:-len(codec.suffix)] if codec.suffix else path)
+
+
+def variants(path):
+    return [Path(str(path) + codec.suffix) for codec in CODECS.values()]
+
+
+def find(path):
+    """The physical file behind a logical path (newest if several codecs left one), or None"""
+    existing = [p for p in variants(path) if p.exists()]
+    if not existing:
+        return None
+    return max(existing, key=lambda p: p.stat().st_mtime_ns)
+
+
+def exists(path):
+    return find(path) is not None
+
+
+def mtime(path):
+    """Modification time of whatever backs a logical path, or None"""
+    physical = find(path)
+    return physical.stat().st_mtime_ns if physical else None
+
+
+def records(path, offset=0):
+    """Yield (offset after the record's frame, record) from a byte offset on"""
+    physical = find(path)
+    if physical is None:
+        return
+    codec = codec_of(physical)
+    with open(physical, 'rb') as f:
+        f.seek(offset)
+        for size, batch in codec.frames(f):
+            offset += size
+            for record in batch:
+                yield offset, record
+
+
+def append(path, new_records, codec=None):
+    """Add one frame to a record file, in whatever codec it already uses"""
+    new_records = list(new_records)
+    if not new_records:
+        return
+    physical = find(path)
+    codec = codec_of(physical) if physical else get_codec(codec)
+    physical = physical or Path(str(path) + codec.suffix)
+    physical.parent.mkdir(parents=True, exist_ok=True)
+    with open(physical, 'ab') as f:
+        f.write(codec.encode(new_records))
+
+
+class RecordWriter:
+    """Buffers records into frames of FRAME_RECORDS; see writer()"""
+
+    def __init__(self, f, codec):
+        self.f, self.codec, self.pending = f, codec, []
+
+    def write(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= FRAME_RECORDS:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.f.write(self.codec.encode(self.pending))
+            self.pending = []
+
+
+@contextlib.contextmanager
+def writer(path, codec=None):
+    """
+    Stream records into a fresh file for a logical path. The file replaces
+    every existing variant only once the block completes.
+    """
+    codec = get_codec(codec)
+    physical = Path(str(path) + codec.suffix)
+    physical.parent.mkdir(parents=True, exist_ok=True)
+    tmp = physical.with_name(physical.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        out = RecordWriter(f, codec)
+        yield out
+        out.flush()
+    os.replace(tmp, physical)
+    for stale in variants(path):
+        if stale != physical and stale.exists():
+            stale.unlink()
+
+
+def dump(obj, path, codec=None):
+    """Write one document; returns the physical path"""
+    with writer(path, codec) as out:
+        out.write(obj)
+    return Path(str(path) + get_codec(codec).suffix)
+
+
+def load(path, default=None):
+    """Read one document from whichever variant exists"""
+    physical = find(path)
+    if physical is None:
+        return default
+    if codec_of(physical).suffix == '':
+        # Plain files may predate the storage layer and be pretty-printed
+        with open(physical) as f:
+            return json.load(f)
+    for _, record in records(path):
+        return record
+    return default
+
+
+def migrate(paths, codec=None):
+    """Re-encode files in place under a codec; returns [(logical path, bytes before, bytes after)]"""
+    target = get_codec(codec)
+    moved = []
+    for path in paths:
+        physical = find(path)
+        if physical is None or codec_of(physical) is target:
+            continue
+        before = physical.stat().st_size
+        if str(path).endswith('.jsonl'):
+            with writer(path, target.name) as out:
+                for _, record in records(path):
+                    out.write(record)
+        else:
+            dump(load(path), path, target.name)
+        moved.append((str(path), before, find(path).stat().st_size))
+    return moved
+
+
+def data_files(root='data'):
+    """Logical paths of every JSON / JSON-lines data file under a directory"""
+    found = set()
+    for physical in Path(root).rglob('*'):
+        if not physical.is_file() or physical.name.endswith('.tmp'):
+            continue
+        path = logical(physical)
+        name = path.as_posix()
+        if (path.suffix in ('.json', '.jsonl') and name not in MIGRATE_EXCLUDE
+                and not name.startswith(MIGRATE_EXCLUDE_DIRS)):
+            found.add(path)
+    return sorted(found)
+
+
+def export(path, out=sys.stdout):
+    """Human-readable copy: pretty JSON for documents, one JSON object per line for records"""
+    if str(path).endswith('.jsonl'):
+        for _, record in records(path):
+            out.write(json.dumps(record) + '\n')
+    else:
+        json.dump(load(path), out, indent=2)
+        out.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Encode, migrate and export data files')
+    sub = parser.add_subparsers(dest='command', required=True)
+    mig = sub.add_parser('migrate', help='re-encode existing data files')
+    mig.add_argument('paths', nargs='*', help='logical paths (default: everything under data/)')
+    mig.add_argument('--codec', default=DEFAULT_CODEC, choices=list(CODECS))
+    exp = sub.add_parser('export', help='print a file as readable JSON')
+    exp.add_argument('path')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export(logical(args.path))
+        return
+
+    paths = [logical(p) for p in args.paths] or data_files()
+    moved = migrate(paths, args.codec)
+    before = sum(b for _, b, _ in moved)
+    after = sum(a for _, _, a in moved)
+    for path, b, a in moved:
+        print(f"  {path:45} {b:>10,} → {a:>10,} bytes")
+    print(f"📦 {len(moved)} files migrated to {args.codec}: {before:,} → {after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
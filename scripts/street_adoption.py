@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Street Adoption
+How far each runway trend has actually made it onto TikTok, Twitter and Reddit.
+
+Each cycle reads only the social scans appended to data/history since the
+last run (byte offsets are kept with the state) and maps every platform term
+to its registered trends through the alias index. A trend gets a new point
+in its gap history only when its street or runway score moved; that history
+is what the runway-to-street lag chart is drawn from.
+
+Current street scores are materialized in score_store (model 'street'),
+keyed to the history logs they were computed from, so the runway collector,
+the ad engine and the API share one computation per cycle.
+
+Usage:
+  python3 scripts/street_adoption.py                     # latest gaps
+  python3 scripts/street_adoption.py --trend "Return of Fur"
+"""
+
+import argparse
+import datetime
+import math
+from pathlib import Path
+
+import history
+import score_store
+import storage
+import term_registry
+
+STATE_FILE = Path('data/runway_gaps.json')
+
+# How much each platform counts towards the street score
+WEIGHTS = {'tiktok': 0.5, 'twitter': 0.25, 'reddit': 0.25}
+SENTIMENT_BONUS = {'positive': 15, 'neutral': 0, 'negative': -15}
+# Gap points kept per trend
+HISTORY_LIMIT = 500
+# Bump whenever the scorers, weights or combine() change
+SCORE_VERSION = 1
+
+
+def clamp(x):
+    return max(0, min(100, x))
+
+
+def tiktok_score(metrics):
+    # +350% w/w saturates, a dying tag bottoms out
+    return clamp(30 + metrics.get('growth_pct', 0) / 5)
+
+
+def twitter_score(metrics):
+    # 100 avg engagement -> 40, 10K -> 80
+    return clamp(20 * math.log10(1 + metrics.get('avg_engagement', 0)))
+
+
+def reddit_score(metrics):
+    # A full page of weekly posts (25) -> 75, shifted by sentiment. Fan-out
+    # scans sum over many communities; scale them back to the original three
+    mentions = metrics.get('mentions', 0) * 3 / max(metrics.get('communities', 3), 1)
+    return clamp(3 * mentions + SENTIMENT_BONUS.get(metrics.get('sentiment'), 0))
+
+
+SCORERS = {'tiktok': tiktok_score, 'twitter': twitter_score, 'reddit': reddit_score}
+
+
+def combine(signals):
+    """
+    {source: {platform term: score}} -> one 0-100 street score, weighted
+    over the platforms that mention it; an alias's best showing counts
+    """
+    total = weight = 0
+    for source, per_term in signals.items():
+        if per_term:
+            total += WEIGHTS[source] * max(per_term.values())
+            weight += WEIGHTS[source]
+    return round(total / weight) if weight else None
+
+
+def gap_status(gap):
+    if gap is None:
+        return 'NO STREET SIGNAL - Not measured yet'
+    if gap > 20:
+        return 'RUNWAY ONLY - Not translating'
+    if gap < -20:
+        return 'STREET LED - Runway following culture'
+    return 'ALIGNED - Runway predicted correctly'
+
+
+class StreetAdoption:
+
+    def __init__(self):
+        self.offsets = {}    # source -> byte offset into its history log
+        self.encodings = {}  # source -> codec the log was in when its offset was taken
+        self.signals = {}    # trend -> {source: {platform term: score}}
+        self.runway = {}     # trend -> last runway score seen
+        self.history = {}    # trend -> [[ts, runway, street, gap]]
+        self.scanned = None  # ts of the newest scan ingested
+        self.index = term_registry.build_alias_index()
+
+    def ingest(self):
+        """Fold in social scans that arrived since the last cycle; returns the newest scan's ts"""
+        latest = None
+        for source, scorer in SCORERS.items():
+            encoding = history.encoding(source)
+            # A re-encoded log is read again from the start; scores are simply overwritten
+            if self.encodings.setdefault(source, encoding) != encoding:
+                self.offsets[source] = 0
+                self.encodings[source] = encoding
+            offset = self.offsets.get(source, 0)
+            for offset, entry in history.read(source, offset):
+                latest = max(latest or entry['ts'], entry['ts'])
+                self.scanned = max(self.scanned or latest, latest)
+                for term, metrics in entry['terms'].items():
+                    for trend in term_registry.resolve(term, self.index):
+                        per_term = self.signals.setdefault(trend, {}).setdefault(source, {})
+                        per_term[term_registry.normalize(term)] = round(scorer(metrics), 1)
+            self.offsets[source] = offset
+        return latest
+
+    def street_score(self, trend):
+        return combine(self.signals.get(trend, {}))
+
+    def scores(self):
+        """{trend: street score} over every scan logged so far, via the score store"""
+        sources = [history.source_path(s) for s in SCORERS] + [term_registry.REGISTRY_FILE]
+
+        def compute():
+            self.ingest()
+            return {trend: self.street_score(trend) for trend in sorted(self.signals)}
+
+        return score_store.materialize('street', SCORE_VERSION, sources, compute, ts=lambda: self.scanned)
+
+    def update(self, runway_trends, now=None):
+        """
+        runway_trends: [{'name', 'runway_frequency', 'brands', 'city', ...}]
+        Records a gap point for trends whose street or runway score changed
+        and returns the current gap for every runway trend.
+        """
+        latest = self.ingest()
+        ts = latest or (now or datetime.datetime.now()).isoformat()
+        scores = self.scores()
+
+        gaps = []
+        for trend in runway_trends:
+            name = trend['name']
+            runway_score = trend['runway_frequency']
+            points = self.history.setdefault(name, [])
+            street = scores.get(name)
+            if not points or points[-1][2] != street or self.runway.get(name) != runway_score:
+                gap = runway_score - street if street is not None else None
+                points.append([ts, runway_score, street, gap])
+                del points[:-HISTORY_LIMIT]
+                self.runway[name] = runway_score
+
+            _, _, street, gap = points[-1]
+            gaps.append({
+                'trend': name,
+                'runway_score': runway_score,
+                'street_score': street,
+                'gap': gap,
+                'status': gap_status(gap),
+                'brands': trend['brands'],
+                'caught_up': self.caught_up(name)
+            })
+        return gaps
+
+    def caught_up(self, trend):
+        """First time the street score came within 20 of the runway, or None"""
+        for ts, _, street, gap in self.history.get(trend, []):
+            if gap is not None and gap <= 20:
+                return ts
+        return None
+
+    def save(self, path=STATE_FILE):
+        storage.dump({
+            'offsets': self.offsets,
+            'encodings': self.encodings,
+            'signals': self.signals,
+            'runway': self.runway,
+            'history': self.history,
+            'scanned': self.scanned
+        }, path)
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        adoption = cls()
+        saved = storage.load(path)
+        if saved:
+            adoption.offsets = saved['offsets']
+            adoption.encodings = saved.get('encodings', {})
+            adoption.signals = saved['signals']
+            adoption.runway = saved['runway']
+            adoption.history = saved['history']
+            adoption.scanned = saved.get('scanned')
+        return adoption
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runway-to-street gap history')
+    parser.add_argument('--trend')
+    args = parser.parse_args()
+
+    adoption = StreetAdoption.load()
+    if args.trend:
+        for ts, runway, street, gap in adoption.history.get(args.trend, []):
+            bar = '█' * ((street or 0) // 5)
+            print(f"  {ts[:16]}  runway {runway:3}  street {street if street is not None else '—':>3}  {bar}")
+        return
+
+    for trend, points in sorted(adoption.history.items()):
+        ts, runway, street, gap = points[-1]
+        print(f"  {trend:25} runway {runway:3} → street {street if street is not None else '—':>3} "
+              f"| {gap_status(gap).split(' - ')[0]} ({len(points)} points)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Command Line
+Every script behind one entry point:
+
+  taste collect tiktok           one collector
+  taste collect                  every scheduled collector, in one interpreter
+  taste analyze                  the ultimate dashboard
+  taste posts                    generate posts
+  taste startup                  how long each command takes to import
+
+A command maps to the module that implements it, and nothing is imported
+until one is dispatched: `taste posts` loads generate_posts and its
+dependencies, not the collectors. The rest of the command line is handed to
+the module's own main(), so `taste backfill --since 2026-01-01` takes the
+same options as scripts/backfill.py.
+
+Usage:
+  python3 scripts/taste.py collect twitter reddit
+  python3 scripts/taste.py scores --term "mob wife"
+  python3 scripts/taste.py startup -n 10
+"""
+
+import os
+import sys
+
+COLLECTORS = {
+    'tiktok': 'collect_tiktok',
+    'twitter': 'collect_twitter',
+    'stockx': 'collect_stockx',
+    'reddit': 'collect_reddit',
+    'runway': 'collect_runway',
+    'superbowl': 'collect_superbowl',
+    'google': 'collect_google',
+}
+# What a bare `taste collect` runs: the scan workflow's collectors, in its order
+SCHEDULED = ['tiktok', 'twitter', 'stockx', 'reddit', 'runway', 'superbowl']
+
+# command -> (module, what it does)
+COMMANDS = {
+    'discover': ('discovery', 'find accelerating phrases and promote them'),
+    'analyze': ('ultimate_dashboard', 'scores, correlations and predictions'),
+    'insights': ('master_analyzer', 'multi-source insights'),
+    'posts': ('generate_posts', 'generate posts from live data'),
+    'dashboard': ('dashboard', 'the Twitter dashboard'),
+    'scores': ('score_store', 'materialized scores per model'),
+    'models': ('scoring', 'scoring models, or one term under one'),
+    'street': ('street_adoption', 'runway-to-street gaps'),
+    'authors': ('cardinality', 'distinct authors and communities per term'),
+    'backtest': ('backtest', 'backtest scoring models against history'),
+    'backfill': ('backfill', 'recompute scores and insights over history'),
+    'sounds': ('sound_index', 'sound -> hashtag associations'),
+    'creators': ('creator_graph', 'top creators'),
+    'runway': ('runway_archive', 'runway archive queries'),
+    'events': ('event_study', 'designer moves and campaigns'),
+    'serve': ('query_api', 'serve the read-only query API'),
+    'daemon': ('daemon', 'run every job on its schedule in one process'),
+    'compact': ('retention', 'roll old snapshots into archives'),
+    'storage': ('storage', 'migrate or export data files'),
+    'replay': ('replay', 'record/replay tools'),
+    'tiktok-sources': ('tiktok_sources', 'TikTok source backends'),
+}
+
+STARTUP_RUNS = 5
+
+
+def usage():
+    lines = ["usage: taste <command> [args...]\n",
+             f"  {'collect [source...]':24} run collectors ({', '.join(COLLECTORS)}; default: {' '.join(SCHEDULED)})"]
+    lines += [f"  {name:24} {about}" for name, (_, about) in COMMANDS.items()]
+    lines.append(f"  {'startup [-n N] [cmd...]':24} import time per command, in fresh interpreters")
+    return '\n'.join(lines)
+
+
+def dispatch(module, args, prog):
+    """Import a module and run its main() as if it had been invoked as a script"""
+    import importlib
+
+    sys.argv = [prog, *args]
+    return importlib.import_module(module).main()
+
+
+def collect(sources):
+    """Run collectors one after another; a failure doesn't stop the rest"""
+    unknown = [s for s in sources if s not in COLLECTORS]
+    if unknown:
+        sys.exit(f"taste: unknown collector {unknown[0]!r} (choose from {', '.join(COLLECTORS)})")
+    if len(sources) == 1:
+        return dispatch(COLLECTORS[sources[0]], [], f"taste collect {sources[0]}")
+
+    import traceback
+
+    failed = []
+    for source in sources:
+        print(f"\n▶ collect {source}", flush=True)
+        try:
+            dispatch(COLLECTORS[source], [], f"taste collect {source}")
+        except (Exception, SystemExit):
+            traceback.print_exc()
+            failed.append(source)
+    if failed:
+        sys.exit(f"taste: {len(failed)} collector{'s' if len(failed) > 1 else ''} failed: {', '.join(failed)}")
+
+
+def modules_of(commands):
+    """[(label, module)] for command names; everything by default"""
+    everything = [(f"collect {s}", m) for s, m in COLLECTORS.items()] + \
+                 [(name, module) for name, (module, _) in COMMANDS.items()]
+    if not commands:
+        return everything
+    chosen = []
+    for name in commands:
+        found = [(label, module) for label, module in everything
+                 if label in (name, f"collect {name}") or (name == 'collect' and label.startswith('collect '))]
+        if not found:
+            sys.exit(f"taste: unknown command {name!r}")
+        chosen += found
+    return chosen
+
+
+def import_profile(module):
+    """(total µs, {direct dependency: cumulative µs}) importing a module in a fresh interpreter"""
+    import subprocess
+
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            env=env, capture_output=True, text=True, check=True)
+    # Children are listed before their parent: the module's direct dependencies
+    # are the depth-1 lines since the previous top-level import
+    total, deps, pending = 0, {}, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            pending[name.strip()] = int(cumulative)
+        elif depth == 0:
+            if name.strip() == module:
+                total, deps = int(cumulative), pending
+            pending = {}
+    return total, deps
+
+
+def startup(args):
+    runs = STARTUP_RUNS
+    if args[:1] == ['-n']:
+        runs, args = int(args[1]), args[2:]
+
+    rows = []
+    for label, module in modules_of(args):
+        samples = [import_profile(module) for _ in range(runs)]
+        samples.sort(key=lambda s: s[0])
+        total, deps = samples[len(samples) // 2]
+        rows.append((total, label, sorted(deps.items(), key=lambda d: -d[1])[:3]))
+
+    print(f"⏱️  import time per command, median of {runs} fresh interpreters\n")
+    for total, label, heaviest in sorted(rows, key=lambda r: -r[0]):
+        detail = ', '.join(f"{name} {us / 1000:.1f}" for name, us in heaviest)
+        print(f"  {label:20} {total / 1000:6.1f} ms   ({detail})")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print(usage())
+        return
+    command, args = argv[0], argv[1:]
+    if command == 'collect':
+        return collect(args or SCHEDULED)
+    if command == 'startup':
+        return startup(args)
+    if command not in COMMANDS:
+        sys.exit(f"taste: unknown command {command!r}\n\n{usage()}")
+    return dispatch(COMMANDS[command][0], args, f"taste {command}")
+
+
+if __name__ == "__main__":
+    main()
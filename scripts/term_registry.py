@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Term Registry
+Canonical trend names and every way the platforms spell them.
+
+Twitter says "mob wife", TikTok says "#mobwife", Reddit says "mob wife
+aesthetic". Everything is matched through one precomputed alias index on a
+normalized form (lowercase, no '#', spaces or punctuation).
+"""
+
+import json
+import re
+from pathlib import Path
+
+REGISTRY_FILE = Path('data/terms.json')
+
+# Runway trends -> the social terms that measure their street adoption
+RUNWAY_ALIASES = {
+    'Oversized Coats': ['oversized coat', 'oversized coats', 'mob wife', 'mobwife'],
+    'Metallic Everything': ['metallic', 'chrome', 'y2k'],
+    'Return of Fur': ['fur coat', 'faux fur', 'mob wife', 'mobwife', 'mob wife aesthetic'],
+    'Extreme Shoulders': ['power shoulders', 'extreme shoulders', 'shoulder pads'],
+    'Office Siren': ['office siren', 'officesiren'],
+    'Shearling Everything': ['shearling', 'gorpcore'],
+    'Mini Bags': ['mini bag', 'mini bags', 'micro bag'],
+    'Practical Luxury': ['quiet luxury', 'quietluxury', 'practical luxury'],
+    'Layered Knits': ['layered knits', 'dark academia', 'darkacademia'],
+    'Cargo Everything': ['cargo pants', 'cargo', 'gorpcore', 'blokecore'],
+    'Neo-Punk': ['neo punk', 'opium aesthetic', 'opiumcore'],
+    'Deconstructed Tailoring': ['deconstructed', 'archive fashion', 'archivefashion'],
+    'Tulle Chaos': ['tulle', 'coquette', 'coquette aesthetic'],
+}
+
+# Ad themes -> the social terms that show whether culture is actually there
+THEME_ALIASES = {
+    'PERSONALIZATION/AI': ['ai fashion', 'custom sneakers', 'nike by you'],
+    'Y2K_NOSTALGIA': ['y2k', 'y2k fashion'],
+    'DIGITAL_FASHION': ['digital fashion', 'virtual fashion', 'digital wearables'],
+    'FAST_FASHION': ['fast fashion', 'shein', 'temu', 'shein haul'],
+    'QUIET_LUXURY': ['quiet luxury', 'quietluxury', 'old money'],
+    'ANTI_HYPE': ['anti hype', 'comfort shoes', 'skechers'],
+    'LIFESTYLE_EXPANSION': ['liquid death', 'lifestyle brand'],
+}
+
+
+def normalize(term):
+    return re.sub(r'[^a-z0-9]', '', term.lower())
+
+
+def load_terms():
+    """Canonical term -> aliases: the built-in runway and ad-theme maps plus anything promoted to data/terms.json"""
+    terms = {name: list(aliases) for name, aliases in {**RUNWAY_ALIASES, **THEME_ALIASES}.items()}
+    if REGISTRY_FILE.exists():
+        with open(REGISTRY_FILE) as f:
+            for name, aliases in json.load(f).get('terms', {}).items():
+                terms.setdefault(name, [])
+                terms[name] += [a for a in aliases if a not in terms[name]]
+    return terms
+
+
+def build_alias_index(terms=None):
+    """normalized alias -> [canonical terms]; a canonical name is its own alias"""
+    index = {}
+    for name, aliases in (terms or load_terms()).items():
+        for alias in [name] + aliases:
+            bucket = index.setdefault(normalize(alias), [])
+            if name not in bucket:
+                bucket.append(name)
+    return index
+
+
+def resolve(term, index):
+    """Canonical terms a raw platform term counts towards"""
+    return index.get(normalize(term), [])
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - TikTok Sources
+One interface, two backends:
+  SimulatedSource - deterministic data, from nine curated tags up to millions
+                    of generated observations for load testing
+  HttpSource      - concurrent fetcher for hashtag / sound / creator pages
+                    behind a scraping API (TIKTOK_API_URL), pooled + cached
+
+Pick with TIKTOK_SOURCE=sim|http (default: http when TIKTOK_API_URL is set)
+
+Usage:
+  python3 scripts/tiktok_sources.py simulate -n 1000000 --tags 5000
+"""
+
+import abc
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import replay
+
+# Trending hashtags we know are hot
+CURATED_HASHTAGS = {
+    'mobwife': {'views': 142000000, 'growth': '+340%', 'videos': 28400},
+    'quietluxury': {'views': 89000000, 'growth': '-67%', 'videos': 15200},
+    'gorpcore': {'views': 67000000, 'growth': '+89%', 'videos': 9800},
+    'coquette': {'views': 234000000, 'growth': '+12%', 'videos': 45600},
+    'blokecore': {'views': 56000000, 'growth': '+210%', 'videos': 12300},
+    'darkacademia': {'views': 189000000, 'growth': '-23%', 'videos': 34500},
+    'opiumcore': {'views': 23000000, 'growth': '+890%', 'videos': 4500},
+    'y2k': {'views': 567000000, 'growth': '+45%', 'videos': 123000},
+    'archivefashion': {'views': 34000000, 'growth': '+567%', 'videos': 6700},
+    'chromehearts': {'views': 89000000, 'growth': '+234%', 'videos': 17800}
+}
+
+# Key sounds driving fashion trends
+CURATED_SOUNDS = [
+    {
+        'name': 'Femininomenon by Chappell Roan',
+        'uses': 234000,
+        'fashion_correlation': 'HIGH',
+        'associated_trend': 'coquette aesthetic'
+    },
+    {
+        'name': 'Bloody Mary - Sped Up',
+        'uses': 567000,
+        'fashion_correlation': 'HIGH',
+        'associated_trend': 'dark feminine'
+    },
+    {
+        'name': 'FE!N - Travis Scott',
+        'uses': 890000,
+        'fashion_correlation': 'MEDIUM',
+        'associated_trend': 'opium aesthetic'
+    },
+    {
+        'name': 'Escapism - RAYE',
+        'uses': 456000,
+        'fashion_correlation': 'HIGH',
+        'associated_trend': 'mob wife aesthetic'
+    }
+]
+
+CURATED_CREATORS = [
+    {
+        'username': '@wisdomkaye',
+        'followers': 8900000,
+        'recent_trend': 'Bringing back skinny jeans discourse',
+        'engagement_rate': '12.3%'
+    },
+    {
+        'username': '@tinyjewishgirl',
+        'followers': 2300000,
+        'recent_trend': 'Mob wife aesthetic pioneer',
+        'engagement_rate': '18.7%'
+    },
+    {
+        'username': '@charlidamelio',
+        'followers': 151000000,
+        'recent_trend': 'Dunkin collab driving casual wear',
+        'engagement_rate': '5.2%'
+    },
+    {
+        'username': '@brittanybavier',
+        'followers': 4500000,
+        'recent_trend': 'Quiet luxury to loud luxury pivot',
+        'engagement_rate': '14.5%'
+    }
+]
+
+
+# Which tracked hashtag each curated sound pulls along in the simulator
+SOUND_AFFINITY = {
+    'Femininomenon by Chappell Roan': 'coquette',
+    'Bloody Mary - Sped Up': 'darkacademia',
+    'FE!N - Travis Scott': 'opiumcore',
+    'Escapism - RAYE': 'mobwife'
+}
+
+
+def clean_tag(hashtag):
+    return hashtag.replace('#', '').lower()
+
+
+def hashtag_record(hashtag, views, growth, videos):
+    """The hashtag shape every downstream script reads"""
+    return {
+        'hashtag': hashtag,
+        'views': views,
+        'week_over_week': growth,
+        'videos_created': videos,
+        'avg_views_per_video': views // videos if videos else 0
+    }
+
+
+class TikTokSource(abc.ABC):
+    """What collect_tiktok needs from a backend"""
+
+    @abc.abstractmethod
+    def hashtag(self, hashtag):
+        """One hashtag's record (see hashtag_record), or None"""
+
+    def hashtags(self, tags):
+        return [self.hashtag(tag) for tag in tags]
+
+    @abc.abstractmethod
+    def sounds(self):
+        """Trending sounds: [{name, uses, ...}]"""
+
+    @abc.abstractmethod
+    def creators(self):
+        """Creators to watch: [{username, followers, ...}]"""
+
+    @abc.abstractmethod
+    def videos(self, tags, scan_key=None):
+        """Recent videos under the tags: [{id, sound, hashtags, creator, created (epoch secs)}]"""
+
+
+class SimulatedSource(TikTokSource):
+    """Deterministic stand-in: curated numbers for known tags, seeded numbers for the rest"""
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def _hash(self, text):
+        key = f"{self.seed}:{text}" if self.seed else text
+        return int(hashlib.md5(key.encode()).hexdigest()[:8], 16)
+
+    def hashtag(self, hashtag):
+        tag = clean_tag(hashtag)
+        if tag in CURATED_HASHTAGS:
+            data = CURATED_HASHTAGS[tag]
+            return hashtag_record(hashtag, data['views'], data['growth'], data['videos'])
+
+        # Plausible data for unknown hashtags
+        hash_val = self._hash(hashtag)
+        base_views = (hash_val % 10000000) + 1000000
+        record = hashtag_record(hashtag, base_views, f"+{hash_val % 200}%", base_views // 5000)
+        record['avg_views_per_video'] = 5000
+        return record
+
+    def sounds(self):
+        return [dict(s) for s in CURATED_SOUNDS]
+
+    def creators(self):
+        return [dict(c) for c in CURATED_CREATORS]
+
+    def videos(self, tags, scan_key=None, per_tag=40, sound_pool=200, creator_pool=2000):
+        """
+        Simulated video pages. Seeded by (seed, tag, scan_key) so a scan is
+        reproducible while successive scans differ.
+        """
+        # Background catalogue first: the Zipf head shouldn't be a curated sound
+        sounds = [f"Sound {i:04d}" for i in range(sound_pool)]
+        tags = [clean_tag(t) for t in tags]
+        scan_key = scan_key or 'scan'
+        try:
+            scan_time = int(datetime.datetime.strptime(scan_key, '%Y%m%d_%H').timestamp())
+        except ValueError:
+            scan_time = 0
+        videos = []
+
+        for tag in tags:
+            rng = random.Random(f"{self.seed}:{tag}:{scan_key}")
+            affinity = [name for name, t in SOUND_AFFINITY.items() if t == tag]
+            for i in range(per_tag):
+                if affinity and rng.random() < 0.35:
+                    sound = rng.choice(affinity)
+                else:
+                    # Zipf-ish: a few sounds are everywhere, most are rare
+                    sound = sounds[min(int(rng.paretovariate(1.2)) - 1, len(sounds) - 1)]
+                co_tags = rng.sample(tags, k=min(len(tags), rng.randint(0, 2)))
+                creator = int(rng.paretovariate(0.8)) % creator_pool
+                videos.append({
+                    'id': hashlib.md5(f"{tag}:{scan_key}:{i}".encode()).hexdigest()[:12],
+                    'sound': sound,
+                    'hashtags': sorted({tag, *co_tags}),
+                    'creator': CURATED_CREATORS[creator]['username'] if creator < len(CURATED_CREATORS)
+                               else f"@creator{creator:05d}",
+                    'created': scan_time - rng.randint(0, 7 * 24 * 3600)
+                })
+        return videos
+
+    def observations(self, n, tags=1000, start=None, interval_hours=3):
+        """
+        Yield n hashtag observations round-robin over `tags` hashtags, one scan
+        every interval_hours - a random walk in views with bursts, seeded so
+        every run produces the same stream
+        """
+        rng = random.Random(self.seed)
+        names = list(CURATED_HASHTAGS)[:tags]
+        names += [f"sim{i:06d}" for i in range(tags - len(names))]
+        views = [CURATED_HASHTAGS[t]['views'] if t in CURATED_HASHTAGS else rng.randint(10**5, 10**8)
+                 for t in names]
+        drift = [rng.uniform(-0.05, 0.08) for _ in names]
+        start = start or datetime.datetime(2026, 1, 1)
+        step = datetime.timedelta(hours=interval_hours)
+
+        for i in range(n):
+            j = i % tags
+            scan = i // tags
+            if rng.random() < 0.001:
+                drift[j] = rng.uniform(0.1, 0.5)  # a trend catches fire
+            prev = views[j]
+            views[j] = max(1000, int(prev * (1 + drift[j] + rng.gauss(0, 0.02))))
+            growth = round((views[j] - prev) * 100 / prev)
+            yield {
+                'hashtag': f"#{names[j]}",
+                'timestamp': (start + step * scan).isoformat(),
+                'views': views[j],
+                'week_over_week': f"{growth:+d}%",
+                'videos_created': max(1, views[j] // 5000)
+            }
+
+
+class HttpSource(TikTokSource):
+    """
+    Concurrent fetcher against a TikTok scraping API. Expects JSON pages:
+      GET {base}/hashtag/{tag}  -> {"views", "videos", "week_over_week"}
+      GET {base}/sounds         -> [{"name", "uses", ...}]
+      GET {base}/creators       -> [{"username", "followers", ...}]
+      GET {base}/hashtag/{tag}/videos -> [{"id", "sound", "hashtags", "creator", "created"}]
+    Responses are cached on disk for `ttl` seconds.
+    """
+
+    def __init__(self, base_url, api_key=None, workers=8, ttl=3600, cache_dir='data/cache/tiktok'):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url.rstrip('/')
+        self.workers = workers
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir)
+        self.headers = {'User-Agent': 'TasteEngine/1.0'}
+        if api_key:
+            self.headers['Authorization'] = f"Bearer {api_key}"
+
+        # One pooled session shared by every worker thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.memory = {}
+        self.lock = threading.Lock()
+
+    def _fetch(self, path):
+        url = f"{self.base_url}/{path}"
+        cache_file = self.cache_dir / (hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+        with self.lock:
+            hit = self.memory.get(url)
+        if hit and time.time() - hit[0] < self.ttl:
+            return hit[1]
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < self.ttl:
+            with open(cache_file) as f:
+                body = json.load(f)
+        else:
+            response = replay.get(url, headers=self.headers, timeout=10, session=self.session)
+            if response.status_code >= 400:
+                print(f"  ⚠️ TikTok API {path} returned {response.status_code}")
+                return None
+            body = response.json()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(body, f)
+
+        with self.lock:
+            self.memory[url] = (time.time(), body)
+        return body
+
+    def _get(self, path):
+        """A page, or None when the endpoint fails; failures are reported, not raised"""
+        import requests
+
+        try:
+            return self._fetch(path)
+        except (requests.RequestException, replay.ReplayMiss, ValueError) as e:
+            print(f"  ⚠️ TikTok API {path} failed: {type(e).__name__}")
+            return None
+
+    def hashtag(self, hashtag):
+        page = self._get(f"hashtag/{clean_tag(hashtag)}")
+        if not page:
+            return None
+        return hashtag_record(hashtag, int(page['views']), page['week_over_week'], int(page['videos']))
+
+    def hashtags(self, tags):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return [r for r in pool.map(self.hashtag, tags) if r]
+
+    def sounds(self):
+        return self._get('sounds') or []
+
+    def creators(self):
+        return self._get('creators') or []
+
+    def _videos(self, tag):
+        page = self._get(f"hashtag/{clean_tag(tag)}/videos") or []
+        for video in page:
+            video['hashtags'] = sorted({clean_tag(t) for t in video.get('hashtags', [])} | {clean_tag(tag)})
+        return page
+
+    def videos(self, tags, scan_key=None):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return [v for page in pool.map(self._videos, tags) for v in page]
+
+
+def get_source():
+    """Backend chosen by TIKTOK_SOURCE / TIKTOK_API_URL"""
+    kind = os.environ.get('TIKTOK_SOURCE')
+    base_url = os.environ.get('TIKTOK_API_URL')
+    if kind == 'http' or (kind is None and base_url):
+        if not base_url:
+            raise RuntimeError('TIKTOK_SOURCE=http needs TIKTOK_API_URL')
+        return HttpSource(base_url, api_key=os.environ.get('TIKTOK_API_KEY'))
+    return SimulatedSource(seed=int(os.environ.get('TIKTOK_SIM_SEED', 0)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TikTok source tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('simulate', help='generate deterministic hashtag observations')
+    p.add_argument('-n', type=int, default=1000000)
+    p.add_argument('--tags', type=int, default=1000)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--out', default=None, help='write observations as gzipped JSON lines')
+    args = parser.parse_args()
+
+    source = SimulatedSource(seed=args.seed)
+    start = time.perf_counter()
+    count = 0
+    if args.out:
+        with gzip.open(args.out, 'wt') as f:
+            for obs in source.observations(args.n, tags=args.tags):
+                f.write(json.dumps(obs) + '\n')
+                count += 1
+    else:
+        for _ in source.observations(args.n, tags=args.tags):
+            count += 1
+    elapsed = time.perf_counter() - start
+    print(f"🎲 {count:,} observations over {args.tags:,} hashtags in {elapsed:.1f}s "
+          f"({count / elapsed:,.0f}/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Tweet Features
+One engagement model for every script: normalize bird's field names once
+and compute all per-tweet features in a single pass
+"""
+
+import datetime
+import math
+
+# Engagement model - the only place these weights live
+RETWEET_WEIGHT = 2
+REPLY_WEIGHT = 1.5
+QUOTE_WEIGHT = 3
+HALF_LIFE_HOURS = 24
+
+# bird has emitted both the legacy and the GraphQL field names over time
+LIKE_FIELDS = ('likeCount', 'likes', 'favorite_count')
+RETWEET_FIELDS = ('retweetCount', 'retweets', 'retweet_count')
+REPLY_FIELDS = ('replyCount', 'replies', 'reply_count')
+QUOTE_FIELDS = ('quoteCount', 'quotes', 'quote_count')
+HANDLE_FIELDS = ('username', 'handle', 'screen_name')
+FOLLOWER_FIELDS = ('followersCount', 'followers', 'followers_count')
+CREATED_FIELDS = ('createdAt', 'created_at', 'timestamp')
+
+
+def _first(d, fields, default=0):
+    for field in fields:
+        value = d.get(field)
+        if value is not None:
+            return value
+    return default
+
+
+def parse_created(value):
+    """Parse bird's timestamp (ISO 8601 or Twitter's legacy format) to an aware datetime"""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        # Epoch seconds or milliseconds
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = datetime.datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y')
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+class TweetFeatures:
+    """Compact per-tweet record - only what the analyzers actually use"""
+
+    __slots__ = ('likes', 'retweets', 'replies', 'quotes', 'author', 'followers',
+                 'text', 'age_hours', 'engagement', 'conversation', 'reach', 'decay', 'score')
+
+    def as_mention(self):
+        """The shape scripts store for a top tweet"""
+        return {'text': self.text, 'engagement': self.engagement, 'author': self.author}
+
+
+def extract_features(tweet, now=None):
+    """Normalize one bird tweet and compute every feature in one pass"""
+    author = tweet.get('author') or {}
+    if not isinstance(author, dict):
+        author = {'username': str(author)}
+
+    f = TweetFeatures()
+    f.likes = int(_first(tweet, LIKE_FIELDS))
+    f.retweets = int(_first(tweet, RETWEET_FIELDS))
+    f.replies = int(_first(tweet, REPLY_FIELDS))
+    f.quotes = int(_first(tweet, QUOTE_FIELDS))
+    f.author = _first(author, HANDLE_FIELDS, 'unknown')
+    f.followers = int(_first(author, FOLLOWER_FIELDS) or _first(tweet, FOLLOWER_FIELDS))
+    f.text = (tweet.get('text') or '')[:100]
+
+    # Engagement: likes + retweets*2, the model every script has always reported
+    f.engagement = f.likes + f.retweets * RETWEET_WEIGHT
+    f.conversation = f.replies * REPLY_WEIGHT + f.quotes * QUOTE_WEIGHT
+    f.reach = math.log10(1 + f.followers)
+
+    created = parse_created(_first(tweet, CREATED_FIELDS, None))
+    if created is not None:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        f.age_hours = max((now - created).total_seconds() / 3600, 0.0)
+        f.decay = 0.5 ** (f.age_hours / HALF_LIFE_HOURS)
+    else:
+        f.age_hours = None
+        f.decay = 1.0
+
+    f.score = (f.engagement + f.conversation) * f.decay
+    return f
+
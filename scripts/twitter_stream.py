@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Taste Engine - Streaming bird reader
+Parse `bird search --json` output as it arrives and fold tweets into running totals,
+so memory stays flat whether we ask for 10 tweets or 10,000
+"""
+
+import datetime
+import json
+import subprocess
+
+import cardinality
+import replay
+from tweet_features import extract_features
+
+_decoder = json.JSONDecoder()
+WHITESPACE = ' \t\r\n'
+
+
+def iter_json_items(chunks):
+    """
+    Yield objects from a stream of text chunks, one at a time.
+    Accepts either a top-level JSON array or newline-delimited JSON.
+    Only the object currently being parsed is held in memory.
+    """
+    chunks = iter(chunks)
+    buf = ''
+    pos = 0
+    in_array = None
+    eof = False
+
+    def more():
+        nonlocal buf, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        # Skip separators between items
+        while pos < len(buf) and (buf[pos] in WHITESPACE or (in_array and buf[pos] == ',')):
+            pos += 1
+        if pos >= len(buf):
+            if eof or not more():
+                break
+            continue
+
+        if in_array is None:
+            in_array = buf[pos] == '['
+            if in_array:
+                pos += 1
+            continue
+
+        if in_array and buf[pos] == ']':
+            break
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Most likely an item split across chunks - read more and retry
+            if eof or not more():
+                raise
+            continue
+
+        pos = end
+        yield item
+
+
+def stream_tweets(cmd, timeout=10):
+    """Yield tweets from a bird command as stdout arrives"""
+    for item in iter_json_items(replay.stream(cmd, timeout=timeout)):
+        # Some bird versions wrap results: {"tweets": [...]} per line
+        if isinstance(item, dict) and isinstance(item.get('tweets'), list):
+            yield from item['tweets']
+        else:
+            yield item
+
+
+def bird_search_cmd(query, auth_token, ct0, n=10):
+    return [
+        "bird", "search", query,
+        "--auth-token", auth_token,
+        "--ct0", ct0,
+        "-n", str(n),
+        "--json"
+    ]
+
+
+class TrendAggregate:
+    """
+    Running totals for one term; keeps only the current top tweet's features
+    and a fixed-size sketch of who posted
+    """
+
+    def __init__(self, now=None):
+        self.now = now or datetime.datetime.now(datetime.timezone.utc)
+        self.count = 0
+        self.total_engagement = 0
+        self.weighted_engagement = 0.0
+        self.total_reach = 0.0
+        self.top = None
+        self.authors = cardinality.HyperLogLog()
+
+    def add(self, tweet):
+        f = extract_features(tweet, self.now)
+        self.count += 1
+        self.total_engagement += f.engagement
+        self.weighted_engagement += f.score
+        self.total_reach += f.reach
+        if f.author != 'unknown':
+            self.authors.add(f"twitter:{f.author}")
+        if self.top is None or f.engagement > self.top.engagement:
+            self.top = f
+
+    def fold(self, tweets):
+        for tweet in tweets:
+            self.add(tweet)
+        return self
+
+    @property
+    def avg_engagement(self):
+        return self.total_engagement / self.count if self.count else 0
+
+    @property
+    def avg_reach(self):
+        return self.total_reach / self.count if self.count else 0
+
+    @property
+    def unique_authors(self):
+        return self.authors.count()
+
+    @property
+    def top_mention(self):
+        return self.top.as_mention() if self.top else None
+
+
+def search_aggregate(query, auth_token, ct0, n=10, timeout=10):
+    """Stream a bird search straight into a TrendAggregate; None if bird failed"""
+    cmd = bird_search_cmd(query, auth_token, ct0, n)
+    try:
+        return TrendAggregate().fold(stream_tweets(cmd, timeout=timeout))
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None